@@ -55,6 +55,7 @@ hiddenimports = [
     "numpy",
     "pandas",
     "matplotlib",
+    "fsspec",  # DuckDB reads zipped CSV members through it
 ]
 
 excluded_modules = [
@@ -4,8 +4,10 @@ import os
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import (QApplication, QDialog, QVBoxLayout, QPushButton, 
-                               QLabel, QHBoxLayout, QFileDialog, QMessageBox, QGridLayout)
+                               QLabel, QHBoxLayout, QFileDialog, QMessageBox, QGridLayout,
+                               QListWidget, QListWidgetItem)
 from modules.core import MainWindow
+from modules.sessions import open_session, close_session, cached_sessions
 from modules.i18n import get_localization
 from modules.cmtk_converter import convert_cmtk_to_d055
 
@@ -68,7 +70,7 @@ class CmtkImporterDialog(QDialog):
         layout.addWidget(self.btn_convert)
 
     def browse_file(self, ftype):
-        path, _ = QFileDialog.getOpenFileName(self, "Select CSV", "", "CSV Files (*.csv)")
+        path, _ = QFileDialog.getOpenFileName(self, "Select CSV", "", "CSV Files (*.csv *.csv.gz *.csv.zst *.zip)")
         if path:
             filename = os.path.basename(path)
             if ftype == 'p':
@@ -105,12 +107,25 @@ class CmtkImporterDialog(QDialog):
 # =======================================================
 # Primary Dispatcher (The Splash Screen)
 # =======================================================
+def describe_session(entry):
+    """One-line summary of a catalogued table for the recent sessions list."""
+    parts = [entry["table_name"]]
+    if entry["source"]:
+        parts.append(os.path.basename(entry["source"]))
+    if entry["row_count"] is not None:
+        parts.append(f"{entry['row_count']:,} rows")
+    if entry["first_ts"] and entry["last_ts"]:
+        parts.append(f"{entry['first_ts']:%d/%m/%Y %H:%M} – {entry['last_ts']:%d/%m/%Y %H:%M}")
+    parts.append(f"last used {entry['last_access']:%d/%m/%Y %H:%M}")
+    return " — ".join(parts)
+
 class AppDispatcher(QDialog):
-    def __init__(self):
+    def __init__(self, sessions=()):
         super().__init__()
         self.setWindowTitle("AMS Data Tool - Select Mode")
         self.setFixedSize(400, 200)
         self.result_path = None
+        self.session_table = None
         
         layout = QVBoxLayout(self)
         layout.addWidget(QLabel("Select Data Source Type:", alignment=Qt.AlignCenter))
@@ -128,6 +143,29 @@ class AppDispatcher(QDialog):
         self.btn_d055.clicked.connect(self.accept)
         self.btn_cmtk.clicked.connect(self.handle_cmtk)
 
+        # Recent sessions: tables kept in the shared cache reopen without re-importing
+        if sessions:
+            self.setFixedSize(640, 440)
+            layout.addWidget(QLabel("Recent sessions:"))
+            self.session_list = QListWidget()
+            for entry in sessions:
+                item = QListWidgetItem(describe_session(entry))
+                item.setData(Qt.UserRole, entry["table_name"])
+                item.setToolTip(entry["schema"] or "")
+                self.session_list.addItem(item)
+            self.session_list.setCurrentRow(0)
+            self.session_list.itemDoubleClicked.connect(self.open_session)
+            layout.addWidget(self.session_list)
+            self.btn_open = QPushButton("Open Session")
+            self.btn_open.clicked.connect(self.open_session)
+            layout.addWidget(self.btn_open)
+
+    def open_session(self):
+        item = self.session_list.currentItem()
+        if item:
+            self.session_table = item.data(Qt.UserRole)
+            self.accept()
+
     def handle_cmtk(self):
         dlg = CmtkImporterDialog(self)
         if dlg.exec() == QDialog.Accepted:
@@ -156,12 +194,16 @@ def main():
         app.setWindowIcon(QIcon(icon_path))
     # -------------------------------------
     
-    dispatcher = AppDispatcher()
+    db = open_session()
+    dispatcher = AppDispatcher(cached_sessions())
     if dispatcher.exec() == QDialog.Accepted:
         loc = get_localization("en")
-        window = MainWindow(loc)
+        window = MainWindow(loc, db=db)
         
-        if dispatcher.result_path:
+        if dispatcher.session_table:
+            # Recent session: read from the shared cache instead of re-imported, copied only once changed
+            window.open_cached(dispatcher.session_table)
+        elif dispatcher.result_path:
             # CMTK Path: auto-load the converted file silently
             window.auto_import_file(dispatcher.result_path)
         else:
@@ -170,6 +212,7 @@ def main():
             
         window.show()
         sys.exit(app.exec())
+    close_session(db)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,190 @@
+# modules/channel_store.py
+import io
+import os
+import json
+import shutil
+import tempfile
+import numpy as np
+from .utils import get_app_data_path
+
+STORE_DIR = "channels"
+STORE_DTYPE = "float32"        # as fetch_numpy() hands channels to the plot and the outlier filter
+STORE_MIN_ROWS = 1_000_000     # smaller tables load from DuckDB about as fast
+STORE_CHUNK_VECTORS = 512      # DuckDB vectors (2048 rows each) written per chunk
+META_FILE = "meta.json"        # written last: a store without it is incomplete
+HEADER_IO = {(1, 0): (np.lib.format.read_array_header_1_0, np.lib.format.write_array_header_1_0),
+             (2, 0): (np.lib.format.read_array_header_2_0, np.lib.format.write_array_header_2_0)}
+
+def store_path(revision):
+    """
+    Folder of the store of one table revision. Revisions are unique across databases
+    and instances, so stores of equally named tables never collide; the database whose
+    catalog minted a revision is the one that removes its store.
+    """
+    return os.path.join(get_app_data_path(), STORE_DIR, revision)
+
+def remove_store(revision):
+    # Files still mapped by an open plot cannot be deleted on Windows; they go next time
+    shutil.rmtree(store_path(revision), ignore_errors=True)
+
+def sweep_stores(keep):
+    """
+    Removes the store folders of revisions not in `keep`, including those of writes
+    that never finished. Returns how many folders went and the bytes they took.
+    """
+    root = os.path.join(get_app_data_path(), STORE_DIR)
+    try:
+        names = [entry.name for entry in os.scandir(root) if entry.is_dir()]
+    except OSError:
+        return 0, 0
+    removed, freed = 0, 0
+    for name in names:
+        if name in keep:
+            continue
+        size = store_bytes(name)
+        remove_store(name)
+        if not os.path.exists(store_path(name)):
+            removed, freed = removed + 1, freed + size
+    return removed, freed
+
+def store_bytes(revision):
+    """Disk space taken by the store of a revision (0 when there is none)."""
+    try:
+        return sum(entry.stat().st_size for entry in os.scandir(store_path(revision)) if entry.is_file())
+    except OSError:
+        return 0
+
+def write_store(chunks, table_name, revision, columns, rows):
+    """
+    Writes the store of a table revision from DataFrame chunks holding `__t` (epoch ms)
+    and `__c<i>` per channel, in time order, into preallocated .npy files, so memory
+    stays bounded by one chunk.
+    """
+    final = store_path(revision)
+    os.makedirs(os.path.dirname(final), exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=f"{revision}.tmp-", dir=os.path.dirname(final))
+    files = ["time.npy"] + [f"{i}.npy" for i in range(len(columns))]
+    arrays = []
+    try:
+        arrays.append(np.lib.format.open_memmap(os.path.join(tmp, files[0]), mode="w+", dtype="int64", shape=(rows,)))
+        arrays += [np.lib.format.open_memmap(os.path.join(tmp, f), mode="w+", dtype=STORE_DTYPE, shape=(rows,))
+                   for f in files[1:]]
+        filled = 0
+        for chunk in chunks:
+            n = min(len(chunk), rows - filled)
+            for i, array in enumerate(arrays):
+                array[filled:filled + n] = chunk["__t" if i == 0 else f"__c{i - 1}"].to_numpy()[:n]
+            filled += n
+        for array in arrays:
+            array.flush()
+        arrays.clear()
+        meta = {"table": table_name, "revision": revision, "rows": filled,
+                "columns": dict(zip(columns, files[1:]))}
+        with open(os.path.join(tmp, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    except BaseException:
+        arrays.clear()  # unmapped, so Windows lets the files go
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    try:
+        os.replace(tmp, final)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)  # another instance wrote this revision first
+    return open_store(revision)
+
+def extend_store(revision, arrays, rows_before):
+    """
+    Appends rows stamped after the last stored sample to the store of a revision in
+    place: `arrays` holds `__t` and `__c<i>` like one chunk of write_store(). The .npy
+    headers are padded for a growing shape, so only the tails and the headers are
+    written; meta.json is replaced last, and readers never see more rows than it
+    lists. Returns the grown store, or None when the store is not at `rows_before`.
+    """
+    path = store_path(revision)
+    try:
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta["rows"] != rows_before:
+        return None
+    added = len(arrays["__t"])
+    files = [("time.npy", "__t")] + [(f, f"__c{i}") for i, f in enumerate(meta["columns"].values())]
+    for name, key in files:
+        with open(os.path.join(path, name), "r+b") as f:
+            version = np.lib.format.read_magic(f)
+            read_header, write_header = HEADER_IO[version]
+            _shape, fortran, dtype = read_header(f)
+            offset = f.tell()
+            header = io.BytesIO()
+            write_header(header, {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": fortran,
+                                  "shape": (rows_before + added,)})
+            if header.tell() != offset:
+                return None  # the header cannot grow in place; meta still lists the old rows
+            f.seek(offset + rows_before * dtype.itemsize)
+            f.write(np.ascontiguousarray(arrays[key], dtype=dtype).tobytes())
+            f.seek(0)
+            f.write(header.getvalue())
+    meta["rows"] = rows_before + added
+    tmp = os.path.join(path, f"{META_FILE}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, os.path.join(path, META_FILE))
+    return open_store(revision)
+
+def open_store(revision):
+    """The store of this table revision, or None when it was never (completely) written."""
+    path = store_path(revision)
+    try:
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return ChannelStore(path, meta)
+
+class ChannelStore:
+    """
+    Memory-mapped time axis and channels of one table revision. Slices are views
+    on the mapping: only the pages they touch are read, through the OS page cache.
+    """
+
+    def __init__(self, path, meta):
+        rows = meta["rows"]
+        self.time = np.load(os.path.join(path, "time.npy"), mmap_mode="r")[:rows].view("datetime64[ms]")
+        self.channels = {name: np.load(os.path.join(path, f), mmap_mode="r")[:rows]
+                         for name, f in meta["columns"].items()}
+
+    def has(self, columns):
+        return all(c in self.channels for c in columns)
+
+    def window(self, start=None, end=None):
+        """Index range [i0, i1) of the samples stamped within [start, end]."""
+        i0 = 0 if start is None else int(np.searchsorted(self.time, np.datetime64(start, "ms"), side="left"))
+        i1 = len(self.time) if end is None else int(np.searchsorted(self.time, np.datetime64(end, "ms"), side="right"))
+        return i0, max(i0, i1)
+
+    def slice(self, columns, start=None, end=None):
+        i0, i1 = self.window(start, end)
+        return self.time[i0:i1], {c: self.channels[c][i0:i1] for c in columns}
+
+def window_stats(t, data, percentiles, flow_unit):
+    """
+    The statistics of DuckDBManager.column_stats() computed on array slices: NaN
+    marks a missing sample, sums accumulate in float64.
+    """
+    stats = {}
+    dt = np.diff(t.view("int64")) / 1000.0  # seconds until the next sample
+    for col, values in data.items():
+        valid = values[~np.isnan(values)]
+        count = len(valid)
+        entry = {"count": count, "min": None, "max": None, "mean": None, "std": None,
+                 "percentiles": dict.fromkeys(percentiles)}
+        if count:
+            entry.update(min=float(valid.min()), max=float(valid.max()), mean=float(valid.mean(dtype="float64")),
+                         std=float(valid.std(dtype="float64", ddof=1)) if count > 1 else None,
+                         percentiles=dict(zip(percentiles, (float(p) for p in np.percentile(valid, [100 * p for p in percentiles])))))
+        if flow_unit in col:
+            area = values[:-1].astype("float64") * dt
+            entry["consumption"] = float(np.nansum(area)) / 60.0 if np.isfinite(area).any() else None
+        stats[col] = entry
+    return stats
@@ -1,9 +1,16 @@
 # modules/cmtk_converter.py
 import pandas as pd
 import os
-from modules.utils import get_app_data_path
+from modules.utils import get_app_data_path, iter_zip_csv
 from datetime import datetime
 
+def read_cmtk_csv(path):
+    # .gz/.zst are decompressed by pandas on the fly; a multi-member zip is
+    # treated as consecutive chunks of the same channel
+    if path.lower().endswith(".zip"):
+        return pd.concat([pd.read_csv(fh) for _, fh in iter_zip_csv(path)], ignore_index=True)
+    return pd.read_csv(path)
+
 def convert_cmtk_to_d055(pressure_path, flow_path, temp_path=None):
     # FIX: Use AppData instead of a local directory
     output_dir = os.path.join(get_app_data_path(), "conversions")
@@ -11,8 +18,8 @@ def convert_cmtk_to_d055(pressure_path, flow_path, temp_path=None):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir, exist_ok=True)
 
-    df_p = pd.read_csv(pressure_path)
-    df_f = pd.read_csv(flow_path)
+    df_p = read_cmtk_csv(pressure_path)
+    df_f = read_cmtk_csv(flow_path)
     
     df_p['pressure'] = df_p.iloc[:, 1].astype(str).str.extract(r'([-]?\d+[\.,]?\d*)')[0].str.replace(',', '.').astype(float)
     df_f['flow'] = df_f.iloc[:, 1].astype(str).str.extract(r'([-]?\d+[\.,]?\d*)')[0].str.replace(',', '.').astype(float)
@@ -29,7 +36,7 @@ def convert_cmtk_to_d055(pressure_path, flow_path, temp_path=None):
 
     # Add optional temperature column
     if temp_path and os.path.exists(temp_path):
-        df_t = pd.read_csv(temp_path)
+        df_t = read_cmtk_csv(temp_path)
         df_t['temp'] = df_t.iloc[:, 1].astype(str).str.extract(r'([-]?\d+[\.,]?\d*)')[0].str.replace(',', '.').astype(float)
         merged = pd.merge(merged, df_t[['Time', 'temp']], on='Time', how='left')
         final_cols['Fluid Temperature [°C]'] = merged['temp']
@@ -1,10 +1,20 @@
 # modules/core.py
 import os
+import io
+import json
+import glob
+import uuid
+import shutil
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 import duckdb
-from modules.utils import get_app_data_path
-from PySide6 import QtCore, QtWidgets
-from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Signal, Slot
+from modules.utils import get_app_data_path, quote_ident, quote_literal, iter_zip_csv, iter_csv_blocks, physical_memory_bytes, format_bytes
+from PySide6 import QtWidgets
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer, Slot
 from PySide6.QtGui import QKeySequence, QShortcut, QScreen
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -13,94 +23,1598 @@ from PySide6.QtWidgets import (
 )
 
 from .plot_tool import PlotDialog
+from .stats_panel import StatsDialog
+from .derived_channels import DerivedChannelDialog, build_update_sql, NUMPY_KINDS
+from .outliers import MAX_HALF_WINDOW, hampel, clean
+from .resample import ResampleDialog, build_resample_sql
+from .overlay import OverlayDialog
+from .history import HistoryDialog
+from .channel_store import (STORE_DTYPE, STORE_MIN_ROWS, STORE_CHUNK_VECTORS, open_store, write_store, extend_store,
+                            remove_store, store_bytes, sweep_stores, window_stats)
+from .sessions import (open_session, close_session, needs_publish, is_session_file, retry_locked, spill_dir,
+                       cache_path, cached_sessions)
+from .quality import GAP_FACTOR, QualityDialog, build_quality_sql, build_gap_sql, build_interval_sql, parse_quality_row, has_issues, summarise_quality
+from .event_search import EventSearchDialog
+from .live_follow import LogFollower
+from .export_dialog import ExportDialog
+from .workers import WorkerThread
+from .tracing import span, traced
+from .perf_panel import PerformanceDialog
 from .i18n import L  # <-- Always use L() globally
 
 CHUNK_SIZE = 1000
 UNDO_LIMIT = 10
+FOLLOW_INTERVAL_MS = 1000
+CURSOR_POOL_SIZE = 8  # idle cursors kept for reuse; more can be checked out concurrently
+EXPORT_BATCH_ROWS = 1_000_000
+MEMORY_POLL_MS = 2000
 
+# DuckDB resource profiles. memory_fraction is a share of installed RAM; anything the
+# buffer manager cannot hold spills to app data/spill/<session> instead of failing the import.
+# Insertion order stays preserved because paging reads the table in stored order.
+_CPUS = os.cpu_count() or 2
+RESOURCE_PROFILES = {
+    "low_memory":  {"threads": 2, "memory_fraction": 0.25, "preserve_insertion_order": True},
+    "balanced":    {"threads": max(2, _CPUS // 2), "memory_fraction": 0.5, "preserve_insertion_order": True},
+    "workstation": {"threads": _CPUS, "memory_fraction": 0.8, "preserve_insertion_order": True},
+}
+DEFAULT_PROFILE = "balanced"
+
+# Storage lifecycle: tables unused for STALE_DAYS are evicted, then the least recently
+# used ones until the database and the channel stores of its tables fit DISK_BUDGET_BYTES.
+# The file is rewritten at start-up
+# once free blocks make up COMPACT_MIN_RATIO of it (and at least COMPACT_MIN_BYTES).
+DISK_BUDGET_BYTES = 4 * 1024 ** 3
+STALE_DAYS = 30
+COMPACT_MIN_RATIO = 0.25
+COMPACT_MIN_BYTES = 64 * 1024 ** 2
+MAINTENANCE_INTERVAL_MS = 120_000
+
+# format -> (file filter, COPY options); "arrow" is streamed through pyarrow instead of COPY
+EXPORT_FORMATS = {
+    "csv":     ("CSV Files (*.csv)", "DELIMITER '{delim}', HEADER TRUE, TIMESTAMPFORMAT '%d/%m/%Y %H:%M:%S.%g'"),
+    "csv.gz":  ("Compressed CSV (*.csv.gz)", "DELIMITER '{delim}', HEADER TRUE, TIMESTAMPFORMAT '%d/%m/%Y %H:%M:%S.%g', COMPRESSION gzip"),
+    "parquet": ("Parquet Files (*.parquet)", "FORMAT PARQUET, COMPRESSION ZSTD"),
+    "arrow":   ("Arrow IPC Files (*.arrow)", None),
+}
+IMPORT_FILTER = ("Data Files (*.csv *.csv.gz *.csv.zst *.zip *.parquet *.arrow *.feather);;"
+                 "CSV Files (*.csv *.csv.gz *.csv.zst *.zip)")
+DATETIME_COL = "Date and time"
+DATETIME_FORMAT = "%d/%m/%Y %H:%M:%S.%g"  # how the timestamp is shown and written to CSV
+DISPLAY_DATETIME_FORMAT = "%d/%m/%Y %H:%M:%S.%f"  # Python twin of DATETIME_FORMAT, cut to milliseconds
+# Timestamp of a raw D055 row from its "D#date" and "TOD#time" columns
+RAW_TIMESTAMP_SQL = ("try_strptime(regexp_replace(CAST({date} AS VARCHAR), '^D#', '') || ' ' || "
+                     "regexp_replace(CAST({time} AS VARCHAR), '^TOD#', ''), ['%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S'])")
+FLOW_UNIT = "[Nl/min]"
+SOURCE_FILE_COL = "Source file"
+STATS_PERCENTILES = (0.05, 0.5, 0.95)
+OUTLIER_CACHE_SIZE = 4  # (mask, medians) pairs kept; one per channel and filter setting
+STATS_CACHE_SIZE = 64   # stats results kept; a new one per table, time range and column set
+INTERNAL_PREFIX = "_ams_"  # bookkeeping and scratch tables, never listed as sessions
+RESAMPLED_TABLE = "_ams_resampled"  # scratch result plotted straight from the resample dialog
+HISTORY_PREFIX = "_ams_snap_"  # snapshot tables, named by their _ams_history id
+HISTORY_DEPTH = 5  # snapshots kept per table
+HISTORY_BUDGET_BYTES = 2 * 1024 ** 3  # estimated size of all snapshots; the newest one is always kept
 # =======================================================
 # DuckDB Manager
 # =======================================================
+def _size_info(conn):
+    """(used bytes, file bytes) of the main database, from PRAGMA database_size."""
+    block, total, used = conn.execute(
+        "SELECT block_size, total_blocks, used_blocks FROM pragma_database_size() "
+        "WHERE database_name = current_database()").fetchone()
+    return used * block, total * block
+
+def compact_database_file(path):
+    """
+    DuckDB reuses freed blocks but never shrinks its file. When enough of it is free,
+    copy the live data into a fresh file and swap it in. Runs before the app connects;
+    returns (bytes before, bytes after) or None when compaction was not worthwhile.
+    """
+    if not os.path.exists(path):
+        return None
+    tmp = path + ".compact"
+    conn = duckdb.connect(path)
+    try:
+        used, total = _size_info(conn)
+        if total - used < COMPACT_MIN_BYTES or (total - used) < COMPACT_MIN_RATIO * total:
+            return None
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        conn.execute(f"ATTACH {quote_literal(tmp)} AS __compact")
+        conn.execute(f"COPY FROM DATABASE {quote_ident(conn.execute('SELECT current_database()').fetchone()[0])} TO __compact")
+        conn.execute("DETACH __compact")
+    except duckdb.Error:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return None
+    finally:
+        conn.close()
+    before = os.path.getsize(path)
+    os.replace(tmp, path)
+    return before, os.path.getsize(path)
+
 class DuckDBManager:
-    def __init__(self, path=None):
+    def __init__(self, path=None, profile=DEFAULT_PROFILE, read_only=False, share=1):
         # If no path is provided, it will create an in-memory db or default
         # But we will pass the AppData path from MainWindow
-        self.conn = duckdb.connect(database=path if path else ":memory:", read_only=False)
+        # read_only opens an existing database alongside other read-only processes (batch reports)
+        compacted = compact_database_file(path) if path and not read_only else None
+        self.conn = duckdb.connect(database=path if path else ":memory:", read_only=read_only)
+        self.path = path
+        self.read_only = read_only
+        # Every query runs on a cursor checked out of a pool: DuckDB cursors are
+        # independent connections to the same database, so GUI reads proceed
+        # under MVCC while a worker thread holds the single write slot.
+        self._pool = []
+        self._pool_lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._versions = {}     # table -> generation, bumped on every rewrite
+        self._stats_cache = OrderedDict()  # (table, generation, start, end, columns) -> stats
+        self._outlier_cache = OrderedDict()  # (table, generation, column, half window, threshold) -> (mask, medians)
+        self._stores = {}       # table -> (generation, ChannelStore or None)
+        self._accessed = {}     # table -> last access, flushed to _ams_catalog by maintain()
+        self._dirty = False     # anything written since the last CHECKPOINT
+        self._stale_meta = set()  # tables whose catalog row count/span/schema is out of date
+        self.keep_history = bool(path) and not read_only  # in-memory databases are thrown away anyway
+        self.modified = set()   # tables (re)written here, published to the shared cache when a session closes
+        self.dropped = set()    # tables deleted here, removed from the shared cache likewise
+        # Tables opened from the shared cache are read there in place until first written:
+        # table -> cache revision. The cache stays attached read-only as __cache while
+        # anything is borrowed, which also keeps other instances from republishing it.
+        self._borrowed = {}
+        self._foreign = set()   # revisions minted by the cache: their channel stores are the cache's to remove
+        self.cache_path = None
+        self._cache_open = False
+        self._cache_users = 0   # cursors checked out while the cache is attached, and borrows under way
+        self._cache_lock = threading.RLock()
+        self._attach_lock = threading.Lock()  # held while waiting to attach; readers never take it
+        self.spill_dir = spill_dir(path)
+        if not read_only:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS _ams_derived (
+                    table_name VARCHAR, name VARCHAR, kind VARCHAR, source VARCHAR,
+                    source2 VARCHAR, p1 DOUBLE, p2 DOUBLE, PRIMARY KEY (table_name, name)
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS _ams_catalog (
+                    table_name VARCHAR PRIMARY KEY, source VARCHAR,
+                    created TIMESTAMP, last_access TIMESTAMP,
+                    row_count BIGINT, first_ts TIMESTAMP, last_ts TIMESTAMP, schema VARCHAR
+                )
+            """)
+            # Persistent counterpart of _versions: names the channel store matching the contents
+            self.conn.execute("ALTER TABLE _ams_catalog ADD COLUMN IF NOT EXISTS revision VARCHAR")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS _ams_quality (
+                    table_name VARCHAR PRIMARY KEY, computed TIMESTAMP, report VARCHAR
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS _ams_history (
+                    id BIGINT PRIMARY KEY, table_name VARCHAR, operation VARCHAR, taken TIMESTAMP,
+                    row_count BIGINT, bytes BIGINT, state VARCHAR
+                )
+            """)
+            self.conn.execute("CREATE SEQUENCE IF NOT EXISTS _ams_history_seq")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS _ams_maintenance (
+                    logged_at TIMESTAMP, action VARCHAR, detail VARCHAR, bytes_before BIGINT, bytes_after BIGINT
+                )
+            """)
+            # Tables from databases predating the catalog start their clock now
+            self.conn.execute("""
+                INSERT INTO _ams_catalog (table_name, created, last_access, row_count)
+                SELECT table_name, now(), now(), estimated_size FROM duckdb_tables()
+                WHERE database_name = current_database() AND schema_name = 'main' AND NOT temporary
+                  AND table_name NOT LIKE '\\_ams\\_%' ESCAPE '\\'
+                  AND table_name NOT IN (SELECT table_name FROM _ams_catalog)
+            """)
+        if compacted:
+            self._log_maintenance("compact", path, *compacted)
+        self.profile = None
+        self.share = share
+        self.apply_profile(profile)
+
+    def _acquire(self):
+        with self._pool_lock:
+            if self._pool:
+                return self._pool.pop()
+        return self.conn.cursor()
+
+    def _release(self, cur):
+        # A result read with fetchone() stays open and keeps its transaction alive,
+        # which blocks CHECKPOINT; draining the rest closes it.
+        try:
+            cur.fetchall()
+        except duckdb.Error:
+            pass  # no result pending
+        with self._pool_lock:
+            if len(self._pool) < CURSOR_POOL_SIZE:
+                self._pool.append(cur)
+                return
+        cur.close()
+
+    @contextmanager
+    def reader(self):
+        """A pooled cursor for read-only queries; readers never wait for writers."""
+        cur = self._acquire()
+        try:
+            with self._cache_use():
+                yield cur
+        finally:
+            self._release(cur)
+
+    @contextmanager
+    def writer(self):
+        """A pooled cursor holding the write slot, so bulk rewrites never interleave."""
+        with self._write_lock:
+            cur = self._acquire()
+            try:
+                with self._cache_use():
+                    yield cur
+            finally:
+                self._release(cur)
+
+    @contextmanager
+    def _cache_use(self):
+        """Counts the cursors checked out while the shared cache is attached, so it is never detached under one."""
+        with self._cache_lock:
+            counted = self._cache_open
+            if counted:
+                self._cache_users += 1
+        try:
+            yield
+        finally:
+            if counted:
+                with self._cache_lock:
+                    self._cache_users -= 1
+                self._detach_cache()
+
+    def _attach_cache(self, cur):
+        """
+        Attaches the shared cache read-only as __cache for the first borrowed table.
+        ATTACH is instance-wide, so every cursor sees it. While another instance is
+        publishing the attach fails: worker threads wait for it, the GUI thread does not.
+        """
+        with self._attach_lock:
+            if self._cache_open:
+                return
+            sql = f"ATTACH {quote_literal(self.cache_path)} AS __cache (READ_ONLY)"
+            if threading.current_thread() is threading.main_thread():
+                cur.execute(sql)
+            else:
+                retry_locked(cur.execute, sql)
+            with self._cache_lock:
+                self._cache_open = True
+
+    def _detach_cache(self):
+        """Detaches the shared cache once nothing is borrowed from it and no cursor may still read it."""
+        with self._cache_lock:
+            if not self._cache_open or self._borrowed or self._cache_users:
+                return
+            cur = self._acquire()
+            try:
+                cur.execute("DETACH DATABASE IF EXISTS __cache")
+            finally:
+                self._release(cur)
+            self._cache_open = False
+
+    def _end_borrow(self, table_name):
+        if self._borrowed.pop(table_name, None) is not None:
+            self._detach_cache()
+
+    def _ref(self, table_name):
+        """The name a query reads a table by: borrowed tables live in the attached cache."""
+        return f"__cache.main.{table_name}" if table_name in self._borrowed else table_name
+
+    def _own(self, cur, table_name):
+        """Copies a borrowed table into this session before it is changed in place."""
+        if table_name in self._borrowed:
+            cur.execute(f"CREATE TABLE {table_name} AS SELECT * FROM {self._ref(table_name)}")
+            self._end_borrow(table_name)  # detached once the writer's cursor is released
+
+    def close(self):
+        with self._write_lock, self._pool_lock:
+            for cur in self._pool:
+                cur.close()
+            self._pool.clear()
+            self.conn.close()
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def apply_profile(self, name, share=None):
+        """
+        Applies a resource profile to the database instance. The settings are global,
+        so every pooled cursor picks them up, including queries already running.
+        `share` splits threads and memory between that many processes running side by side
+        (default: as given when the database was opened).
+        """
+        if share is not None:
+            self.share = share
+        share = self.share
+        spec = RESOURCE_PROFILES[name]
+        os.makedirs(self.spill_dir, exist_ok=True)
+        settings = {
+            "threads": max(1, spec["threads"] // share),
+            "temp_directory": self.spill_dir,
+            "preserve_insertion_order": spec["preserve_insertion_order"],
+        }
+        ram = physical_memory_bytes()
+        if ram:
+            settings["memory_limit"] = f"{int(ram * spec['memory_fraction'] / share) // (1024 * 1024)}MiB"
+        with self.reader() as cur:
+            for key, value in settings.items():
+                cur.execute(f"SET GLOBAL {key} = ?", [value])
+        self.profile = name
+
+    def memory_usage(self):
+        """Returns (buffer manager bytes in memory, bytes spilled to disk, configured memory limit)."""
+        with self.reader() as cur:
+            used, spilled = cur.execute(
+                "SELECT sum(memory_usage_bytes), sum(temporary_storage_bytes) FROM duckdb_memory()").fetchone()
+            limit = cur.execute("SELECT current_setting('memory_limit')").fetchone()[0]
+        return int(used or 0), int(spilled or 0), limit
+
+    def _bump(self, table_name, source=None, revision=None):
+        """
+        Marks a table as rewritten so memoised results for it are discarded and its
+        stored revision (what a channel store is matched against) changes; copies pass
+        the revision they carry over. Imports pass their source, which (re)registers
+        the table in the catalog. A bump carrying the borrowed revision keeps the borrow.
+        """
+        if revision is None or self._borrowed.get(table_name) != revision:
+            self._end_borrow(table_name)
+        self._forget(table_name)
+        if table_name.startswith(INTERNAL_PREFIX):
+            return
+        revision = revision or uuid.uuid4().hex
+        with self.writer() as cur:
+            previous = cur.execute("SELECT revision FROM _ams_catalog WHERE table_name = ?", [table_name]).fetchone()
+            if previous and previous[0] and previous[0] != revision and previous[0] not in self._foreign \
+                    and self._owns_stores():
+                remove_store(previous[0])
+            if source is not None:
+                cur.execute("""
+                    INSERT INTO _ams_catalog (table_name, source, created, last_access, revision) VALUES (?, ?, now(), now(), ?)
+                    ON CONFLICT (table_name) DO UPDATE SET source = excluded.source, last_access = now(),
+                        revision = excluded.revision
+                """, [table_name, source, revision])
+            else:
+                cur.execute("UPDATE _ams_catalog SET revision = ? WHERE table_name = ?", [revision, table_name])
+
+    def _forget(self, table_name):
+        """Discards memoised results of a changed table and marks it for publishing."""
+        self._versions[table_name] = self._versions.get(table_name, 0) + 1
+        self._stats_cache = OrderedDict((k, v) for k, v in self._stats_cache.items() if k[0] != table_name)
+        self._stores.pop(table_name, None)
+        self._dirty = True
+        if table_name.startswith(INTERNAL_PREFIX):
+            return
+        self.modified.add(table_name)
+        self.dropped.discard(table_name)
+        self._stale_meta.add(table_name)
+        self.touch(table_name)
+
+    def _grow(self, table_name):
+        """
+        Marks rows appended after the last sample of a table. The revision is kept and
+        its channel store grows by the new rows in place, so live follow neither drops
+        the store nor rewrites it on every poll. Tables whose store cannot simply grow
+        (borrowed, older revisions of the cache, rows stamped before the stored ones)
+        get a new revision through _bump().
+        """
+        revision = self.revision(table_name)
+        if not revision or revision in self._foreign or not self._owns_stores() or table_name in self._borrowed:
+            return self._bump(table_name)
+        store = open_store(revision)
+        if store is not None and not self._extend_store(table_name, revision, store):
+            return self._bump(table_name)
+        self._forget(table_name)
+
+    def _extend_store(self, table_name, revision, store):
+        """Appends the rows stamped after the end of the store; False when that would not match the table."""
+        columns = list(store.channels)
+        if columns != self.numeric_columns(table_name):
+            return False
+        stored = len(store.time)
+        last = int(store.time[-1].view("int64")) if stored else None
+        sql, params = self._numpy_sql(table_name, columns, dtype=STORE_DTYPE)
+        ts = self.time_expr(table_name)
+        with self.reader() as cur, self._transaction(cur):
+            rows = cur.execute(f"SELECT count({ts}) FROM {self._ref(table_name)}").fetchone()[0]
+            tail = f"SELECT * FROM ({sql}) WHERE __t > ?" if last is not None else sql
+            arrays = cur.execute(tail, params + ([last] if last is not None else [])).fetchnumpy()
+        if stored + len(arrays["__t"]) != rows:
+            return False  # new rows fall inside the stored range
+        return extend_store(revision, arrays, stored) is not None
+
+    # ------------------------------
+    # Storage lifecycle
+    # ------------------------------
+    def touch(self, table_name):
+        """Records a table as used; kept in memory so the GUI never waits on a write."""
+        self._accessed[table_name] = datetime.now()
+
+    def flush_access(self):
+        """Writes the access times recorded by touch() to the catalog."""
+        accessed, self._accessed = self._accessed, {}
+        if not accessed:
+            return
+        with self.writer() as cur:
+            cur.executemany("UPDATE _ams_catalog SET last_access = greatest(last_access, ?) WHERE table_name = ?",
+                            [[at, table_name] for table_name, at in accessed.items()])
+        self._dirty = True
+
+    def catalog(self):
+        """Catalogued tables with their stored metadata, most recently used first."""
+        with self.reader() as cur:
+            return self._read_catalog(cur, "_ams_catalog")
+
+    def cached_catalog(self):
+        """The catalog of the shared cache, read through the attachment while tables are borrowed from it."""
+        with self.reader() as cur:
+            if self._cache_open:
+                return self._read_catalog(cur, "__cache.main._ams_catalog")
+        return cached_sessions()
+
+    @staticmethod
+    def _read_catalog(cur, catalog_table):
+        fields = ("table_name", "source", "created", "last_access", "row_count", "first_ts", "last_ts", "schema",
+                  "revision")
+        result = cur.execute(f"SELECT * FROM {catalog_table} ORDER BY last_access DESC")
+        names = [d[0] for d in result.description]
+        rows = result.fetchall()
+        # Columns added later are None in a database opened read-only before upgrading it
+        return [{f: entry.get(f) for f in fields} for entry in (dict(zip(names, r)) for r in rows)]
+
+    def catalog_entry(self, table_name):
+        return next((e for e in self.catalog() if e["table_name"] == table_name), None)
+
+    def revision(self, table_name):
+        """Revision of a table's contents: the cache's for a borrowed table, else the catalog's (or None)."""
+        if self._borrowed.get(table_name):
+            return self._borrowed[table_name]
+        entry = self.catalog_entry(table_name)
+        return entry["revision"] if entry else None
+
+    @traced("db.refresh_catalog")
+    def refresh_catalog(self, table_name):
+        """
+        Stores row count, time span and schema of a table, so the session list and a
+        restored window can describe it without scanning the data.
+        """
+        columns = self.columns(table_name)
+        start = end = None
+        if self.datetime_column(table_name):
+            start, end = self.time_span(table_name)
+        schema = ", ".join(f"{name} {dtype}" for name, dtype in columns)
+        rows = self.table_count(table_name)
+        self._stale_meta.discard(table_name)
+        with self.writer() as cur:
+            cur.execute("""
+                INSERT INTO _ams_catalog (table_name, created, last_access, row_count, first_ts, last_ts, schema)
+                VALUES (?, now(), now(), ?, ?, ?, ?)
+                ON CONFLICT (table_name) DO UPDATE SET row_count = excluded.row_count, first_ts = excluded.first_ts,
+                    last_ts = excluded.last_ts, schema = excluded.schema
+            """, [table_name, rows, start, end, schema])
+
+    def _owns_stores(self):
+        """Whether this database writes (and so removes) channel stores at all."""
+        return bool(self.path) and not self.read_only
+
+    def drop_table(self, table_name):
+        """
+        Deletes a table together with its catalog entry, derived-channel definitions,
+        snapshots and channel store; the store of a revision opened from the shared cache
+        is left for the cache to remove.
+        """
+        revision = self.revision(table_name)
+        with self.writer() as cur:
+            cur.execute(f"DROP TABLE IF EXISTS {table_name}")
+            self._drop_snapshots(cur, "table_name = ?", [table_name])
+            cur.execute("DELETE FROM _ams_catalog WHERE table_name = ?", [table_name])
+            cur.execute("DELETE FROM _ams_derived WHERE table_name = ?", [table_name])
+            cur.execute("DELETE FROM _ams_quality WHERE table_name = ?", [table_name])
+        self._versions.pop(table_name, None)
+        self._accessed.pop(table_name, None)
+        self._stores.pop(table_name, None)
+        self._end_borrow(table_name)
+        self.modified.discard(table_name)
+        self.dropped.add(table_name)
+        if revision and revision not in self._foreign and self._owns_stores():
+            remove_store(revision)
+        self._stale_meta.discard(table_name)
+        self._stats_cache = OrderedDict((k, v) for k, v in self._stats_cache.items() if k[0] != table_name)
+        self._dirty = True
+
+    def database_size(self):
+        """(bytes in use, bytes allocated in the file) of the database."""
+        with self.reader() as cur:
+            return _size_info(cur)
+
+    def _log_maintenance(self, action, detail, before, after):
+        with self.writer() as cur:
+            cur.execute("INSERT INTO _ams_maintenance VALUES (now(), ?, ?, ?, ?)", [action, detail, before, after])
+        print(f"[Maintenance] {action} {detail}: {format_bytes(before)} -> {format_bytes(after)}")
+
+    def maintenance_log(self, limit=50):
+        with self.reader() as cur:
+            return cur.execute(
+                "SELECT logged_at, action, detail, bytes_before, bytes_after FROM _ams_maintenance ORDER BY logged_at DESC LIMIT ?",
+                [limit]).fetchall()
+
+    def channel_store_bytes(self):
+        """Disk space taken by the channel stores of the catalogued tables, except those the shared cache owns."""
+        with self.reader() as cur:
+            revisions = [r[0] for r in cur.execute("SELECT revision FROM _ams_catalog WHERE revision IS NOT NULL").fetchall()]
+        return sum(store_bytes(revision) for revision in revisions if revision not in self._foreign)
+
+    def _disk_bytes(self, cur):
+        """What counts against the disk budget: database blocks in use plus the channel stores."""
+        return _size_info(cur)[0] + (self.channel_store_bytes() if self._owns_stores() else 0)
+
+    @traced("db.maintain")
+    def maintain(self, budget_bytes=DISK_BUDGET_BYTES, stale_days=STALE_DAYS, keep=(), evict=True, sweep=False):
+        """
+        Idle-time housekeeping: persists access times and session metadata, evicts stale tables and then
+        least recently used ones (with their channel stores) until the database and the stores fit
+        the budget, and checkpoints so freed blocks become reusable. Returns what was done and how
+        much it freed. Session databases pass evict=False: the shared cache they publish to is evicted instead.
+        With `sweep` the store folders no catalogued table refers to are removed as well, which only the
+        shared cache may do, and only while no session holds stores it has not published yet.
+        """
+        with self.writer() as cur:
+            self.flush_access()
+            for table_name in list(self._stale_meta):
+                self.refresh_catalog(table_name)
+            if self._dirty:
+                cur.execute("CHECKPOINT")  # so the before/after sizes compare settled files
+                self._dirty = False
+            candidates = [r[0] for r in cur.execute(
+                "SELECT table_name FROM _ams_catalog ORDER BY last_access").fetchall() if r[0] not in keep] if evict else []
+            stale = {r[0] for r in cur.execute(
+                "SELECT table_name FROM _ams_catalog WHERE last_access < ?",
+                [datetime.now() - timedelta(days=stale_days)]).fetchall()}
+
+            before = self._disk_bytes(cur)
+            evicted = []
+            for table_name in candidates:
+                if table_name not in stale and self._disk_bytes(cur) <= budget_bytes:
+                    break
+                self.drop_table(table_name)
+                cur.execute("CHECKPOINT")
+                evicted.append(table_name)
+            if self._dirty:
+                cur.execute("CHECKPOINT")
+                self._dirty = False
+            after = self._disk_bytes(cur)
+            if sweep:
+                revisions = {r[0] for r in cur.execute("SELECT revision FROM _ams_catalog WHERE revision IS NOT NULL").fetchall()}
+                swept, freed = sweep_stores(revisions)
+            else:
+                swept, freed = 0, 0
+
+        if swept:
+            self._log_maintenance("sweep", f"{swept} channel stores", after + freed, after)
+        if evicted:
+            self._log_maintenance("evict", ", ".join(evicted), before, after)
+        elif before != after:
+            self._log_maintenance("checkpoint", "", before, after)
+        return {"evicted": evicted, "swept": swept, "before": before, "after": after,
+                "reclaimed": max(0, before - after) + freed}
+
+    # ------------------------------
+    # Table history
+    # ------------------------------
+    @staticmethod
+    @contextmanager
+    def _transaction(cur):
+        """Runs the statements of the block as one transaction, so a failed rewrite leaves the table as it was."""
+        cur.execute("BEGIN TRANSACTION")
+        try:
+            yield
+        except BaseException:
+            cur.execute("ROLLBACK")
+            raise
+        cur.execute("COMMIT")
+
+    @staticmethod
+    def _table_exists(cur, table_name):
+        return cur.execute(
+            "SELECT count(*) FROM duckdb_tables() WHERE table_name = ? AND database_name = current_database() "
+            "AND NOT temporary", [table_name]
+        ).fetchone()[0] > 0
+
+    def _snapshot(self, cur, table_name, operation, move=False):
+        """
+        Keeps the current contents of a table before a bulk operation replaces them.
+        With `move` the table itself becomes the snapshot (a rename, nothing is copied)
+        and the caller recreates it; otherwise DuckDB copies it, as it does a table still
+        borrowed from the shared cache. Returns the snapshot table, or None when the
+        table does not exist or no history is kept.
+        """
+        borrowed = table_name in self._borrowed
+        if not self.keep_history or table_name.startswith(INTERNAL_PREFIX) or not (
+                borrowed or self._table_exists(cur, table_name)):
+            return None
+        snapshot_id = cur.execute("SELECT nextval('_ams_history_seq')").fetchone()[0]
+        snapshot = f"{HISTORY_PREFIX}{snapshot_id}"
+        if move and not borrowed:
+            cur.execute(f"ALTER TABLE {table_name} RENAME TO {snapshot}")
+        else:
+            cur.execute(f"CREATE TABLE {snapshot} AS SELECT * FROM {self._ref(table_name)}")
+        rows = cur.execute(f"SELECT count(*) FROM {snapshot}").fetchone()[0]
+        # Uncompressed size: 16 bytes per string header, 8 per other value
+        width = cur.execute(
+            "SELECT sum(CASE WHEN data_type = 'VARCHAR' THEN 16 ELSE 8 END) FROM duckdb_columns() WHERE table_name = ?",
+            [snapshot]).fetchone()[0] or 0
+        entry = self.catalog_entry(table_name)
+        state = {"source": entry["source"] if entry else None,
+                 "derived": self.derived_channels(table_name),
+                 "quality": self.quality_report(table_name)}
+        cur.execute("INSERT INTO _ams_history VALUES (?, ?, ?, now(), ?, ?, ?)",
+                    [snapshot_id, table_name, operation, rows, rows * width, json.dumps(state)])
+        self._enforce_history_budget(cur)
+        self._dirty = True
+        return snapshot
+
+    def _enforce_history_budget(self, cur, budget_bytes=HISTORY_BUDGET_BYTES, depth=HISTORY_DEPTH):
+        """Drops the oldest snapshots beyond `depth` per table or `budget_bytes` in total."""
+        total, per_table, evict = 0, {}, []
+        rows = cur.execute("SELECT id, table_name, bytes FROM _ams_history ORDER BY id DESC").fetchall()
+        for i, (snapshot_id, table_name, size) in enumerate(rows):
+            per_table[table_name] = per_table.get(table_name, 0) + 1
+            if i > 0 and (per_table[table_name] > depth or total + size > budget_bytes):
+                evict.append(snapshot_id)
+            else:
+                total += size
+        if evict:
+            self._drop_snapshots(cur, f"id IN ({', '.join('?' * len(evict))})", evict)
+
+    @staticmethod
+    def _drop_snapshots(cur, where, params):
+        for (snapshot_id,) in cur.execute(f"SELECT id FROM _ams_history WHERE {where}", params).fetchall():
+            cur.execute(f"DROP TABLE IF EXISTS {HISTORY_PREFIX}{snapshot_id}")
+        cur.execute(f"DELETE FROM _ams_history WHERE {where}", params)
+
+    def history(self, table_name):
+        """
+        Snapshots of a table, newest first. A table borrowed from the shared cache also
+        lists the snapshots the cache kept of it, marked `cached`.
+        """
+        fields = ("id", "operation", "taken", "row_count", "bytes")
+        sql = f"SELECT {', '.join(fields)} FROM {{}} WHERE table_name = ? ORDER BY id DESC"
+        with self.reader() as cur:
+            rows = [r + (False,) for r in cur.execute(sql.format("_ams_history"), [table_name]).fetchall()]
+            if table_name in self._borrowed:
+                rows += [r + (True,) for r in cur.execute(sql.format("__cache.main._ams_history"),
+                                                          [table_name]).fetchall()]
+        return [dict(zip(fields + ("cached",), r)) for r in rows]
+
+    def delete_snapshot(self, snapshot_id):
+        with self.writer() as cur:
+            self._drop_snapshots(cur, "id = ?", [snapshot_id])
+        self._dirty = True
+
+    @traced("db.rollback")
+    def rollback(self, snapshot_id, cached=False):
+        """
+        Puts a table back into the state a snapshot kept, together with its source,
+        derived-channel definitions and quality report. The snapshot is renamed back,
+        so this takes moments whatever the table size; the replaced contents become
+        a snapshot in turn, so a rollback can be undone. A `cached` snapshot, kept by
+        the shared cache of a borrowed table, is copied into the session instead and
+        stays in the cache. Returns the table name.
+        """
+        with self.writer() as cur, self._transaction(cur):
+            history = "__cache.main._ams_history" if cached and self._cache_open else "_ams_history"
+            row = cur.execute(f"SELECT table_name, state FROM {history} WHERE id = ?", [snapshot_id]).fetchone()
+            if row is None or (cached and row[0] not in self._borrowed):
+                raise ValueError(f"Snapshot {snapshot_id} no longer exists")
+            table_name, state = row[0], json.loads(row[1])
+            if cached:
+                self._snapshot(cur, table_name, "rollback")
+                cur.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM __cache.main.{HISTORY_PREFIX}{snapshot_id}")
+            else:
+                cur.execute("DELETE FROM _ams_history WHERE id = ?", [snapshot_id])  # out of reach of the eviction below
+                if not self._snapshot(cur, table_name, "rollback", move=True):
+                    cur.execute(f"DROP TABLE IF EXISTS {table_name}")
+                cur.execute(f"ALTER TABLE {HISTORY_PREFIX}{snapshot_id} RENAME TO {table_name}")
+            cur.execute("DELETE FROM _ams_derived WHERE table_name = ?", [table_name])
+            for d in state["derived"]:
+                cur.execute("INSERT INTO _ams_derived VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            [table_name, d["name"], d["kind"], d["source"], d["source2"], d["p1"], d["p2"]])
+            if state["quality"] is None:
+                cur.execute("DELETE FROM _ams_quality WHERE table_name = ?", [table_name])
+            else:
+                self._store_quality(cur, table_name, state["quality"], replace=True)
+        self._bump(table_name, source=state["source"])
+        self.refresh_catalog(table_name)
+        return table_name
 
+    # ------------------------------
+    # Session databases
+    # ------------------------------
+    @staticmethod
+    def _copy_meta(cur, source_db, table_name):
+        """Replaces the catalog, derived-channel and quality rows of a table with those of an attached database."""
+        for meta in ("_ams_catalog", "_ams_derived", "_ams_quality"):
+            cur.execute(f"DELETE FROM {meta} WHERE table_name = ?", [table_name])
+            cur.execute(f"INSERT INTO {meta} BY NAME SELECT * FROM {source_db}.main.{meta} WHERE table_name = ?",
+                        [table_name])
+
+    @traced("db.restore_cached")
+    def restore_cached(self, cache_path, table_name):
+        """
+        Opens a table of the shared cache in this session without copying its rows:
+        only its metadata rows are copied, and queries read the table in the cache
+        (see _attach_cache) until it is first written, when _own() copies it here.
+        """
+        self.cache_path = cache_path
+        with self._cache_lock:
+            self._cache_users += 1  # keeps the cache attached until the borrow is registered
+        try:
+            with self.reader() as cur:  # waiting to attach must not hold the write slot
+                self._attach_cache(cur)
+            with self.writer() as cur:
+                revision = cur.execute("SELECT revision FROM __cache.main._ams_catalog WHERE table_name = ?",
+                                       [table_name]).fetchone()
+                if revision is None:
+                    raise ValueError(f"{table_name} is no longer in the shared cache")
+                with self._transaction(cur):
+                    cur.execute(f"DROP TABLE IF EXISTS {table_name}")
+                    self._copy_meta(cur, "__cache", table_name)
+                with self._cache_lock:
+                    self._borrowed[table_name] = revision[0]
+                    self._foreign.add(revision[0])
+        finally:
+            with self._cache_lock:
+                self._cache_users -= 1
+            self._detach_cache()
+        self._bump(table_name, revision=revision[0])
+        self.modified.discard(table_name)  # identical to the cached copy
+        self._stale_meta.discard(table_name)
+
+    @traced("db.adopt_session")
+    def adopt_session(self, session_path, tables=None, dropped=(), progress_callback=None):
+        """
+        Publishes a closed session database into this one, the shared cache: `tables`
+        (all catalogued ones when None) replace their cached copies unless the cache
+        already holds their revision, `dropped` are deleted, and the access times of
+        the rest are carried over. A replaced copy becomes a snapshot of the cache,
+        which sessions borrowing the table can roll back to; the session's own
+        snapshots stay behind with it. Returns the tables copied.
+        """
+        for table_name in dropped:
+            self.drop_table(table_name)
+        with self.writer() as cur:
+            cur.execute(f"ATTACH {quote_literal(session_path)} AS __session (READ_ONLY)")
+            try:
+                revisions = dict(cur.execute("SELECT table_name, revision FROM __session.main._ams_catalog").fetchall())
+                cached = dict(cur.execute("SELECT table_name, revision FROM _ams_catalog").fetchall())
+                tables = [t for t in (revisions if tables is None else tables)
+                          if t in revisions and (revisions[t] is None or revisions[t] != cached.get(t))]
+                for i, table_name in enumerate(tables):
+                    with self._transaction(cur):
+                        if not self._snapshot(cur, table_name, "publish", move=True):
+                            cur.execute(f"DROP TABLE IF EXISTS {table_name}")
+                        cur.execute(f"CREATE TABLE {table_name} AS SELECT * FROM __session.main.{table_name}")
+                        self._copy_meta(cur, "__session", table_name)
+                    if cached.get(table_name) and self._owns_stores():
+                        remove_store(cached[table_name])  # the replaced revision
+                    if progress_callback:
+                        progress_callback(100 * (i + 1) // len(tables))
+                cur.execute("""
+                    UPDATE _ams_catalog SET last_access = greatest(_ams_catalog.last_access, s.last_access)
+                    FROM __session.main._ams_catalog s WHERE _ams_catalog.table_name = s.table_name
+                """)
+            finally:
+                cur.execute("DETACH __session")
+        for table_name in tables:
+            self._bump(table_name, revision=self.catalog_entry(table_name)["revision"])
+        return tables
+
+    @traced("db.import_csv")
     def import_csv(self, csv_path, table_name, delimiter=";", has_header=True, ignore_errors=True, progress_callback=None):
         hdr = "true" if has_header else "false"
         err_flag = "true" if ignore_errors else "false"
         sql = f"""
             CREATE OR REPLACE TABLE {table_name} AS
             SELECT * FROM read_csv_auto(
-                '{csv_path}',
+                {quote_literal(csv_path)},
                 header={hdr},
                 delim='{delimiter}',
                 ignore_errors={err_flag},
-                sample_size=-1
+                sample_size=-1{self._rejects_options(ignore_errors)}
             );
         """
-        self.conn.execute(sql)
+        with self.writer() as cur:
+            self._clear_rejects(cur)
+            with self._transaction(cur):
+                self._snapshot(cur, table_name, "import", move=True)
+                cur.execute(sql)
+            self._store_quality(cur, table_name, {"rejected_lines": self._clear_rejects(cur)}, replace=True)
+        self._bump(table_name, source=csv_path)
+        if progress_callback:
+            progress_callback(100)
+
+    @traced("db.import_csv_many")
+    def import_csv_many(self, paths, table_name, delimiter=";", has_header=True, ignore_errors=True, progress_callback=None):
+        """
+        Loads many CSV logs (a list of paths or a glob pattern) into one table in a
+        single parallel DuckDB scan, tagging each row with its source file,
+        dropping timestamps repeated across overlapping logs and sorting once by time.
+        Plain, .gz and .zst files are read by DuckDB; the CSV members of a .zip are
+        decompressed block by block straight into DuckDB, never unpacked to disk.
+        """
+        files = sorted(glob.glob(paths)) if isinstance(paths, str) else list(paths)
+        if not files:
+            raise FileNotFoundError(f"No CSV files match {paths}")
+        archives = [f for f in files if f.lower().endswith(".zip")]
+        plain = [f for f in files if f not in archives]
+        hdr = "true" if has_header else "false"
+        err_flag = "true" if ignore_errors else "false"
+
+        with self.writer() as cur:
+            cur.execute("DROP TABLE IF EXISTS __import_staging")
+            if plain:
+                file_list = ", ".join(quote_literal(f) for f in plain)
+                self._stage_import(cur, f"""
+                    SELECT * EXCLUDE (filename), parse_filename(filename) AS {quote_ident(SOURCE_FILE_COL)}
+                    FROM read_csv(
+                        [{file_list}],
+                        header={hdr},
+                        delim='{delimiter}',
+                        ignore_errors={err_flag},
+                        sample_size=-1,
+                        union_by_name=true,
+                        filename=true
+                    )
+                """)
+            for archive in archives:
+                for member, fh in iter_zip_csv(archive):
+                    label = f"{os.path.basename(archive)}/{member}"
+                    for block in iter_csv_blocks(fh, has_header):
+                        self._stage_csv_block(cur, block, label, delimiter, has_header, ignore_errors)
+            if progress_callback:
+                progress_callback(50)
+
+            # Raw D055 logs carry ISO "D#date" / "TOD#time" strings, which sort
+            # chronologically as text; re-imported exports carry the formatted column.
+            cols = [r[0] for r in cur.execute("DESCRIBE __import_staging").fetchall()]
+            if cols[0] == DATETIME_COL:
+                keys = [f"try_strptime({quote_ident(DATETIME_COL)}, '{DATETIME_FORMAT}')"]
+            else:
+                keys = [quote_ident(c) for c in cols[:2]]
+            staged = cur.execute("SELECT count(*) FROM __import_staging").fetchone()[0]
+            with self._transaction(cur):
+                self._snapshot(cur, table_name, "import", move=True)
+                kept = cur.execute(f"""
+                    CREATE OR REPLACE TABLE {table_name} AS
+                    SELECT DISTINCT ON ({', '.join(keys)}) * FROM __import_staging
+                    ORDER BY {', '.join(keys)};
+                """).fetchone()[0]
+            cur.execute("DROP TABLE __import_staging")
+            # DuckDB cannot store rejects while unioning by name, so they stay unknown here
+            self._store_quality(cur, table_name, {"rejected_lines": None, "merged_duplicates": staged - kept},
+                                replace=True)
+        self._bump(table_name, source=paths if isinstance(paths, str) else os.pathsep.join(files))
+        if progress_callback:
+            progress_callback(100)
+
+    @staticmethod
+    def _rejects_options(ignore_errors):
+        """read_csv options collecting the lines ignore_errors would drop silently."""
+        if not ignore_errors:
+            return ""
+        return ", store_rejects=true, rejects_table='__import_rejects', rejects_scan='__import_reject_scans'"
+
+    @staticmethod
+    def _clear_rejects(cur):
+        """Drops the reject tables of the cursor's last scan, returning how many lines they held."""
+        exists = cur.execute(
+            "SELECT count(*) FROM duckdb_tables() WHERE table_name = '__import_rejects' AND temporary"
+        ).fetchone()[0]
+        rejected = cur.execute(  # one entry per faulty field, so count the lines
+            "SELECT count(DISTINCT (scan_id, file_id, line)) FROM __import_rejects").fetchone()[0] if exists else 0
+        cur.execute("DROP TABLE IF EXISTS __import_rejects")
+        cur.execute("DROP TABLE IF EXISTS __import_reject_scans")
+        return rejected
+
+    def _store_quality(self, cur, table_name, fields, replace=False):
+        """Merges `fields` into the stored data-quality report of a table (or starts a new one)."""
+        report = {} if replace else (self.quality_report(table_name) or {})
+        report.update(fields)
+        cur.execute("""
+            INSERT INTO _ams_quality VALUES (?, now(), ?)
+            ON CONFLICT (table_name) DO UPDATE SET computed = excluded.computed, report = excluded.report
+        """, [table_name, json.dumps(report)])
+
+    def quality_report(self, table_name):
+        """The data-quality report stored at import, as a dict, or None."""
+        with self.reader() as cur:
+            row = cur.execute("SELECT report FROM _ams_quality WHERE table_name = ?", [table_name]).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _stage_import(self, cur, select_sql):
+        """
+        Appends a source to the import staging table, adding the columns it has not seen
+        yet and widening those a source stores as a wider type (BIGINT to DOUBLE, say),
+        as union_by_name does when DuckDB reads the files in one scan.
+        """
+        have = self._staged_types(cur)
+        if not have:
+            cur.execute(f"CREATE TEMP TABLE __import_staging AS {select_sql}")
+            return
+        for name, dtype, *_ in cur.execute(f"DESCRIBE {select_sql}").fetchall():
+            if name not in have:
+                cur.execute(f"ALTER TABLE __import_staging ADD COLUMN {quote_ident(name)} {dtype}")
+            elif dtype != have[name]:
+                common = cur.execute(f"SELECT typeof(x) FROM (SELECT NULL::{have[name]} AS x "
+                                     f"UNION ALL SELECT NULL::{dtype}) LIMIT 1").fetchone()[0]
+                if common != have[name]:
+                    cur.execute(f"ALTER TABLE __import_staging ALTER COLUMN {quote_ident(name)} TYPE {common}")
+        cur.execute(f"INSERT INTO __import_staging BY NAME {select_sql}")
+
+    @staticmethod
+    def _staged_types(cur):
+        """{column: type} of the import staging table, empty before the first source."""
+        exists = cur.execute(
+            "SELECT count(*) FROM duckdb_tables() WHERE table_name = '__import_staging' AND temporary"
+        ).fetchone()[0]
+        return {r[0]: r[1] for r in cur.execute("DESCRIBE __import_staging").fetchall()} if exists else {}
+
+    def _stage_csv_block(self, cur, block, label, delimiter, has_header, ignore_errors):
+        """
+        Stages one block of a zipped CSV member, read by DuckDB from memory (through
+        fsspec) with its own type detection. A column that is empty throughout a block
+        is read as text, so it neither widens a typed staged column nor keeps one that
+        was empty so far as text.
+        """
+        rel = cur.read_csv(io.BytesIO(block), header=has_header, sep=delimiter, ignore_errors=ignore_errors,
+                           sample_size=-1)
+        rel.create_view("__csv_block")  # the block stays registered only while `rel` is alive
+        try:
+            have = self._staged_types(cur)
+            types = {c: str(t) for c, t in zip(rel.columns, rel.types)}
+            keep = [c for c, t in types.items() if t == "VARCHAR" and have.get(c, "VARCHAR") != "VARCHAR"]
+            retype = [c for c, t in types.items() if t != "VARCHAR" and have.get(c) == "VARCHAR"]
+            empty = set()
+            if keep:
+                counts = cur.execute(f"SELECT {', '.join(f'count({quote_ident(c)})' for c in keep)} FROM __csv_block").fetchone()
+                empty = {c for c, n in zip(keep, counts) if n == 0}
+            if retype:
+                counts = cur.execute(f"SELECT {', '.join(f'count({quote_ident(c)})' for c in retype)} FROM __import_staging").fetchone()
+                for c, n in zip(retype, counts):
+                    if n == 0:
+                        cur.execute(f"ALTER TABLE __import_staging ALTER COLUMN {quote_ident(c)} TYPE {types[c]}")
+            select = [f"NULL::{have[c]} AS {quote_ident(c)}" if c in empty else quote_ident(c) for c in rel.columns]
+            self._stage_import(cur, f"SELECT {', '.join(select)}, {quote_literal(label)} AS {quote_ident(SOURCE_FILE_COL)} "
+                                    f"FROM __csv_block")
+        finally:
+            cur.execute("DROP VIEW IF EXISTS __csv_block")
+
+    @traced("db.append_csv_rows")
+    def append_csv_rows(self, table_name, data, header, delimiter=";", after=None, source_name=None):
+        """
+        Appends raw CSV lines (bytes without a header) to an existing table,
+        reformatting only the new rows the same way the full import does.
+        Rows stamped at or before `after` are skipped. Returns (rows_added, last_timestamp).
+        """
+        chunk = pd.read_csv(io.BytesIO(data), sep=delimiter, header=None, names=header,
+                            dtype=str, on_bad_lines="skip")
+        if chunk.empty:
+            return 0, after
+        types = dict(self.columns(table_name))
+        stored_ts = types.get(DATETIME_COL, "").startswith("TIMESTAMP")
+        select = []
+        if DATETIME_COL in types and DATETIME_COL not in header:
+            ts = RAW_TIMESTAMP_SQL.format(date=quote_ident(header[0]), time=quote_ident(header[1]))
+            rest = header[2:]
+        else:
+            ts = f"try_strptime({quote_ident(DATETIME_COL)}, '{DATETIME_FORMAT}')"
+            rest = [c for c in header if c != DATETIME_COL]
+        if DATETIME_COL in types:
+            value = ts if stored_ts else f"strftime({ts}, '{DATETIME_FORMAT}')"
+            select.append(f"{value} AS {quote_ident(DATETIME_COL)}")
+        select += [f"TRY_CAST({quote_ident(c)} AS {types[c]}) AS {quote_ident(c)}" for c in rest if c in types]
+        if SOURCE_FILE_COL in types and source_name:
+            select.append(f"? AS {quote_ident(SOURCE_FILE_COL)}")
+
+        with self.writer() as cur:
+            self._own(cur, table_name)
+            cur.register("__append_chunk", chunk)
+            try:
+                params = [source_name] if SOURCE_FILE_COL in types and source_name else []
+                cur.execute(f"CREATE OR REPLACE TEMP TABLE __append_rows AS SELECT {', '.join(select)}, {ts} AS __ts FROM __append_chunk", params)
+                where = "WHERE __ts > ?" if after is not None else ""
+                added = cur.execute(f"INSERT INTO {table_name} BY NAME SELECT * EXCLUDE (__ts) FROM __append_rows {where}",
+                                    [after] if after is not None else []).fetchone()[0]
+                last = cur.execute("SELECT max(__ts) FROM __append_rows").fetchone()[0]
+                cur.execute("DROP TABLE __append_rows")
+            finally:
+                cur.unregister("__append_chunk")
+        if added:
+            self._grow(table_name)
+        if last is None or (after is not None and last < after):
+            last = after
+        return added, last
+
+    def max_timestamp(self, table_name):
+        with self.reader() as cur:
+            return cur.execute(f"SELECT max({self.time_expr(table_name)}) FROM {self._ref(table_name)}").fetchone()[0]
+
+    @traced("db.import_file")
+    def import_file(self, path, table_name, delimiter=";", has_header=True, ignore_errors=True, progress_callback=None):
+        """Imports CSV (plain, .gz, .zst or zipped), Parquet or Arrow IPC, picked by file extension."""
+        lower = path.lower()
+        if lower.endswith(".zip"):
+            return self.import_csv_many([path], table_name, delimiter, has_header, ignore_errors, progress_callback)
+        if lower.endswith(".parquet"):
+            with self.writer() as cur, self._transaction(cur):
+                self._snapshot(cur, table_name, "import", move=True)
+                cur.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM read_parquet({quote_literal(path)})")
+        elif lower.endswith((".arrow", ".feather", ".ipc")):
+            import pyarrow.ipc  # optional dependency, only needed for Arrow archives
+            with pyarrow.memory_map(path) as source:
+                arrow_table = pyarrow.ipc.open_file(source).read_all()
+            with self.writer() as cur:
+                cur.register("__arrow_import", arrow_table)
+                try:
+                    with self._transaction(cur):
+                        self._snapshot(cur, table_name, "import", move=True)
+                        cur.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM __arrow_import")
+                finally:
+                    cur.unregister("__arrow_import")
+        else:
+            return self.import_csv(path, table_name, delimiter, has_header, ignore_errors, progress_callback)
+        with self.writer() as cur:
+            self._store_quality(cur, table_name, {"rejected_lines": 0}, replace=True)
+        self._bump(table_name, source=path)
         if progress_callback:
             progress_callback(100)
 
     def table_count(self, table_name):
-        return self.conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+        with self.reader() as cur:
+            return cur.execute(f"SELECT COUNT(*) FROM {self._ref(table_name)}").fetchone()[0]
 
     def get_page(self, table_name, offset=0, limit=CHUNK_SIZE):
-        return self.conn.execute(f"SELECT * FROM {table_name} LIMIT {limit} OFFSET {offset}").fetchdf()
+        with span("db.get_page", offset=offset) as s, self.reader() as cur:
+            df = cur.execute(f"SELECT * FROM {self._ref(table_name)} LIMIT {limit} OFFSET {offset}").fetchdf()
+            s.set(rows=len(df))
+        return df
 
-    def export_query_to_csv(self, sql, path, delimiter=";"):
-        self.conn.execute(f"COPY ({sql}) TO '{path}' (DELIMITER '{delimiter}', HEADER TRUE);")
+    def _numpy_sql(self, table_name, columns, start=None, end=None, dtype="float32"):
+        """SELECT (and parameters) of epoch-ms `__t` and `__c<i>` per channel, in time order, NaN for NULL."""
+        ts = self.time_expr(table_name)
+        sql_type = {"float32": "FLOAT", "float64": "DOUBLE"}[dtype]
+        select = [f"epoch_ms({ts}) AS __t"]
+        select += [f"coalesce(CAST({quote_ident(c)} AS {sql_type}), 'NaN'::{sql_type}) AS __c{i}" for i, c in enumerate(columns)]
+        window, params = self._time_window(table_name, start, end)
+        where = f"{ts} IS NOT NULL" + (f" AND {window}" if window else "")
+        # Row order breaks ties between equal stamps, so positional results (outlier masks) line up with every fetch
+        return f"SELECT {', '.join(select)} FROM {self._ref(table_name)} WHERE {where} ORDER BY __t, rowid", params
+
+    def fetch_numpy(self, table_name, columns, start=None, end=None, dtype="float32"):
+        """
+        Returns (time, {column: array}) ordered by time, straight from DuckDB's
+        NumPy conversion: `time` is datetime64[ms], each channel a contiguous
+        float32 (or float64) array with NaN for NULL. No DataFrame is built.
+        With a current channel store the arrays are views on its memory map instead.
+        """
+        store = self.channel_store(table_name) if dtype == STORE_DTYPE else None
+        if store is not None and store.has(columns):
+            with span("db.fetch_numpy", columns=len(columns), store=True) as s:
+                time, data = store.slice(columns, start, end)
+                s.set(rows=len(time))
+            return time, data
+        sql, params = self._numpy_sql(table_name, columns, start, end, dtype)
+        with span("db.fetch_numpy", columns=len(columns)) as s, self.reader() as cur:
+            arrays = cur.execute(sql, params).fetchnumpy()
+            s.set(rows=len(arrays["__t"]))
+        time = arrays["__t"].view("datetime64[ms]")  # int64 epoch-ms reinterpreted, no copy
+        return time, {c: arrays[f"__c{i}"] for i, c in enumerate(columns)}
 
-    def reformat_datetime_full_table(self, table_name):
-            total_rows = self.table_count(table_name)
-            if total_rows == 0:
+    # ------------------------------
+    # Channel store
+    # ------------------------------
+    def channel_store(self, table_name):
+        """The memory-mapped channel store matching the table's current revision, or None."""
+        generation = self._versions.get(table_name, 0)
+        cached = self._stores.get(table_name)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        store = None
+        if self.path:
+            revision = self.revision(table_name)
+            if revision:
+                store = open_store(revision)
+        self._stores[table_name] = (generation, store)
+        return store
+
+    @staticmethod
+    def _df_chunks(cur):
+        """Streams the pending result of a cursor as DataFrames of STORE_CHUNK_VECTORS vectors."""
+        while True:
+            chunk = cur.fetch_df_chunk(STORE_CHUNK_VECTORS)
+            if chunk.empty:
                 return
-            df = self.get_page(table_name, 0, total_rows)
-            if df.shape[1] < 2 or df.columns[0] == "Date and time":
-                return # Skip if already formatted or invalid
-                
-            dates = df.iloc[:, 0].astype(str).str.replace(r"^D#", "", regex=True)
-            times = df.iloc[:, 1].astype(str).str.replace(r"^TOD#", "", regex=True)
-            combined = dates + " " + times
-            dt = pd.to_datetime(combined, format="%Y-%m-%d %H:%M:%S.%f", errors="coerce")
-            
-            if dt.isna().all():
-                dt = pd.to_datetime(combined, errors="coerce") # Fallback
-                
-            if dt.notna().any():
-                formatted = dt.dt.strftime("%d/%m/%Y %H:%M:%S.%f").str[:-3]
-                df.iloc[:, 0] = formatted
-                df.drop(df.columns[1], axis=1, inplace=True)
-                df.rename(columns={df.columns[0]: 'Date and time'}, inplace=True) # Rename column
-                
-                self.conn.execute(f"DROP TABLE IF EXISTS {table_name}")
-                self.conn.register("tmp_df", df)
-                self.conn.execute(f"CREATE TABLE {table_name} AS SELECT * FROM tmp_df")
-                self.conn.unregister("tmp_df")
+            yield chunk
 
-# =======================================================
-# Worker Thread
-# =======================================================
-class WorkerThread(QtCore.QThread):
-    progress = Signal(int)
-    finished = Signal(object)
-    error = Signal(str)
+    @traced("db.build_channel_store")
+    def build_channel_store(self, table_name, min_rows=STORE_MIN_ROWS):
+        """
+        Writes the time axis and numeric channels of a reformatted table as .npy files,
+        unless a current store exists or the table is too small to benefit.
+        Returns the store or None.
+        """
+        if not self._owns_stores() or not self.datetime_column(table_name):
+            return None
+        store = self.channel_store(table_name)
+        if store is not None:
+            return store
+        if not self.catalog_entry(table_name):
+            return None
+        revision = self.revision(table_name)
+        if not revision:
+            self._bump(table_name)  # databases from before the channel store
+            revision = self.catalog_entry(table_name)["revision"]
+        generation = self._versions.get(table_name, 0)
+        columns = self.numeric_columns(table_name)
+        sql, params = self._numpy_sql(table_name, columns, dtype=STORE_DTYPE)
+        with self.reader() as cur, self._transaction(cur):  # count and rows from one snapshot
+            rows = cur.execute(f"SELECT count(*) FROM ({sql})", params).fetchone()[0]
+            if rows < min_rows:
+                return None
+            cur.execute(sql, params)
+            store = write_store(self._df_chunks(cur), table_name, revision, columns, rows)
+        if self._versions.get(table_name, 0) == generation:
+            self._stores[table_name] = (generation, store)
+        return store
+
+    def fetch_page_numpy(self, table_name, offset=0, limit=CHUNK_SIZE):
+        """Returns (column_names, [array, ...]) for one page of rows, column by column."""
+        with span("db.fetch_page", offset=offset) as s, self.reader() as cur:
+            arrays = cur.execute(f"SELECT * FROM {self._ref(table_name)} LIMIT {limit} OFFSET {offset}").fetchnumpy()
+            s.set(rows=len(next(iter(arrays.values()), ())))
+        return list(arrays.keys()), list(arrays.values())
+
+    def fetch_arrow(self, table_name, columns=None, offset=0, limit=None):
+        """Returns a pyarrow.Table of the selected columns (requires the optional pyarrow package)."""
+        cols = ", ".join(quote_ident(c) for c in columns) if columns else "*"
+        sql = f"SELECT {cols} FROM {self._ref(table_name)}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)} OFFSET {int(offset)}"
+        with self.reader() as cur:
+            return cur.execute(sql).arrow()
+
+    def query_range(self, table_name, start=None, end=None, columns=None, limit=None):
+        """
+        Rows with start <= time <= end in time order, as a DataFrame. On a clustered
+        table the bare timestamp predicate lets DuckDB skip every row group whose
+        min/max lies outside the window, so a short window reads a few row groups.
+        """
+        cols = ", ".join(quote_ident(c) for c in columns) if columns else "*"
+        where, params = self._time_window(table_name, start, end)
+        sql = (f"SELECT {cols} FROM {self._ref(table_name)}" + (f" WHERE {where}" if where else "")
+               + f" ORDER BY {self.time_expr(table_name)}")
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with span("db.query_range") as s, self.reader() as cur:
+            df = cur.execute(sql, params).fetchdf()
+            s.set(rows=len(df))
+        return df
 
-    def __init__(self, fn, *args, **kwargs):
-        super().__init__()
-        self.fn, self.args, self.kwargs = fn, args, kwargs
+    def datetime_column(self, table_name):
+        """Name of the timestamp column of a reformatted table, or None."""
+        return DATETIME_COL if DATETIME_COL in dict(self.columns(table_name)) else None
 
-    def run(self):
+    def columns(self, table_name):
+        """Returns [(column_name, duckdb_type), ...] without reading any rows."""
+        with self.reader() as cur:
+            return [(r[0], r[1]) for r in cur.execute(f"DESCRIBE {self._ref(table_name)}").fetchall()]
+
+    def numeric_columns(self, table_name):
+        numeric = ("TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "FLOAT", "DOUBLE", "DECIMAL")
+        return [name for name, dtype in self.columns(table_name) if dtype.startswith(numeric)]
+
+    def time_ordered(self, table_name):
+        """True for a reformatted table, which is stored sorted by its TIMESTAMP column."""
+        return self.time_expr(table_name) == quote_ident(DATETIME_COL)
+
+    def time_expr(self, table_name):
+        """
+        SQL expression yielding the row timestamp of a reformatted table: the stored
+        TIMESTAMP column itself, or a parse of the text column of older databases.
+        """
+        if dict(self.columns(table_name)).get(DATETIME_COL, "").startswith("TIMESTAMP"):
+            return quote_ident(DATETIME_COL)
+        return f"try_strptime({quote_ident(DATETIME_COL)}, '{DATETIME_FORMAT}')"
+
+    @traced("db.outliers")
+    def outliers(self, table_name, column, half_window=10, threshold=3.5):
+        """
+        Hampel outlier mask and window medians for a whole channel, aligned with
+        fetch_numpy(). Computed once per table generation and filter setting, so
+        every redraw and every consumer reuses the same result. Takes seconds on
+        large tables: the GUI calls it from a worker thread.
+        """
+        key = self._outlier_key(table_name, column, half_window, threshold)
+        if key in self._outlier_cache:
+            self._outlier_cache.move_to_end(key)
+            return self._outlier_cache[key]
+        _t, data = self.fetch_numpy(table_name, [column])
+        result = hampel(data[column], int(half_window), float(threshold))
+        self._outlier_cache[key] = result
+        while len(self._outlier_cache) > OUTLIER_CACHE_SIZE:
+            self._outlier_cache.popitem(last=False)
+        return result
+
+    def _outlier_key(self, table_name, column, half_window, threshold):
+        return (table_name, self._versions.get(table_name, 0), column, int(half_window), float(threshold))
+
+    def lookup_outliers(self, table_name, column, half_window=10, threshold=3.5):
+        """Returns the memoised (mask, medians) for the exact setting or None."""
+        return self._outlier_cache.get(self._outlier_key(table_name, column, half_window, threshold))
+
+    def outlier_report(self, table_name, columns, half_window=10, threshold=3.5):
+        """{column: (outlier count, sample count)} for the given Hampel setting."""
+        report = {}
+        for column in columns:
+            mask, _medians = self.outliers(table_name, column, half_window, threshold)
+            report[column] = (int(mask.sum()), len(mask))
+        return report
+
+    def _materialise_hampel(self, cur, table_name, spec):
+        """Writes the despiked copy of a channel; only outlier rows differ from the source."""
+        ts = self.time_expr(table_name)
+        src = quote_ident(spec["source"])
+        rows = cur.execute(f"SELECT rowid AS __rid, CAST({src} AS DOUBLE) AS __v FROM {table_name} "
+                           f"WHERE {ts} IS NOT NULL ORDER BY {ts}, rowid").fetchnumpy()
+        raw = rows["__v"]  # NULLs arrive masked; as NaN they are never flagged
+        values = (raw.filled(np.nan) if np.ma.isMaskedArray(raw) else np.asarray(raw)).astype("float64", copy=False)
+        mask, medians = hampel(values, int(spec["p1"]), spec["p2"])
+        target = quote_ident(spec["name"])
+        cur.execute(f"UPDATE {table_name} SET {target} = {src}")
+        fixes = pd.DataFrame({"__rid": np.asarray(rows["__rid"])[mask], "__v": clean(values, mask, medians)[mask]})
+        cur.register("__hampel_fixes", fixes)
         try:
-            def cb(p): self.progress.emit(int(p))
-            if "progress_callback" in self.kwargs:
-                self.kwargs["progress_callback"] = cb
-            result = self.fn(*self.args, **self.kwargs)
-            self.finished.emit(result)
-        except Exception as e:
-            self.error.emit(str(e))
+            cur.execute(f"UPDATE {table_name} SET {target} = f.__v FROM __hampel_fixes f WHERE {table_name}.rowid = f.__rid")
+        finally:
+            cur.unregister("__hampel_fixes")
+
+    def _stats_key(self, table_name, columns, start, end):
+        return (table_name, self._versions.get(table_name, 0), start, end, tuple(columns))
+
+    def lookup_stats(self, table_name, columns, start=None, end=None):
+        """Returns memoised stats for the exact (table, range, columns) or None."""
+        return self._stats_cache.get(self._stats_key(table_name, columns, start, end))
+
+    @traced("db.column_stats")
+    def column_stats(self, table_name, columns, start=None, end=None):
+        """
+        Min/max/mean/std/percentiles per column, plus air consumption [Nl] for
+        flow columns, computed on the channel store when it holds the rows and
+        otherwise by a single aggregate query inside DuckDB.
+        Safe to call from a worker thread: it runs on its own cursor.
+        """
+        key = self._stats_key(table_name, columns, start, end)
+        if key in self._stats_cache:
+            self._stats_cache.move_to_end(key)
+            return self._stats_cache[key]
+        # The store leaves out rows without a timestamp, as a time window does, so the
+        # whole table is read from it only when every row is stamped
+        store = self.channel_store(table_name)
+        if store is not None and store.has(columns) and (
+                start is not None or end is not None or len(store.time) == self.table_count(table_name)):
+            t, data = store.slice(columns, start, end)
+            return self._remember_stats(key, window_stats(t, data, STATS_PERCENTILES, FLOW_UNIT))
+
+        ts = self.time_expr(table_name)
+        flow_cols = [c for c in columns if FLOW_UNIT in c]
+        where, params = [], []
+        if start is not None:
+            where.append("__ts >= ?")
+            params.append(start)
+        if end is not None:
+            where.append("__ts <= ?")
+            params.append(end)
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+
+        # Seconds until the next sample, only needed to integrate flow over time. A reformatted
+        # table is stored in time order, so DuckDB streams lead() in scan order instead of sorting.
+        order = "" if self.time_ordered(table_name) else "ORDER BY __ts"
+        dt_sql = f", epoch(lead(__ts) OVER ({order})) - epoch(__ts) AS __dt" if flow_cols else ""
+        aggs = []
+        for col in columns:
+            q = quote_ident(col)
+            aggs += [f"count({q})", f"min({q})", f"max({q})", f"avg({q})", f"stddev_samp({q})",
+                     f"quantile_cont({q}, {list(STATS_PERCENTILES)})"]
+            if col in flow_cols:
+                aggs.append(f"sum({q} * __dt) / 60.0")
+        sql = f"""
+            SELECT {', '.join(aggs)}
+            FROM (SELECT *{dt_sql} FROM (SELECT *, {ts} AS __ts FROM {self._ref(table_name)}) {where_sql})
+        """
+        with self.reader() as cur:
+            row = cur.execute(sql, params).fetchone()
+
+        stats, i = {}, 0
+        for col in columns:
+            count, vmin, vmax, mean, std, pct = row[i:i + 6]
+            i += 6
+            stats[col] = {"count": count, "min": vmin, "max": vmax, "mean": mean, "std": std,
+                          "percentiles": dict(zip(STATS_PERCENTILES, pct or [None] * len(STATS_PERCENTILES)))}
+            if col in flow_cols:
+                stats[col]["consumption"] = row[i]
+                i += 1
+        return self._remember_stats(key, stats)
+
+    def _remember_stats(self, key, stats):
+        self._stats_cache[key] = stats
+        while len(self._stats_cache) > STATS_CACHE_SIZE:
+            self._stats_cache.popitem(last=False)
+        return stats
+
+    def export_query_to_csv(self, sql, path, delimiter=";"):
+        with self.reader() as cur:
+            cur.execute(f"COPY ({sql}) TO {quote_literal(path)} (DELIMITER '{delimiter}', HEADER TRUE);")
+
+    def _time_window(self, table_name, start=None, end=None):
+        """
+        WHERE condition (or "") and parameters restricting a table to [start, end];
+        a table without timestamps is never restricted.
+        """
+        where, params = [], []
+        if (start is not None or end is not None) and not self.datetime_column(table_name):
+            return "", params
+        if start is not None:
+            where.append(f"{self.time_expr(table_name)} >= ?")
+            params.append(start)
+        if end is not None:
+            where.append(f"{self.time_expr(table_name)} <= ?")
+            params.append(end)
+        return " AND ".join(where), params
+
+    def _export_query(self, sql, params, path, fmt, delimiter):
+        options = EXPORT_FORMATS[fmt][1]
+        with self.reader() as cur:
+            if options is not None:
+                cur.execute(f"COPY ({sql}) TO {quote_literal(path)} ({options.format(delim=delimiter)})", params)
+            else:
+                import pyarrow.ipc  # optional dependency, only needed for Arrow export
+                result = cur.execute(sql, params)
+                to_reader = getattr(result, "to_arrow_reader", None) or result.fetch_record_batch
+                batches = to_reader(EXPORT_BATCH_ROWS)
+                with pyarrow.ipc.new_file(path, batches.schema) as ipc_writer:
+                    for batch in batches:
+                        ipc_writer.write_batch(batch)
+
+    @traced("db.export_table")
+    def export_table(self, table_name, path, fmt="csv", columns=None, start=None, end=None, delimiter=";", progress_callback=None):
+        """
+        Streams a table (optionally a column subset and a time window) to CSV,
+        gzip CSV, Parquet (zstd) or Arrow IPC without pulling rows into Python.
+        """
+        cols = ", ".join(quote_ident(c) for c in columns) if columns else "*"
+        where, params = self._time_window(table_name, start, end)
+        sql = f"SELECT {cols} FROM {self._ref(table_name)}" + (f" WHERE {where}" if where else "")
+        self._export_query(sql, params, path, fmt, delimiter)
+        if progress_callback:
+            progress_callback(100)
+
+    # ------------------------------
+    # Resampling
+    # ------------------------------
+    def resample_sql(self, table_name, interval_ms, aggregates, fill="null", start=None, end=None):
+        """SELECT (and its parameters) putting a reformatted table on a fixed time grid."""
+        where, params = self._time_window(table_name, start, end)
+        sql = build_resample_sql(self._ref(table_name), self.time_expr(table_name), interval_ms, aggregates, fill,
+                                 DATETIME_COL, where)
+        return sql, params
+
+    @traced("db.resample_to_table")
+    def resample_to_table(self, table_name, new_table, interval_ms, aggregates, fill="null", start=None, end=None):
+        """Materialises a resampled copy as `new_table`, replacing any table of that name."""
+        if new_table == table_name:
+            raise ValueError("Choose a table name different from the source table")
+        sql, params = self.resample_sql(table_name, interval_ms, aggregates, fill, start, end)
+        with self.writer() as cur, self._transaction(cur):
+            self._snapshot(cur, new_table, "resample", move=True)
+            cur.execute(f"CREATE OR REPLACE TABLE {new_table} AS {sql}", params)
+            cur.execute("DELETE FROM _ams_derived WHERE table_name = ?", [new_table])
+        if new_table.startswith(INTERNAL_PREFIX):
+            self._bump(new_table)
+        else:
+            self._bump(new_table, source=f"resample of {table_name}")
+            self.refresh_catalog(new_table)
+        return new_table
+
+    @traced("db.export_resampled")
+    def export_resampled(self, table_name, path, fmt, interval_ms, aggregates, fill="null", start=None, end=None,
+                         delimiter=";", progress_callback=None):
+        """Streams the resampled grid straight to a file, without storing it first."""
+        sql, params = self.resample_sql(table_name, interval_ms, aggregates, fill, start, end)
+        self._export_query(sql, params, path, fmt, delimiter)
+        if progress_callback:
+            progress_callback(100)
+
+    # ------------------------------
+    # Run comparison
+    # ------------------------------
+    def trigger_time(self, table_name, column, op, threshold):
+        """First timestamp at which `column op threshold` holds, or None."""
+        if op not in (">", "<", ">=", "<="):
+            raise ValueError(f"Unsupported comparison: {op}")
+        ts = self.time_expr(table_name)
+        with self.reader() as cur:
+            return cur.execute(f"SELECT min({ts}) FROM {self._ref(table_name)} WHERE {quote_ident(column)} {op} ?",
+                               [threshold]).fetchone()[0]
+
+    @traced("db.fetch_aligned")
+    def fetch_aligned(self, table_name, column, origin, start_s, end_s, points):
+        """
+        One decimated pass over a run for overlays: the mean of `column` in each of
+        `points` equal buckets between `start_s` and `end_s` seconds after `origin`,
+        as a float64 array with NaN where the run has no samples. Only the timestamp
+        and the one channel are read, and only inside the window.
+        """
+        ts = self.time_expr(table_name)
+        width = (end_s - start_s) / points
+        sql = f"""
+            SELECT CAST(floor((epoch({ts} - ?) - ?) / ?) AS BIGINT) AS __b, avg({quote_ident(column)}) AS __v
+            FROM {self._ref(table_name)}
+            WHERE {ts} >= ? AND {ts} < ?
+            GROUP BY 1
+        """
+        params = [origin, start_s, width, origin + timedelta(seconds=start_s), origin + timedelta(seconds=end_s)]
+        with self.reader() as cur:
+            arrays = cur.execute(sql, params).fetchnumpy()
+        values = np.full(points, np.nan)
+        buckets = np.asarray(arrays["__b"])
+        keep = (buckets >= 0) & (buckets < points)
+        values[buckets[keep]] = np.ma.filled(arrays["__v"], np.nan)[keep]
+        return values
+
+    def time_span(self, table_name):
+        """(first, last) timestamp of a reformatted table, or None for a table without one."""
+        if not self.datetime_column(table_name):
+            return None
+        ts = self.time_expr(table_name)
+        with self.reader() as cur:
+            return cur.execute(f"SELECT min({ts}), max({ts}) FROM {self._ref(table_name)}").fetchone()
+
+    @traced("db.find_events")
+    def find_events(self, table_name, column, op, threshold, min_duration=0.0, limit=10000):
+        """
+        Finds every interval where `column op threshold` holds for at least
+        `min_duration` seconds, as a gaps-and-islands query over the whole table.
+        """
+        if op not in (">", "<", ">=", "<="):
+            raise ValueError(f"Unsupported comparison: {op}")
+        q = quote_ident(column)
+        peak = "max" if op.startswith(">") else "min"
+        sql = f"""
+            WITH s AS (
+                SELECT rowid AS __rid, {self.time_expr(table_name)} AS __ts, {q} AS __v,
+                       coalesce({q} {op} ?, false) AS __hit
+                FROM {self._ref(table_name)}
+            ), islands AS (
+                SELECT *, row_number() OVER (ORDER BY __ts, __rid)
+                        - row_number() OVER (PARTITION BY __hit ORDER BY __ts, __rid) AS __grp
+                FROM s WHERE __ts IS NOT NULL
+            )
+            SELECT min(__ts) AS start, max(__ts) AS "end",
+                   epoch(max(__ts)) - epoch(min(__ts)) AS duration,
+                   {peak}(__v) AS peak, arg_min(__rid, __ts) AS first_row
+            FROM islands WHERE __hit
+            GROUP BY __grp
+            HAVING epoch(max(__ts)) - epoch(min(__ts)) >= ?
+            ORDER BY start
+            LIMIT {int(limit)}
+        """
+        with self.reader() as cur:
+            rows = cur.execute(sql, [threshold, min_duration]).fetchall()
+        return [dict(zip(("start", "end", "duration", "peak", "first_row"), r)) for r in rows]
+
+    # ------------------------------
+    # Derived channels
+    # ------------------------------
+    def derived_channels(self, table_name):
+        with self.reader() as cur:
+            rows = cur.execute(
+                "SELECT name, kind, source, source2, p1, p2 FROM _ams_derived WHERE table_name = ? ORDER BY name",
+                [table_name]).fetchall()
+        return [dict(zip(("name", "kind", "source", "source2", "p1", "p2"), r)) for r in rows]
+
+    @traced("db.materialise_channel")
+    def materialise_channel(self, table_name, spec):
+        """
+        Stores a derived channel as a real DOUBLE column. Only this column is
+        (re)computed; returns False when it is already up to date.
+        """
+        existing = {c for c, _ in self.columns(table_name)}
+        previous = next((d for d in self.derived_channels(table_name) if d["name"] == spec["name"]), None)
+        if previous is None and spec["name"] in existing:
+            raise ValueError(f"Column '{spec['name']}' already exists in {table_name}")
+        if previous == spec and spec["name"] in existing:
+            return False
+        if spec["kind"] in NUMPY_KINDS and not 1 <= int(spec["p1"]) <= MAX_HALF_WINDOW:
+            raise ValueError(f"The half window must be between 1 and {MAX_HALF_WINDOW} samples")
+
+        with self.writer() as cur:
+            self._own(cur, table_name)
+            cur.execute(f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS {quote_ident(spec['name'])} DOUBLE")
+            if spec["kind"] in NUMPY_KINDS:
+                self._materialise_hampel(cur, table_name, spec)
+            else:
+                cur.execute(build_update_sql(table_name, spec, self.time_expr(table_name)))
+            cur.execute("INSERT OR REPLACE INTO _ams_derived VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [table_name, spec["name"], spec["kind"], spec["source"], spec["source2"], spec["p1"], spec["p2"]])
+        self._bump(table_name)
+        return True
+
+    def drop_channel(self, table_name, name):
+        with self.writer() as cur:
+            self._own(cur, table_name)
+            cur.execute(f"ALTER TABLE {table_name} DROP COLUMN IF EXISTS {quote_ident(name)}")
+            cur.execute("DELETE FROM _ams_derived WHERE table_name = ? AND name = ?", [table_name, name])
+        self._bump(table_name)
+
+    def reapply_derived(self, table_name):
+        """Re-materialises channels lost when the table was re-imported."""
+        existing = {c for c, _ in self.columns(table_name)}
+        for spec in self.derived_channels(table_name):
+            if spec["name"] in existing:
+                continue
+            if spec["source"] not in existing or (spec["source2"] and spec["source2"] not in existing):
+                continue  # the new import no longer has the source channel
+            self.materialise_channel(table_name, spec)
+
+    @traced("db.reformat_datetime_full_table")
+    def reformat_datetime_full_table(self, table_name, snapshot=True):
+        """
+        Rewrites an imported table once into its stored form: the raw D#date / TOD#time
+        pair, or the text column of a re-imported export, becomes one TIMESTAMP column
+        and the rows are sorted by it. Sorted storage gives each row group a narrow
+        min/max zone map, which time-window reads use to skip the others.
+        Pass snapshot=False when the reformat completes an import: the import snapshot
+        already holds the previous contents, and the raw table is not worth keeping.
+        """
+        columns = self.columns(table_name)
+        if len(columns) < 2:
+            return  # Skip if invalid
+        (first, first_type), (second, _) = columns[:2]
+        if first == DATETIME_COL:
+            ts = quote_ident(first) if first_type.startswith("TIMESTAMP") else \
+                f"try_strptime({quote_ident(first)}, '{DATETIME_FORMAT}')"
+            time_cols = [first]
+        else:
+            ts = RAW_TIMESTAMP_SQL.format(date=quote_ident(first), time=quote_ident(second))
+            time_cols = [first, second]
+        rest = f"* EXCLUDE ({', '.join(quote_ident(c) for c in time_cols)})"
+        channels = [name for name, _type in columns if name not in time_cols]
+        with self.writer() as cur:
+            # The file-order half of the quality summary rides on the scan that checks the timestamps parse
+            nominal = cur.execute(build_interval_sql(self._ref(table_name), ts)).fetchone()[0]
+            row = cur.execute(build_quality_sql(self._ref(table_name), ts, channels)).fetchone()
+            if row[1] == 0:
+                # nothing parses as a timestamp: keep the table as imported
+                self._store_quality(cur, table_name, parse_quality_row(row, None, channels, nominal))
+                return
+            with self._transaction(cur):
+                source = (snapshot and self._snapshot(cur, table_name, "reformat", move=True)) or self._ref(table_name)
+                cur.execute(f"""
+                    CREATE OR REPLACE TABLE {table_name} AS
+                    SELECT {ts} AS {quote_ident(DATETIME_COL)}, {rest} FROM {source}
+                    ORDER BY 1
+                """)
+                # ... and the time-order half on the sorted result, which needs no sort of its own
+                gap_row = cur.execute(build_gap_sql(table_name, quote_ident(DATETIME_COL)),
+                                      [GAP_FACTOR * nominal if nominal else None]).fetchone()
+                self._store_quality(cur, table_name, parse_quality_row(row, gap_row, channels, nominal))
+        self._bump(table_name)
 
 # =======================================================
 # Paging Table Model
@@ -113,25 +1627,32 @@ class PagingTableModel(QAbstractTableModel):
         self.page = 0
         self.page_size = CHUNK_SIZE
         self.total_rows = self.db.table_count(table_name)
-        self._df = pd.DataFrame()
+        # One page held column-wise as NumPy arrays, as DuckDB returns it
+        self._columns = []
+        self._arrays = []
         self.undo_stack = []
         self.redo_stack = []
         self.load_page(0)
 
     def load_page(self, page_index):
         offset = page_index * self.page_size
-        self._df = self.db.get_page(self.table_name, offset, self.page_size)
+        self._columns, self._arrays = self.db.fetch_page_numpy(self.table_name, offset, self.page_size)
         self.page = page_index
         self.layoutChanged.emit()
 
-    def rowCount(self, parent=QModelIndex()): return len(self._df)
-    def columnCount(self, parent=QModelIndex()): return len(self._df.columns)
+    def rowCount(self, parent=QModelIndex()): return len(self._arrays[0]) if self._arrays else 0
+    def columnCount(self, parent=QModelIndex()): return len(self._columns)
 
     def data(self, index, role=Qt.DisplayRole):
         if not index.isValid(): return None
         if role in (Qt.DisplayRole, Qt.EditRole):
             try:
-                return str(self._df.iat[index.row(), index.column()])
+                value = self._arrays[index.column()][index.row()]
+                if value is np.ma.masked:
+                    return ""
+                if isinstance(value, np.datetime64):
+                    return "" if np.isnat(value) else pd.Timestamp(value).strftime(DISPLAY_DATETIME_FORMAT)[:-3]
+                return str(value)
             except:
                 return ""
         return None
@@ -139,7 +1660,14 @@ class PagingTableModel(QAbstractTableModel):
     def setData(self, index, value, role=Qt.EditRole):
         if index.isValid() and role == Qt.EditRole:
             self.push_undo()
-            self._df.iat[index.row(), index.column()] = value
+            column = self._arrays[index.column()]
+            try:
+                column[index.row()] = value
+            except (ValueError, TypeError):
+                # Text typed into a numeric column: fall back to an object column for this page
+                column = column.astype(object)
+                column[index.row()] = value
+                self._arrays[index.column()] = column
             self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
             return True
         return False
@@ -150,47 +1678,70 @@ class PagingTableModel(QAbstractTableModel):
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if role != Qt.DisplayRole:
             return None
-        return str(self._df.columns[section]) if orientation == Qt.Horizontal else str(section + 1 + self.page * self.page_size)
+        return str(self._columns[section]) if orientation == Qt.Horizontal else str(section + 1 + self.page * self.page_size)
+
+    def _snapshot(self):
+        return [a.copy() for a in self._arrays]
 
     def push_undo(self):
-        self.undo_stack.append(self._df.copy())
+        self.undo_stack.append(self._snapshot())
         if len(self.undo_stack) > UNDO_LIMIT:
             self.undo_stack.pop(0)
         self.redo_stack.clear()
 
     def undo(self):
         if self.undo_stack:
-            self.redo_stack.append(self._df.copy())
-            self._df = self.undo_stack.pop()
+            self.redo_stack.append(self._snapshot())
+            self._arrays = self.undo_stack.pop()
             self.layoutChanged.emit()
 
     def redo(self):
         if self.redo_stack:
-            self.undo_stack.append(self._df.copy())
-            self._df = self.redo_stack.pop()
+            self.undo_stack.append(self._snapshot())
+            self._arrays = self.redo_stack.pop()
             self.layoutChanged.emit()
 
 # =======================================================
 # Main Window
 # =======================================================
 class MainWindow(QMainWindow):
-    def __init__(self, loc, parent=None):
+    def __init__(self, loc, parent=None, db=None):
         super().__init__(parent)
         self.loc = loc 
         
         # FIX: Define the safe database path
         self.app_data_folder = get_app_data_path()
-        db_path = os.path.join(self.app_data_folder, 'local.duckdb')
-        
-        self.db = DuckDBManager(path=db_path) # Pass the safe path
+
+        # Each window works in its own session database; main.py opens it before the dispatcher
+        self.db = db if db is not None else open_session()
         self.current_table = None
         self.delimiter = ";"
         self.ignore_errors = True
         self.active_threads = []
         self.paging_model = None
+        self.plot_dialog = None
+        self.import_source = None   # (path, byte size when the import started) for live follow
+        self.follower = None
+        self.follow_worker = None
+        self.follow_timer = QTimer(self)
+        self.follow_timer.setInterval(FOLLOW_INTERVAL_MS)
+        self.follow_timer.timeout.connect(self._poll_follow)
 
         self.init_ui()
 
+        self.memory_timer = QTimer(self)
+        self.memory_timer.setInterval(MEMORY_POLL_MS)
+        self.memory_timer.timeout.connect(self._update_memory_label)
+        self.memory_timer.start()
+        self._update_memory_label()
+
+        self.session_worker = None  # publishes the session to the shared cache while the window closes
+        self.maintenance_worker = None
+        self.maintenance_timer = QTimer(self)
+        self.maintenance_timer.setInterval(MAINTENANCE_INTERVAL_MS)
+        self.maintenance_timer.timeout.connect(self._run_maintenance)
+        self.maintenance_timer.start()
+
     def init_ui(self):
         self.setWindowTitle(L("app.title", "AMS Data Tool"))
         self.resize(1200, 800)
@@ -209,6 +1760,10 @@ class MainWindow(QMainWindow):
         self.import_btn.clicked.connect(self.on_import)
         toolbar.addWidget(self.import_btn)
 
+        self.import_folder_btn = QPushButton(L("core.btn.import_folder", "Import Folder"))
+        self.import_folder_btn.clicked.connect(self.on_import_folder)
+        toolbar.addWidget(self.import_folder_btn)
+
         self.clear_btn = QPushButton(L("core.btn.clear_table", "Clear Table"))
         self.clear_btn.clicked.connect(self.on_clear)
         toolbar.addWidget(self.clear_btn)
@@ -217,6 +1772,20 @@ class MainWindow(QMainWindow):
         self.export_csv_btn.clicked.connect(self.on_export_csv)
         toolbar.addWidget(self.export_csv_btn)
 
+        self.follow_btn = QPushButton(L("core.btn.follow_log", "Follow Log"))
+        self.follow_btn.setCheckable(True)
+        self.follow_btn.setEnabled(False)
+        self.follow_btn.toggled.connect(self.on_follow_toggled)
+        toolbar.addWidget(self.follow_btn)
+
+        toolbar.addWidget(QLabel(L("core.label.resources", "Resources")))
+        self.profile_combo = QComboBox()
+        for name in RESOURCE_PROFILES:
+            self.profile_combo.addItem(L(f"core.profile.{name}", name), name)
+        self.profile_combo.setCurrentIndex(self.profile_combo.findData(self.db.profile))
+        self.profile_combo.currentIndexChanged.connect(self.on_profile_changed)
+        toolbar.addWidget(self.profile_combo)
+
         layout.addLayout(toolbar)
 
         # Table view
@@ -240,13 +1809,42 @@ class MainWindow(QMainWindow):
         self.plot_btn = QPushButton(L("core.btn.plot", "Plot Data"))
         self.plot_btn.clicked.connect(self.on_plot)
         export.addWidget(self.plot_btn)
+        self.stats_btn = QPushButton(L("core.btn.statistics", "Statistics"))
+        self.stats_btn.clicked.connect(self.on_stats)
+        export.addWidget(self.stats_btn)
+        self.derived_btn = QPushButton(L("core.btn.derived_channels", "Derived Channels"))
+        self.derived_btn.clicked.connect(self.on_derived_channels)
+        export.addWidget(self.derived_btn)
+        self.events_btn = QPushButton(L("core.btn.find_events", "Find Events"))
+        self.events_btn.clicked.connect(self.on_find_events)
+        export.addWidget(self.events_btn)
+        self.resample_btn = QPushButton(L("core.btn.resample", "Resample"))
+        self.resample_btn.clicked.connect(self.on_resample)
+        export.addWidget(self.resample_btn)
+        self.overlay_btn = QPushButton(L("core.btn.compare_runs", "Compare Runs"))
+        self.overlay_btn.clicked.connect(self.on_compare_runs)
+        export.addWidget(self.overlay_btn)
+        self.quality_btn = QPushButton(L("core.btn.data_quality", "Data Quality"))
+        self.quality_btn.clicked.connect(self.on_data_quality)
+        export.addWidget(self.quality_btn)
+        self.history_btn = QPushButton(L("core.btn.history", "History"))
+        self.history_btn.clicked.connect(self.on_history)
+        export.addWidget(self.history_btn)
+        self.perf_btn = QPushButton(L("core.btn.performance", "Performance"))
+        self.perf_btn.clicked.connect(self.on_performance)
+        export.addWidget(self.perf_btn)
         layout.addLayout(export)
 
         # Status bar
         self.progress = QProgressBar()
         layout.addWidget(self.progress)
+        status_row = QHBoxLayout()
         self.status = QLabel(L("general.ready", "Ready"))
-        layout.addWidget(self.status)
+        status_row.addWidget(self.status, 1)
+        self.memory_label = QLabel("")
+        self.memory_label.setStyleSheet("color: gray;")
+        status_row.addWidget(self.memory_label)
+        layout.addLayout(status_row)
 
         # Undo/Redo shortcuts
         QShortcut(QKeySequence("Ctrl+Z"), self).activated.connect(self.on_undo)
@@ -282,25 +1880,98 @@ class MainWindow(QMainWindow):
                 self.table_name_input.setText(table)
                 
             self.current_table = table
-            self.set_busy(True)
-            
-            # Trigger the DuckDB worker thread exactly like a manual import
-            worker = WorkerThread(self.db.import_csv, path, self.current_table, self.delimiter, True, self.ignore_errors)
-            self.active_threads.append(worker)
-            worker.finished.connect(lambda _: self._on_import_finished(worker))
-            worker.error.connect(lambda msg: self._on_worker_error(msg, worker))
-            worker.start()
+            self._start_import(self.db.import_csv, path)
+
+    def open_table(self, table_name):
+        """Reopens a table already stored in the session database, skipping import and reformatting."""
+        self.current_table = table_name
+        self.table_name_input.setText(table_name)
+        entry = self.db.catalog_entry(table_name)
+        source = entry["source"] if entry else None
+        if source and os.path.isfile(source):
+            # Live follow picks up rows written from now on
+            self.import_source = (source, os.path.getsize(source))
+        self.on_load_full()
+        self.set_busy(False)
+        self.status.setText(L("core.msg.session_restored", "Session restored: {table}").format(table=table_name))
+        self._build_channel_store()
+
+    def open_cached(self, table_name):
+        """Opens a table of the shared cache (a recent session) once it is borrowed."""
+        self._borrow_cached([table_name], lambda: self.open_table(table_name))
+
+    def _borrow_cached(self, tables, then):
+        """
+        Borrows tables of the shared cache in a worker thread, which may wait while
+        another instance publishes to it; the GUI thread never does. Calls `then` after.
+        `tables` None borrows every run of the cache this session does not hold.
+        """
+        def job():
+            for table in self._cached_runs() if tables is None else tables:
+                self.db.restore_cached(cache_path(), table)  # waits for the cache off the GUI thread
+            return True
+
+        worker = WorkerThread(job)
+        self.set_busy(True)
+        self.status.setText(L("core.msg.opening_cached", "Opening from the shared cache..."))
+        self.active_threads.append(worker)
+        worker.finished.connect(lambda _: self._on_borrowed(worker, then))
+        worker.error.connect(lambda msg: self._on_borrow_error(msg, worker))
+        worker.start()
+
+    def _cached_runs(self):
+        """Runs (tables with a time axis) of the shared cache not in this session."""
+        local = {e["table_name"] for e in self.db.catalog()}
+        return [e["table_name"] for e in self.db.cached_catalog() if e["first_ts"] and e["table_name"] not in local]
+
+    @Slot()
+    def _on_borrowed(self, worker, then):
+        if worker in self.active_threads: self.active_threads.remove(worker)
+        self.set_busy(False)
+        then()
+
+    @Slot(str)
+    def _on_borrow_error(self, msg, worker):
+        if "lock" in msg.lower():
+            if worker in self.active_threads: self.active_threads.remove(worker)
+            self.set_busy(False)
+            QMessageBox.warning(self, "Warning", L("core.msg.cache_busy",
+                                "The shared cache is busy: another instance is saving its session. Try again in a moment."))
+            return
+        self._on_worker_error(msg, worker)
 
     def on_import(self):
-        path, _ = QFileDialog.getOpenFileName(self, L("core.btn.import", "Open CSV"), "", "CSV Files (*.csv)")
-        if not path: return
+        paths, _ = QFileDialog.getOpenFileNames(self, L("core.btn.import", "Open CSV"), "", IMPORT_FILTER)
+        if not paths: return
+        if not self._take_table_name(): return
+        if len(paths) == 1:
+            self._start_import(self.db.import_file, paths[0])
+        else:
+            self._start_import(self.db.import_csv_many, paths)
+
+    def on_import_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, L("core.btn.import_folder", "Import Folder"))
+        if not folder: return
+        if not self._take_table_name(): return
+        self._start_import(self.db.import_csv_many, os.path.join(folder, "*.csv"))
+
+    def _take_table_name(self):
         table = self.table_name_input.text().strip()
         if not table:
             QMessageBox.warning(self, L("core.error.no_table", "Warning"), L("core.error.no_table", "Please provide a table name"))
-            return
+            return False
         self.current_table = table
+        return True
+
+    def _start_import(self, import_fn, source):
+        # Trigger the DuckDB worker thread; reformatting follows in _on_import_finished
+        self.follow_btn.setChecked(False)
+        if isinstance(source, str) and os.path.isfile(source):
+            self.import_source = (source, os.path.getsize(source))
+        else:
+            self.import_source = None
         self.set_busy(True)
-        worker = WorkerThread(self.db.import_csv, path, self.current_table, self.delimiter, True, self.ignore_errors)
+        worker = WorkerThread(import_fn, source, self.current_table, self.delimiter, True, self.ignore_errors)
         self.active_threads.append(worker)
         worker.finished.connect(lambda _: self._on_import_finished(worker))
         worker.error.connect(lambda msg: self._on_worker_error(msg, worker))
@@ -318,7 +1989,9 @@ class MainWindow(QMainWindow):
         self.status.setText(L("core.msg.reformatting", "Formatting Date & Time..."))
         
         def job():
-            self.db.reformat_datetime_full_table(self.current_table)
+            self.db.reformat_datetime_full_table(self.current_table, snapshot=False)
+            self.db.reapply_derived(self.current_table)
+            self.db.refresh_catalog(self.current_table)
             return True
             
         reformat_worker = WorkerThread(job)
@@ -333,16 +2006,93 @@ class MainWindow(QMainWindow):
         self.on_load_full() # Load the grid only after formatting is fully done
         self.set_busy(False)
         self.status.setText(L("core.msg.import_success", "Data imported and formatted successfully"))
+        report = self.db.quality_report(self.current_table)
+        if report:
+            self.status.setText(summarise_quality(report))
+            if has_issues(report):
+                self.on_data_quality()
+        self._build_channel_store()
+
+    def _build_channel_store(self):
+        """Writes the channel store of the current table in the background, so plots map it instead of querying."""
+        if not self.current_table:
+            return
+        worker = WorkerThread(self.db.build_channel_store, self.current_table)
+        self.active_threads.append(worker)
+        worker.finished.connect(lambda _: self._on_channel_store_done(worker))
+        worker.error.connect(lambda msg: self._on_channel_store_done(worker, msg))
+        worker.start()
+
+    def _on_channel_store_done(self, worker, error=None):
+        if worker in self.active_threads:
+            self.active_threads.remove(worker)
+        if error:
+            print(f"[ChannelStore] failed: {error}")  # plots fall back to querying DuckDB
+
+    # ------------------------------
+    # Live follow
+    # ------------------------------
+    def on_follow_toggled(self, checked):
+        if not checked:
+            self.follow_timer.stop()
+            self.follower = None
+            return
+        if not (self.current_table and self.import_source):
+            self.follow_btn.setChecked(False)
+            return
+        path, offset = self.import_source
+        self.follower = LogFollower(self.db, path, self.current_table, self.delimiter, offset)
+        self.follow_timer.start()
+        self.status.setText(L("core.msg.following", "Following {path}").format(path=os.path.basename(path)))
+
+    def _poll_follow(self):
+        if self.follow_worker is not None or self.follower is None:
+            return  # previous poll still running
+        worker = WorkerThread(self.follower.poll)
+        self.follow_worker = worker
+        self.active_threads.append(worker)
+        worker.finished.connect(lambda added: self._on_follow_rows(worker, added))
+        worker.error.connect(lambda msg: self._on_follow_error(worker, msg))
+        worker.start()
+
+    @Slot()
+    def _on_follow_rows(self, worker, added):
+        if worker in self.active_threads: self.active_threads.remove(worker)
+        self.follow_worker = None
+        if not added or not self.paging_model:
+            return
+        model = self.paging_model
+        last_page = max(0, (model.total_rows - 1) // model.page_size)
+        model.total_rows += added
+        if model.page == last_page:
+            model.load_page(model.page)  # the visible tail page grew
+        self.update_page_label()
+        if self.plot_dialog is not None:
+            self.plot_dialog.extend_rows()
+        self.status.setText(L("core.msg.follow_rows", "+{n} rows ({total} total)").format(n=added, total=model.total_rows))
+
+    def _on_follow_error(self, worker, msg):
+        self.follow_worker = None
+        self.follow_btn.setChecked(False)
+        self._on_worker_error(msg, worker)
 
     def on_export_csv(self):
         if not self.current_table:
             QMessageBox.warning(self, "Warning", L("core.msg.no_data_loaded", "No table loaded"))
             return
-        path, _ = QFileDialog.getSaveFileName(self, L("core.btn.export", "Export CSV"), "", "CSV Files (*.csv)")
+        dlg = ExportDialog(self.db, self.current_table, self)
+        if dlg.exec() != QDialog.Accepted: return
+        options = dlg.options()
+        path, _ = QFileDialog.getSaveFileName(self, L("core.btn.export", "Export CSV"), "", EXPORT_FORMATS[options["fmt"]][0])
         if not path: return
-        sql = f"SELECT * FROM {self.current_table}"
-        self.set_busy(True)
-        worker = WorkerThread(self.db.export_query_to_csv, sql, path, self.delimiter)
+        if not path.lower().endswith("." + options["fmt"]):
+            path += "." + options["fmt"]
+        # Exports only read, so paging and plotting stay available meanwhile
+        self.export_csv_btn.setEnabled(False)
+        self.progress.setRange(0, 0)
+        self.status.setText(L("core.msg.exporting", "Exporting..."))
+        worker = WorkerThread(self.db.export_table, self.current_table, path, options["fmt"],
+                              options["columns"], options["start"], options["end"], self.delimiter)
         self.active_threads.append(worker)
         worker.finished.connect(lambda _: self._on_export_finished(worker, path))
         worker.error.connect(lambda msg: self._on_worker_error(msg, worker))
@@ -351,7 +2101,8 @@ class MainWindow(QMainWindow):
     @Slot()
     def _on_export_finished(self, worker, path):
         if worker in self.active_threads: self.active_threads.remove(worker)
-        self.set_busy(False)
+        if self.import_btn.isEnabled():  # an import started meanwhile keeps the UI busy
+            self.set_busy(False)
         QMessageBox.information(self, L("core.btn.export", "Export CSV"), f"{path} exported")
         self.status.setText(f"{path} exported")
 
@@ -359,6 +2110,18 @@ class MainWindow(QMainWindow):
     # Table navigation and actions
     # ------------------------------
     def on_clear(self):
+        if self.current_table:
+            # Dropping a table also deletes its snapshots, so it cannot be rolled back
+            kept = len(self.db.history(self.current_table))
+            answer = QMessageBox.question(
+                self, L("core.btn.clear_table", "Clear Table"),
+                L("core.msg.confirm_clear", "Delete {table} and its {snapshots} saved snapshot(s)? "
+                  "This cannot be undone.").format(table=self.current_table, snapshots=kept))
+            if answer != QMessageBox.Yes:
+                return
+        self.follow_btn.setChecked(False)
+        if self.current_table:
+            self.db.drop_table(self.current_table)
         self.current_table = None
         self.paging_model = None
         self.table_view.setModel(None)
@@ -368,6 +2131,7 @@ class MainWindow(QMainWindow):
         if not self.current_table:
             QMessageBox.warning(self, L("core.error.no_table", "Warning"), L("core.msg.no_data_loaded", "Import CSV first"))
             return
+        self.db.touch(self.current_table)
         self.paging_model = PagingTableModel(self.db, self.current_table)
         self.table_view.setModel(self.paging_model)
         self.update_page_label()
@@ -380,6 +2144,18 @@ class MainWindow(QMainWindow):
         else:
             self.page_label.setText("Page: 0")
 
+    def show_row(self, row):
+        """Pages the table view to an absolute row and selects it."""
+        if not self.paging_model:
+            return
+        page_size = self.paging_model.page_size
+        if self.paging_model.page != row // page_size:
+            self.paging_model.load_page(row // page_size)
+            self.update_page_label()
+        index = self.paging_model.index(row % page_size, 0)
+        self.table_view.selectRow(index.row())
+        self.table_view.scrollTo(index)
+
     def on_prev_page(self):
         if self.paging_model:
             new_page = max(0, self.paging_model.page - 1)
@@ -400,9 +2176,128 @@ class MainWindow(QMainWindow):
         if not self.current_table:
             QMessageBox.warning(self, "Warning", L("core.msg.no_data_loaded", "No table loaded"))
             return
-        dlg = PlotDialog(self.db, self.current_table, self, loc=self.loc)
+        with span("plot.open", table=self.current_table):
+            dlg = PlotDialog(self.db, self.current_table, self, loc=self.loc)
+        self.plot_dialog = dlg  # extended in place while following a live log
+        dlg.exec()
+        self.plot_dialog = None
+
+    def on_stats(self):
+        if not self.current_table:
+            QMessageBox.warning(self, "Warning", L("core.msg.no_data_loaded", "No table loaded"))
+            return
+        dlg = StatsDialog(self.db, self.current_table, self)
         dlg.exec()
 
+    def on_derived_channels(self):
+        if not self.current_table:
+            QMessageBox.warning(self, "Warning", L("core.msg.no_data_loaded", "No table loaded"))
+            return
+        dlg = DerivedChannelDialog(self.db, self.current_table, self)
+        dlg.channels_changed.connect(self.on_load_full)
+        dlg.exec()
+        self._build_channel_store()
+
+    def on_find_events(self):
+        if not self.current_table:
+            QMessageBox.warning(self, "Warning", L("core.msg.no_data_loaded", "No table loaded"))
+            return
+        dlg = EventSearchDialog(self.db, self.current_table, self)
+        dlg.setAttribute(Qt.WA_DeleteOnClose)
+        dlg.panel.event_selected.connect(lambda ev: self.show_row(ev["first_row"]))
+        dlg.show()  # non-modal, so the table view stays usable while browsing events
+
+    def on_resample(self):
+        if not self.current_table:
+            QMessageBox.warning(self, "Warning", L("core.msg.no_data_loaded", "No table loaded"))
+            return
+        if not self.db.datetime_column(self.current_table):
+            QMessageBox.warning(self, "Warning", L("core.msg.no_datetime", "The table has no reformatted time column"))
+            return
+        dlg = ResampleDialog(self.db, self.current_table, self)
+        if dlg.exec() != QDialog.Accepted: return
+        options = dlg.options()
+        grid = (options["interval_ms"], options["aggregates"], options["fill"])
+        if options["target"] == "export":
+            path, _ = QFileDialog.getSaveFileName(self, L("core.btn.resample", "Resample"), "", EXPORT_FORMATS[options["fmt"]][0])
+            if not path: return
+            if not path.lower().endswith("." + options["fmt"]):
+                path += "." + options["fmt"]
+            worker = WorkerThread(self.db.export_resampled, self.current_table, path, options["fmt"], *grid,
+                                  delimiter=self.delimiter)
+            worker.finished.connect(lambda _: self._on_resample_finished(worker, path, "export"))
+        else:
+            target = options["table_name"] if options["target"] == "table" else RESAMPLED_TABLE
+            worker = WorkerThread(self.db.resample_to_table, self.current_table, target, *grid)
+            worker.finished.connect(lambda table: self._on_resample_finished(worker, table, options["target"]))
+        self.set_busy(True)
+        self.status.setText(L("core.msg.resampling", "Resampling..."))
+        self.active_threads.append(worker)
+        worker.error.connect(lambda msg: self._on_worker_error(msg, worker))
+        worker.start()
+
+    @Slot()
+    def _on_resample_finished(self, worker, result, target):
+        if worker in self.active_threads: self.active_threads.remove(worker)
+        self.set_busy(False)
+        if target == "export":
+            QMessageBox.information(self, L("core.btn.resample", "Resample"), f"{result} exported")
+            self.status.setText(f"{result} exported")
+            return
+        if target == "plot":
+            dlg = PlotDialog(self.db, result, self, loc=self.loc)
+            dlg.exec()
+            return
+        # The new table becomes the current one; the source stays in the session list
+        self.follow_btn.setChecked(False)
+        self.import_source = None
+        self.open_table(result)
+
+    def on_data_quality(self):
+        if not self.current_table:
+            QMessageBox.warning(self, "Warning", L("core.msg.no_data_loaded", "No table loaded"))
+            return
+        report = self.db.quality_report(self.current_table)
+        if report is None:
+            QMessageBox.information(self, L("core.btn.data_quality", "Data Quality"),
+                                    L("core.msg.no_quality_report", "No data-quality report was stored for this table"))
+            return
+        dlg = QualityDialog(report, self.current_table, self)
+        dlg.setAttribute(Qt.WA_DeleteOnClose)
+        dlg.show()  # non-modal, so the flagged rows can be inspected in the table view
+
+    def on_history(self):
+        if not self.current_table:
+            QMessageBox.warning(self, "Warning", L("core.msg.no_data_loaded", "No table loaded"))
+            return
+        self.follow_btn.setChecked(False)  # appended rows would land in whichever state is restored
+        dlg = HistoryDialog(self.db, self.current_table, self)
+        dlg.rolled_back.connect(self._on_rolled_back)
+        dlg.exec()
+
+    def _on_rolled_back(self, table_name):
+        self.on_load_full()
+        self.status.setText(L("core.msg.rolled_back", "Rolled back: {table}").format(table=table_name))
+        self._build_channel_store()
+
+    def on_compare_runs(self):
+        # Runs of earlier sessions are borrowed from the shared cache first, so the dialog can read them
+        self._borrow_cached(None, self._open_overlay)
+
+    def _open_overlay(self):
+        runs = [e["table_name"] for e in self.db.catalog() if self.db.datetime_column(e["table_name"])]
+        if len(runs) < 2:
+            QMessageBox.warning(self, "Warning", L("core.msg.need_two_runs", "Import at least two runs to compare"))
+            return
+        dlg = OverlayDialog(self.db, runs, self)
+        dlg.setAttribute(Qt.WA_DeleteOnClose)
+        dlg.show()
+
+    def on_performance(self):
+        dlg = PerformanceDialog(self)
+        dlg.setAttribute(Qt.WA_DeleteOnClose)
+        dlg.show()  # non-modal, so the traced operations can be run while it is open
+
     # ------------------------------
     # Undo/Redo + Busy handling
     # ------------------------------
@@ -416,14 +2311,85 @@ class MainWindow(QMainWindow):
             self.paging_model.redo()
             self.table_view.resizeColumnsToContents()
 
+    def on_profile_changed(self):
+        try:
+            self.db.apply_profile(self.profile_combo.currentData())
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
+        self._update_memory_label()
+
+    def _update_memory_label(self):
+        used, spilled, limit = self.db.memory_usage()
+        text = L("core.msg.memory", "DuckDB memory: {used} of {limit}").format(used=format_bytes(used), limit=limit)
+        if spilled:
+            text += L("core.msg.spilled", ", {spilled} spilled to disk").format(spilled=format_bytes(spilled))
+        self.memory_label.setText(text)
+
+    def _run_maintenance(self):
+        """Checkpoints and evicts old tables, but only while nothing else is running."""
+        if self.maintenance_worker is not None and self.maintenance_worker.isRunning():
+            return
+        if self.active_threads or self.follow_worker or not self.import_btn.isEnabled():
+            return
+        self.maintenance_worker = WorkerThread(self.db.maintain, keep=(self.current_table,),
+                                               evict=not is_session_file(self.db.path))
+        self.maintenance_worker.finished.connect(self._on_maintenance_done)
+        self.maintenance_worker.error.connect(self._on_maintenance_error)
+        self.maintenance_worker.start()
+
+    def _on_maintenance_done(self, report):
+        if report["evicted"] or report["reclaimed"]:
+            self.status.setText(L("core.msg.maintenance", "Storage maintenance: {evicted} tables evicted, {reclaimed} reclaimed")
+                                .format(evicted=len(report["evicted"]), reclaimed=format_bytes(report["reclaimed"])))
+
+    def _on_maintenance_error(self, msg):
+        print(f"[Maintenance] failed: {msg}")
+
+    def closeEvent(self, event):
+        if self.session_worker is not None:
+            if self.session_worker in self.active_threads:
+                event.ignore()  # still publishing; the window closes itself when done
+            else:
+                super().closeEvent(event)
+            return
+        self.maintenance_timer.stop()
+        self.memory_timer.stop()
+        self.follow_btn.setChecked(False)
+        for worker in [self.maintenance_worker, self.follow_worker] + self.active_threads:
+            if worker is not None:
+                worker.wait()
+        if not needs_publish(self.db):
+            close_session(self.db)
+            super().closeEvent(event)
+            return
+        # Publishing copies the tables written here into the shared cache: off the GUI thread, with progress
+        event.ignore()
+        self.set_busy(True)
+        self.progress.setRange(0, 100)
+        self.status.setText(L("core.msg.saving_session", "Saving session..."))
+        self.session_worker = WorkerThread(close_session, self.db, progress_callback=None)
+        self.active_threads.append(self.session_worker)
+        self.session_worker.progress.connect(self.progress.setValue)
+        self.session_worker.finished.connect(lambda _: self._on_session_published())
+        self.session_worker.error.connect(lambda msg: self._on_session_published(msg))
+        self.session_worker.start()
+
+    def _on_session_published(self, error=None):
+        if error:
+            print(f"[Sessions] could not save the session: {error}")
+        self.session_worker.wait()
+        self.active_threads.remove(self.session_worker)
+        self.close()
+
     def set_busy(self, busy):
         """Enable/disable UI controls while long task runs."""
         for btn in [
-            self.import_btn, self.clear_btn,
-            self.plot_btn, self.export_csv_btn,
-            self.prev_btn, self.next_btn
+            self.import_btn, self.import_folder_btn, self.clear_btn,
+            self.plot_btn, self.stats_btn, self.derived_btn, self.events_btn, self.resample_btn,
+            self.overlay_btn, self.quality_btn, self.history_btn, self.export_csv_btn, self.prev_btn, self.next_btn
         ]:
             btn.setEnabled(not busy)
+        self.follow_btn.setEnabled(not busy and self.import_source is not None)
         self.progress.setRange(0, 0 if busy else 100)
         self.status.setText(L("general.ready", "Working..." if busy else "Ready"))
 
@@ -0,0 +1,238 @@
+# modules/derived_channels.py
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QLineEdit, QComboBox,
+    QDoubleSpinBox, QPushButton, QListWidget, QMessageBox
+)
+from PySide6.QtCore import Signal
+from .utils import quote_ident
+from .workers import WorkerThread
+from .i18n import L
+
+# kind -> (label, param1 key, param1 default, param2 key, param2 default)
+DERIVED_KINDS = {
+    "integral":           ("Integral over time",     "time_base", 60.0, None, 0.0),
+    "difference":         ("Difference (n samples)", "lag", 1.0, None, 0.0),
+    "channel_difference": ("Difference to channel",  None, 0.0, None, 0.0),
+    "rolling_mean":       ("Rolling mean",           "window", 10.0, None, 0.0),
+    "rolling_std":        ("Rolling std",            "window", 10.0, None, 0.0),
+    "rolling_min":        ("Rolling min",            "window", 10.0, None, 0.0),
+    "rolling_max":        ("Rolling max",            "window", 10.0, None, 0.0),
+    "scale":              ("Unit conversion (a·x + b)", "a", 1.0, "b", 0.0),
+    "threshold":          ("Above threshold (0/1)",  "threshold", 0.0, None, 0.0),
+    "hampel":             ("Spike removal (Hampel)", "half_window", 10.0, "sigma", 3.5),
+}
+# param key -> fallback label, localised as derived.param.<key>
+PARAM_LABELS = {
+    "time_base": "Time base [s]",
+    "lag": "Lag [samples]",
+    "window": "Window [samples]",
+    "a": "a",
+    "b": "b",
+    "threshold": "Threshold",
+    "half_window": "Half window [samples]",
+    "sigma": "Threshold [σ]",
+}
+ROW_KINDS = ("channel_difference", "scale", "threshold")  # no window, plain UPDATE
+NUMPY_KINDS = ("hampel",)  # computed in NumPy by DuckDBManager, not by an UPDATE statement
+
+def build_update_sql(table_name, spec, ts_expr):
+    """
+    Returns the UPDATE statement materialising one derived channel.
+    Row-wise kinds update in place; window kinds join a windowed subquery on rowid.
+    """
+    target = quote_ident(spec["name"])
+    src = quote_ident(spec["source"])
+    kind, p1, p2 = spec["kind"], spec["p1"], spec["p2"]
+    if kind in NUMPY_KINDS:
+        raise ValueError(f"{kind} channels are not built from SQL")
+
+    if kind in ROW_KINDS:
+        if kind == "channel_difference":
+            expr = f"{src} - {quote_ident(spec['source2'])}"
+        elif kind == "scale":
+            expr = f"{src} * {p1} + {p2}"
+        else:
+            expr = f"CASE WHEN {src} > {p1} THEN 1.0 WHEN {src} IS NOT NULL THEN 0.0 END"
+        return f"UPDATE {table_name} SET {target} = {expr}"
+
+    order = "ORDER BY __ts, __rid"
+    inner = f"SELECT rowid AS __rid, {src} AS __s, {ts_expr} AS __ts FROM {table_name}"
+    n = max(1, int(p1))
+    if kind == "integral":
+        # Trapezoidal area of each sample interval, then a running sum
+        inner = f"""
+            SELECT *, (__s + lag(__s) OVER ({order})) / 2
+                      * (epoch(__ts) - epoch(lag(__ts) OVER ({order}))) AS __area
+            FROM ({inner})
+        """
+        expr = f"coalesce(sum(__area) OVER ({order} ROWS UNBOUNDED PRECEDING), 0) / {p1 or 1.0}"
+    elif kind == "difference":
+        expr = f"__s - lag(__s, {n}) OVER ({order})"
+    else:
+        agg = {"rolling_mean": "avg", "rolling_std": "stddev_samp",
+               "rolling_min": "min", "rolling_max": "max"}[kind]
+        expr = f"{agg}(__s) OVER ({order} ROWS BETWEEN {n - 1} PRECEDING AND CURRENT ROW)"
+
+    return f"""
+        UPDATE {table_name} SET {target} = d.__v
+        FROM (SELECT __rid, {expr} AS __v FROM ({inner})) d
+        WHERE {table_name}.rowid = d.__rid
+    """
+
+# =======================================================
+# Derived Channel Editor
+# =======================================================
+class DerivedChannelDialog(QDialog):
+    channels_changed = Signal()
+
+    def __init__(self, db_manager, table_name, parent=None):
+        super().__init__(parent)
+        self.db = db_manager
+        self.table_name = table_name
+        self.worker = None
+        self.setWindowTitle(L("derived.title", "Derived Channels"))
+        self.resize(560, 420)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(L("derived.label.defined", "Defined channels:")))
+        self.channel_list = QListWidget()
+        self.channel_list.currentTextChanged.connect(self.on_select)
+        layout.addWidget(self.channel_list)
+
+        form = QGridLayout()
+        form.addWidget(QLabel(L("derived.label.name", "Name:")), 0, 0)
+        self.name_input = QLineEdit()
+        form.addWidget(self.name_input, 0, 1)
+
+        form.addWidget(QLabel(L("derived.label.kind", "Operation:")), 1, 0)
+        self.kind_combo = QComboBox()
+        for kind, (label, *_rest) in DERIVED_KINDS.items():
+            self.kind_combo.addItem(L(f"derived.kind.{kind}", label), kind)
+        self.kind_combo.currentIndexChanged.connect(self.on_kind_changed)
+        form.addWidget(self.kind_combo, 1, 1)
+
+        form.addWidget(QLabel(L("derived.label.source", "Source channel:")), 2, 0)
+        self.source_combo = QComboBox()
+        form.addWidget(self.source_combo, 2, 1)
+
+        self.source2_label = QLabel(L("derived.label.source2", "Second channel:"))
+        form.addWidget(self.source2_label, 3, 0)
+        self.source2_combo = QComboBox()
+        form.addWidget(self.source2_combo, 3, 1)
+
+        self.p1_label = QLabel()
+        form.addWidget(self.p1_label, 4, 0)
+        self.p1_spin = QDoubleSpinBox()
+        self.p1_spin.setRange(-1e9, 1e9)
+        self.p1_spin.setDecimals(4)
+        form.addWidget(self.p1_spin, 4, 1)
+
+        self.p2_label = QLabel()
+        form.addWidget(self.p2_label, 5, 0)
+        self.p2_spin = QDoubleSpinBox()
+        self.p2_spin.setRange(-1e9, 1e9)
+        self.p2_spin.setDecimals(4)
+        form.addWidget(self.p2_spin, 5, 1)
+        layout.addLayout(form)
+
+        buttons = QHBoxLayout()
+        self.apply_btn = QPushButton(L("derived.btn.apply", "Apply"))
+        self.apply_btn.clicked.connect(self.on_apply)
+        self.remove_btn = QPushButton(L("derived.btn.remove", "Remove"))
+        self.remove_btn.clicked.connect(self.on_remove)
+        buttons.addWidget(self.apply_btn)
+        buttons.addWidget(self.remove_btn)
+        layout.addLayout(buttons)
+
+        self.status = QLabel("")
+        layout.addWidget(self.status)
+
+        self.reload()
+        self.on_kind_changed()
+
+    def reload(self):
+        derived = {spec["name"] for spec in self.db.derived_channels(self.table_name)}
+        sources = [c for c in self.db.numeric_columns(self.table_name) if c not in derived]
+        for combo in (self.source_combo, self.source2_combo):
+            current = combo.currentText()
+            combo.clear()
+            combo.addItems(sources)
+            if current in sources:
+                combo.setCurrentText(current)
+        self.channel_list.clear()
+        self.channel_list.addItems(sorted(derived))
+
+    def on_kind_changed(self):
+        kind = self.kind_combo.currentData()
+        _label, p1_key, p1_default, p2_key, p2_default = DERIVED_KINDS[kind]
+        for label, spin, key, default in ((self.p1_label, self.p1_spin, p1_key, p1_default),
+                                          (self.p2_label, self.p2_spin, p2_key, p2_default)):
+            label.setVisible(key is not None)
+            spin.setVisible(key is not None)
+            if key is not None:
+                label.setText(L(f"derived.param.{key}", PARAM_LABELS[key]))
+                spin.setValue(default)
+        is_pair = kind == "channel_difference"
+        self.source2_label.setVisible(is_pair)
+        self.source2_combo.setVisible(is_pair)
+
+    def on_select(self, name):
+        spec = next((s for s in self.db.derived_channels(self.table_name) if s["name"] == name), None)
+        if not spec:
+            return
+        self.name_input.setText(spec["name"])
+        self.kind_combo.setCurrentIndex(self.kind_combo.findData(spec["kind"]))
+        self.source_combo.setCurrentText(spec["source"])
+        self.source2_combo.setCurrentText(spec["source2"] or "")
+        self.p1_spin.setValue(spec["p1"])
+        self.p2_spin.setValue(spec["p2"])
+
+    def current_spec(self):
+        kind = self.kind_combo.currentData()
+        return {
+            "name": self.name_input.text().strip(),
+            "kind": kind,
+            "source": self.source_combo.currentText(),
+            "source2": self.source2_combo.currentText() if kind == "channel_difference" else None,
+            "p1": self.p1_spin.value(),
+            "p2": self.p2_spin.value(),
+        }
+
+    def on_apply(self):
+        spec = self.current_spec()
+        if not spec["name"] or not spec["source"]:
+            QMessageBox.warning(self, "Warning", L("derived.error.incomplete", "Provide a name and a source channel"))
+            return
+        self._run(self.db.materialise_channel, self.table_name, spec)
+
+    def on_remove(self):
+        item = self.channel_list.currentItem()
+        if item:
+            self._run(self.db.drop_channel, self.table_name, item.text())
+
+    def _run(self, fn, *args):
+        self.apply_btn.setEnabled(False)
+        self.remove_btn.setEnabled(False)
+        self.status.setText(L("derived.msg.computing", "Computing..."))
+        self.worker = WorkerThread(fn, *args)
+        self.worker.finished.connect(self._on_done)
+        self.worker.error.connect(self._on_error)
+        self.worker.start()
+
+    def _on_done(self, _result):
+        self.apply_btn.setEnabled(True)
+        self.remove_btn.setEnabled(True)
+        self.status.setText(L("general.ready", "Ready"))
+        self.reload()
+        self.channels_changed.emit()
+
+    def _on_error(self, msg):
+        self.apply_btn.setEnabled(True)
+        self.remove_btn.setEnabled(True)
+        self.status.setText("")
+        QMessageBox.critical(self, "Error", msg)
+
+    def closeEvent(self, event):
+        if self.worker is not None:
+            self.worker.wait()  # never leave a half-written column behind
+        super().closeEvent(event)
@@ -0,0 +1,113 @@
+# modules/event_search.py
+from PySide6.QtWidgets import (
+    QWidget, QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QDoubleSpinBox,
+    QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QMessageBox
+)
+from PySide6.QtCore import Signal
+from .workers import WorkerThread, keep_alive
+from .i18n import L
+
+class EventSearchPanel(QWidget):
+    """Threshold search form plus the list of matching intervals."""
+    event_selected = Signal(dict)
+
+    def __init__(self, db_manager, table_name, parent=None):
+        super().__init__(parent)
+        self.db = db_manager
+        self.table_name = table_name
+        self.events = []
+        self.worker = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        form = QHBoxLayout()
+        form.addWidget(QLabel(L("events.label.channel", "Channel:")))
+        self.column_combo = QComboBox()
+        self.column_combo.addItems(self.db.numeric_columns(table_name))
+        form.addWidget(self.column_combo)
+        self.op_combo = QComboBox()
+        self.op_combo.addItems([">", "<"])
+        form.addWidget(self.op_combo)
+        self.threshold_spin = QDoubleSpinBox()
+        self.threshold_spin.setRange(-1e9, 1e9)
+        self.threshold_spin.setDecimals(3)
+        form.addWidget(self.threshold_spin)
+        form.addWidget(QLabel(L("events.label.min_duration", "for at least [s]:")))
+        self.duration_spin = QDoubleSpinBox()
+        self.duration_spin.setRange(0, 1e7)
+        self.duration_spin.setDecimals(1)
+        self.duration_spin.setValue(1.0)
+        form.addWidget(self.duration_spin)
+        self.search_btn = QPushButton(L("events.btn.search", "Search"))
+        self.search_btn.clicked.connect(self.on_search)
+        form.addWidget(self.search_btn)
+        layout.addLayout(form)
+
+        self.results = QTableWidget(0, 4)
+        self.results.setHorizontalHeaderLabels([
+            L("events.col.start", "Start"), L("events.col.end", "End"),
+            L("events.col.duration", "Duration [s]"), L("events.col.peak", "Peak"),
+        ])
+        self.results.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.results.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.results.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.results.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.results.itemSelectionChanged.connect(self.on_row_selected)
+        layout.addWidget(self.results)
+
+        self.status = QLabel("")
+        layout.addWidget(self.status)
+
+    def on_search(self):
+        if self.worker is not None:
+            return
+        self.search_btn.setEnabled(False)
+        self.status.setText(L("events.msg.searching", "Searching..."))
+        self.worker = keep_alive(WorkerThread(
+            self.db.find_events, self.table_name, self.column_combo.currentText(),
+            self.op_combo.currentText(), self.threshold_spin.value(), self.duration_spin.value()
+        ))
+        self.worker.finished.connect(self._on_done)
+        self.worker.error.connect(self._on_error)
+        self.worker.start()
+
+    def _on_done(self, events):
+        self.worker = None
+        self.search_btn.setEnabled(True)
+        self.events = events
+        self.results.blockSignals(True)
+        self.results.setRowCount(len(events))
+        for row, ev in enumerate(events):
+            values = [
+                ev["start"].strftime("%d/%m/%Y %H:%M:%S.%f")[:-3],
+                ev["end"].strftime("%d/%m/%Y %H:%M:%S.%f")[:-3],
+                f"{ev['duration']:.1f}",
+                f"{ev['peak']:.6g}",
+            ]
+            for col, value in enumerate(values):
+                self.results.setItem(row, col, QTableWidgetItem(value))
+        self.results.blockSignals(False)
+        self.status.setText(L("events.msg.found", "{n} events found").format(n=len(events)))
+
+    def _on_error(self, msg):
+        self.worker = None
+        self.search_btn.setEnabled(True)
+        self.status.setText("")
+        QMessageBox.critical(self, "Error", msg)
+
+    def on_row_selected(self):
+        rows = self.results.selectionModel().selectedRows()
+        if rows:
+            self.event_selected.emit(self.events[rows[0].row()])
+
+class EventSearchDialog(QDialog):
+    """Stand-alone event search for the main window's table view."""
+
+    def __init__(self, db_manager, table_name, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(L("events.title", "Event Search"))
+        self.resize(760, 420)
+        layout = QVBoxLayout(self)
+        self.panel = EventSearchPanel(db_manager, table_name, self)
+        layout.addWidget(self.panel)
@@ -0,0 +1,77 @@
+# modules/export_dialog.py
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QComboBox, QCheckBox,
+    QListWidget, QListWidgetItem, QDateTimeEdit, QDialogButtonBox, QMessageBox
+)
+from PySide6.QtCore import Qt, QDateTime
+from .i18n import L
+
+class ExportDialog(QDialog):
+    """Chooses output format, columns and an optional time window for an export."""
+
+    def __init__(self, db_manager, table_name, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(L("export.title", "Export"))
+        self.resize(460, 480)
+        layout = QVBoxLayout(self)
+
+        form = QGridLayout()
+        form.addWidget(QLabel(L("export.label.format", "Format:")), 0, 0)
+        self.format_combo = QComboBox()
+        self.format_combo.addItem(L("export.fmt.csv", "CSV"), "csv")
+        self.format_combo.addItem(L("export.fmt.csv_gz", "CSV, gzip compressed"), "csv.gz")
+        self.format_combo.addItem(L("export.fmt.parquet", "Parquet (zstd)"), "parquet")
+        self.format_combo.addItem(L("export.fmt.arrow", "Arrow IPC"), "arrow")
+        form.addWidget(self.format_combo, 0, 1)
+        layout.addLayout(form)
+
+        layout.addWidget(QLabel(L("export.label.columns", "Columns:")))
+        self.column_list = QListWidget()
+        for name, _type in db_manager.columns(table_name):
+            item = QListWidgetItem(name)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked)
+            self.column_list.addItem(item)
+        layout.addWidget(self.column_list)
+
+        # Only reformatted tables have a time axis to limit the export to
+        self.range_cb = None
+        if db_manager.datetime_column(table_name):
+            self.range_cb = QCheckBox(L("export.chk.time_range", "Limit to time range"))
+            layout.addWidget(self.range_cb)
+            range_layout = QHBoxLayout()
+            start, end = db_manager.time_span(table_name)
+            self.start_edit = QDateTimeEdit()
+            self.end_edit = QDateTimeEdit()
+            for edit, value in ((self.start_edit, start), (self.end_edit, end)):
+                edit.setDisplayFormat("dd/MM/yyyy HH:mm:ss")
+                edit.setCalendarPopup(True)
+                edit.setEnabled(False)
+                if value is not None:
+                    edit.setDateTime(QDateTime(value))
+                range_layout.addWidget(edit)
+            self.range_cb.toggled.connect(self.start_edit.setEnabled)
+            self.range_cb.toggled.connect(self.end_edit.setEnabled)
+            layout.addLayout(range_layout)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def accept(self):
+        if self.options()["columns"] == []:
+            QMessageBox.warning(self, "Warning", L("export.error.no_columns", "Select at least one column"))
+            return
+        super().accept()
+
+    def options(self):
+        items = [self.column_list.item(i) for i in range(self.column_list.count())]
+        checked = [item.text() for item in items if item.checkState() == Qt.Checked]
+        use_range = self.range_cb is not None and self.range_cb.isChecked()
+        return {
+            "fmt": self.format_combo.currentData(),
+            "columns": None if len(checked) == len(items) else checked,
+            "start": self.start_edit.dateTime().toPython() if use_range else None,
+            "end": self.end_edit.dateTime().toPython() if use_range else None,
+        }
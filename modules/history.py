@@ -0,0 +1,122 @@
+# modules/history.py
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem,
+    QHeaderView, QAbstractItemView, QMessageBox
+)
+from PySide6.QtCore import Qt, Signal
+from .utils import format_bytes
+from .workers import WorkerThread
+from .i18n import L
+
+# operation -> label of the state a snapshot kept
+OPERATIONS = {
+    "import": "Before re-import",
+    "reformat": "Before date/time formatting",
+    "resample": "Before overwrite by resampling",
+    "rollback": "Before rollback",
+    "publish": "Before overwrite by a later session",
+}
+
+# =======================================================
+# History Dialog
+# =======================================================
+class HistoryDialog(QDialog):
+    """Lists the snapshots kept of a table and rolls it back to one of them."""
+    rolled_back = Signal(str)
+
+    def __init__(self, db_manager, table_name, parent=None):
+        super().__init__(parent)
+        self.db = db_manager
+        self.table_name = table_name
+        self.worker = None
+        self.setWindowTitle(L("history.title", "History: {table}").format(table=table_name))
+        self.resize(620, 360)
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels([
+            L("history.col.taken", "Taken"), L("history.col.operation", "State"),
+            L("history.col.rows", "Rows"), L("history.col.size", "Size (est.)"),
+        ])
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.table.itemSelectionChanged.connect(self.on_selection_changed)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        self.rollback_btn = QPushButton(L("history.btn.rollback", "Roll Back"))
+        self.rollback_btn.clicked.connect(self.on_rollback)
+        self.delete_btn = QPushButton(L("history.btn.delete", "Delete Snapshot"))
+        self.delete_btn.clicked.connect(self.on_delete)
+        buttons.addWidget(self.rollback_btn)
+        buttons.addWidget(self.delete_btn)
+        layout.addLayout(buttons)
+
+        self.status = QLabel("")
+        layout.addWidget(self.status)
+        self.reload()
+
+    def reload(self):
+        self.snapshots = self.db.history(self.table_name)
+        self.table.setRowCount(len(self.snapshots))
+        for i, snap in enumerate(self.snapshots):
+            op = snap["operation"]
+            cells = [f"{snap['taken']:%d/%m/%Y %H:%M:%S}", L(f"history.op.{op}", OPERATIONS.get(op, op)),
+                     f"{snap['row_count']:,}", format_bytes(snap["bytes"])]
+            for j, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if j >= 2:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(i, j, item)
+        if self.snapshots:
+            self.table.selectRow(0)
+        else:
+            self.status.setText(L("history.msg.empty", "No snapshots kept for this table"))
+        self.on_selection_changed()
+
+    def selected(self):
+        rows = self.table.selectionModel().selectedRows()
+        return self.snapshots[rows[0].row()] if rows else None
+
+    def on_selection_changed(self):
+        snap = self.selected()
+        enabled = self.worker is None and snap is not None
+        self.rollback_btn.setEnabled(enabled)
+        self.delete_btn.setEnabled(enabled and not snap["cached"])  # the cache is attached read-only
+
+    def on_rollback(self):
+        snap = self.selected()
+        if snap is None:
+            return
+        self.status.setText(L("history.msg.rolling_back", "Rolling back..."))
+        self.worker = WorkerThread(self.db.rollback, snap["id"], snap["cached"])
+        self.worker.finished.connect(self._on_done)
+        self.worker.error.connect(self._on_error)
+        self.on_selection_changed()
+        self.worker.start()
+
+    def on_delete(self):
+        snap = self.selected()
+        if snap is not None:
+            self.db.delete_snapshot(snap["id"])
+            self.reload()
+
+    def _on_done(self, table_name):
+        self.worker = None
+        self.status.setText(L("history.msg.rolled_back", "Table restored; the replaced state was kept as a snapshot"))
+        self.reload()
+        self.rolled_back.emit(table_name)
+
+    def _on_error(self, msg):
+        self.worker = None
+        self.status.setText("")
+        self.on_selection_changed()
+        QMessageBox.critical(self, "Error", msg)
+
+    def closeEvent(self, event):
+        if self.worker is not None:
+            self.worker.wait()
+        super().closeEvent(event)
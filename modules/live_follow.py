@@ -0,0 +1,46 @@
+# modules/live_follow.py
+import os
+
+class LogFollower:
+    """
+    Tails a growing AMS CSV log and appends newly written rows to its table.
+    Only bytes past the remembered offset are read, so each poll costs
+    time proportional to the new rows.
+    """
+
+    def __init__(self, db_manager, path, table_name, delimiter=";", offset=None):
+        self.db = db_manager
+        self.path = path
+        self.table_name = table_name
+        self.delimiter = delimiter
+        # Binary, so a CRLF line ending counts both bytes: rows resume right after the header
+        with open(path, "rb") as f:
+            header_line = f.readline()
+        self.header = header_line.decode("utf-8", errors="replace").strip().split(delimiter)
+        self.header_bytes = len(header_line)
+        self.offset = os.path.getsize(path) if offset is None else offset
+        # Rows the import may already have picked up are skipped by timestamp
+        self.last_ts = self.db.max_timestamp(table_name)
+
+    def poll(self):
+        """Appends complete lines written since the last poll; returns the number of new rows."""
+        size = os.path.getsize(self.path)
+        if size < self.offset:
+            self.offset = self.header_bytes  # log was truncated or rotated: start over past the header
+        if size == self.offset:
+            return 0
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        end = data.rfind(b"\n")
+        if end < 0:
+            return 0  # the writer is still in the middle of the first new line
+        data = data[:end + 1]
+        self.offset += len(data)
+
+        added, self.last_ts = self.db.append_csv_rows(
+            self.table_name, data, self.header, self.delimiter,
+            after=self.last_ts, source_name=os.path.basename(self.path)
+        )
+        return added
@@ -0,0 +1,53 @@
+# modules/outliers.py
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+MAD_TO_SIGMA = 1.4826          # MAD of Gaussian noise times this is its standard deviation
+CHUNK_ELEMENTS = 8_000_000     # window cells processed at once, bounds the temporary copies
+MAX_HALF_WINDOW = 50           # cost grows with the window: about 20 s for 20M samples at this width
+
+def hampel(values, half_window=3, threshold=3.0):
+    """
+    Hampel filter over a whole channel in one vectorised pass.
+
+    Each sample is compared with the median of the 2*half_window+1 samples centred
+    on it; it is an outlier when it lies more than `threshold` robust standard
+    deviations (1.4826 * MAD) away. Returns (mask, medians): the boolean outlier mask
+    and the window medians, which replace the outliers when cleaning. Windows that
+    contain NaN (missing samples) never flag anything. The MAD is floored at the
+    channel's resolution, its smallest step between samples, so one-step changes on
+    a flat stretch of a quantised signal are not taken for spikes.
+    """
+    values = np.asarray(values)
+    n = len(values)
+    mask = np.zeros(n, dtype=bool)
+    medians = values.copy()
+    if n == 0 or half_window < 1:
+        return mask, medians
+
+    width = 2 * half_window + 1
+    # Repeat the edge samples so every position has a full, centred window
+    padded = np.pad(values, half_window, mode="edge")
+    missing = np.isnan(padded)
+    # NaNs per window from a running count: O(n) whatever the window width
+    nan_count = np.concatenate(([0], np.cumsum(missing)))
+    complete = nan_count[width:] - nan_count[:-width] == 0
+    steps = np.abs(np.diff(values[~np.isnan(values)]))
+    steps = steps[steps > 0]
+    floor = steps.min() if len(steps) else 0.0
+
+    windows = sliding_window_view(padded, width)  # (n, width) view, no copy
+    step = max(1, CHUNK_ELEMENTS // width)
+    for start in range(0, n, step):
+        block = windows[start:start + step]
+        med = np.partition(block, half_window, axis=1)[:, half_window]
+        mad = np.partition(np.abs(block - med[:, None]), half_window, axis=1)[:, half_window]
+        with np.errstate(invalid="ignore"):
+            mask[start:start + step] = np.abs(values[start:start + step] - med) > threshold * MAD_TO_SIGMA * np.maximum(mad, floor)
+        medians[start:start + step] = med
+    mask &= complete
+    return mask, medians
+
+def clean(values, mask, medians):
+    """Channel with every outlier replaced by its window median."""
+    return np.where(mask, medians, values)
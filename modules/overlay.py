@@ -0,0 +1,229 @@
+# modules/overlay.py
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QComboBox, QDoubleSpinBox,
+    QPushButton, QCheckBox, QListWidget, QListWidgetItem, QMessageBox
+)
+from PySide6.QtCore import Qt
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
+from matplotlib.figure import Figure
+import numpy as np
+from .workers import WorkerThread, keep_alive
+from .tracing import span, traced
+from .i18n import L
+
+OVERLAY_POINTS = 2000  # buckets per run; about one per horizontal pixel of the plot
+
+@traced("overlay.load")
+def load_overlay(db, tables, column, align="start", trigger=None, points=OVERLAY_POINTS):
+    """
+    Fetches one channel of several runs on a shared relative-time grid.
+    `align` is "start" (t = 0 at each run's first sample) or "trigger", where
+    `trigger` = (column, op, threshold) and t = 0 is the first sample meeting it;
+    runs that never trigger are returned in `skipped`.
+    Returns {"grid": seconds, "runs": {table: values}, "skipped": [table, ...]}.
+    """
+    origins, spans, skipped = {}, {}, []
+    for table in tables:
+        first, last = db.time_span(table)
+        origin = first if align == "start" else db.trigger_time(table, *trigger)
+        if origin is None:
+            skipped.append(table)
+            continue
+        origins[table] = origin
+        spans[table] = ((first - origin).total_seconds(), (last - origin).total_seconds())
+    if not origins:
+        return {"grid": np.empty(0), "runs": {}, "skipped": skipped}
+
+    start_s = min(lo for lo, _hi in spans.values())
+    end_s = max(hi for _lo, hi in spans.values())
+    end_s = max(end_s, start_s) + 1e-3  # one timestamp tick, so the last sample falls inside the half-open window
+    width = (end_s - start_s) / points
+    grid = start_s + (np.arange(points) + 0.5) * width
+    runs = {table: db.fetch_aligned(table, column, origin, start_s, end_s, points)
+            for table, origin in origins.items()}
+    return {"grid": grid, "runs": runs, "skipped": skipped}
+
+# =======================================================
+# Overlay Dialog
+# =======================================================
+class OverlayDialog(QDialog):
+    """Overlays one channel of several runs on relative time, with deviations from a reference run."""
+
+    def __init__(self, db_manager, tables, parent=None):
+        super().__init__(parent)
+        self.db = db_manager
+        self.worker = None
+        self.result = None
+        self.setWindowTitle(L("overlay.title", "Compare Runs"))
+        self.resize(1100, 760)
+        layout = QHBoxLayout(self)
+
+        side = QVBoxLayout()
+        side.addWidget(QLabel(L("overlay.label.runs", "Runs:")))
+        self.run_list = QListWidget()
+        for table in tables:
+            item = QListWidgetItem(table)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked)
+            self.run_list.addItem(item)
+        self.run_list.itemChanged.connect(self.on_runs_changed)
+        side.addWidget(self.run_list)
+
+        form = QGridLayout()
+        form.addWidget(QLabel(L("overlay.label.channel", "Channel:")), 0, 0)
+        self.column_combo = QComboBox()
+        form.addWidget(self.column_combo, 0, 1)
+
+        form.addWidget(QLabel(L("overlay.label.align", "Align on:")), 1, 0)
+        self.align_combo = QComboBox()
+        self.align_combo.addItem(L("overlay.align.start", "Run start"), "start")
+        self.align_combo.addItem(L("overlay.align.trigger", "Trigger"), "trigger")
+        self.align_combo.currentIndexChanged.connect(self.on_align_changed)
+        form.addWidget(self.align_combo, 1, 1)
+
+        self.trigger_label = QLabel(L("overlay.label.trigger", "Trigger:"))
+        form.addWidget(self.trigger_label, 2, 0)
+        trigger_row = QHBoxLayout()
+        self.trigger_combo = QComboBox()
+        self.op_combo = QComboBox()
+        self.op_combo.addItems([">", "<"])
+        self.threshold_spin = QDoubleSpinBox()
+        self.threshold_spin.setRange(-1e9, 1e9)
+        self.threshold_spin.setDecimals(3)
+        for widget in (self.trigger_combo, self.op_combo, self.threshold_spin):
+            trigger_row.addWidget(widget)
+        form.addLayout(trigger_row, 2, 1)
+
+        form.addWidget(QLabel(L("overlay.label.reference", "Reference run:")), 3, 0)
+        self.reference_combo = QComboBox()
+        form.addWidget(self.reference_combo, 3, 1)
+        side.addLayout(form)
+
+        self.difference_cb = QCheckBox(L("overlay.chk.difference", "Show difference to reference"))
+        self.difference_cb.setChecked(True)
+        self.difference_cb.toggled.connect(self.redraw)
+        side.addWidget(self.difference_cb)
+        self.envelope_cb = QCheckBox(L("overlay.chk.envelope", "Show envelope of the other runs"))
+        self.envelope_cb.setChecked(True)
+        self.envelope_cb.toggled.connect(self.redraw)
+        side.addWidget(self.envelope_cb)
+        self.reference_combo.currentIndexChanged.connect(self.redraw)
+
+        self.plot_btn = QPushButton(L("overlay.btn.plot", "Plot"))
+        self.plot_btn.clicked.connect(self.on_plot)
+        side.addWidget(self.plot_btn)
+        self.status = QLabel("")
+        self.status.setWordWrap(True)
+        side.addWidget(self.status)
+        layout.addLayout(side, 1)
+
+        plot_area = QVBoxLayout()
+        self.fig = Figure(figsize=(9, 6))
+        self.ax_main = self.fig.add_subplot(211)
+        self.ax_diff = self.fig.add_subplot(212, sharex=self.ax_main)
+        self.canvas = FigureCanvas(self.fig)
+        plot_area.addWidget(NavigationToolbar(self.canvas, self))
+        plot_area.addWidget(self.canvas)
+        layout.addLayout(plot_area, 3)
+
+        self.on_runs_changed()
+        self.on_align_changed()
+
+    def checked_runs(self):
+        items = [self.run_list.item(i) for i in range(self.run_list.count())]
+        return [item.text() for item in items if item.checkState() == Qt.Checked]
+
+    def on_runs_changed(self):
+        runs = self.checked_runs()
+        common = None
+        for table in runs:
+            names = self.db.numeric_columns(table)
+            common = names if common is None else [c for c in common if c in names]
+        for combo, items in ((self.column_combo, common or []), (self.trigger_combo, common or []),
+                             (self.reference_combo, runs)):
+            current = combo.currentText()
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItems(items)
+            if current in items:
+                combo.setCurrentText(current)
+            combo.blockSignals(False)
+        self.plot_btn.setEnabled(bool(runs and common))
+
+    def on_align_changed(self):
+        is_trigger = self.align_combo.currentData() == "trigger"
+        for widget in (self.trigger_label, self.trigger_combo, self.op_combo, self.threshold_spin):
+            widget.setVisible(is_trigger)
+
+    def on_plot(self):
+        if self.worker is not None:
+            return
+        trigger = (self.trigger_combo.currentText(), self.op_combo.currentText(), self.threshold_spin.value())
+        self.plot_btn.setEnabled(False)
+        self.status.setText(L("overlay.msg.loading", "Loading runs..."))
+        self.worker = keep_alive(WorkerThread(
+            load_overlay, self.db, self.checked_runs(), self.column_combo.currentText(),
+            self.align_combo.currentData(), trigger
+        ))
+        self.worker.finished.connect(self._on_done)
+        self.worker.error.connect(self._on_error)
+        self.worker.start()
+
+    def _on_done(self, result):
+        self.worker = None
+        self.plot_btn.setEnabled(True)
+        self.result = result
+        self.status.setText(L("overlay.msg.skipped", "No trigger in: {runs}").format(runs=", ".join(result["skipped"]))
+                            if result["skipped"] else "")
+        self.redraw()
+
+    def _on_error(self, msg):
+        self.worker = None
+        self.plot_btn.setEnabled(True)
+        self.status.setText("")
+        QMessageBox.critical(self, "Error", msg)
+
+    def redraw(self):
+        if not self.result or not self.result["runs"]:
+            return
+        grid, runs = self.result["grid"], self.result["runs"]
+        reference = self.reference_combo.currentText()
+        ref = runs.get(reference)
+        show_diff = self.difference_cb.isChecked() and ref is not None
+        self.ax_main.clear()
+        self.ax_diff.clear()
+        self.ax_diff.set_visible(show_diff)
+
+        others = [v for table, v in runs.items() if table != reference]
+        if self.envelope_cb.isChecked() and others:
+            stack = np.vstack(others)
+            with np.errstate(all="ignore"):
+                lo, hi = np.nanmin(stack, axis=0), np.nanmax(stack, axis=0)
+            self.ax_main.fill_between(grid, lo, hi, color="gray", alpha=0.2,
+                                      label=L("overlay.legend.envelope", "Envelope"))
+        colors = {table: f"C{i % 10}" for i, table in enumerate(runs)}  # same colour for a run in both axes
+        for table, values in runs.items():
+            self.ax_main.plot(grid, values, label=table, color=colors[table],
+                              linewidth=2.0 if table == reference else 1.0)
+        self.ax_main.set_ylabel(self.column_combo.currentText())
+        self.ax_main.legend(loc="upper right", fontsize="small")
+        self.ax_main.grid(True)
+
+        if show_diff:
+            for table, values in runs.items():
+                if table != reference:
+                    self.ax_diff.plot(grid, values - ref, label=table, color=colors[table], linewidth=1.0)
+            self.ax_diff.axhline(0, color="black", linewidth=0.8)
+            self.ax_diff.set_ylabel(L("overlay.label.difference", "Difference to {run}").format(run=reference))
+            self.ax_diff.grid(True)
+        (self.ax_diff if show_diff else self.ax_main).set_xlabel(L("overlay.label.relative_time", "Relative time [s]"))
+        self.ax_main.tick_params(labelbottom=not show_diff)
+        self.fig.tight_layout()
+        with span("overlay.canvas_draw", runs=len(runs)):
+            self.canvas.draw()
+
+    def closeEvent(self, event):
+        if self.worker is not None:
+            self.worker.wait()
+        super().closeEvent(event)
@@ -0,0 +1,105 @@
+# modules/perf_panel.py
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QCheckBox, QPushButton, QLabel, QTableWidget,
+    QTableWidgetItem, QHeaderView, QAbstractItemView, QFileDialog, QMessageBox
+)
+from PySide6.QtCore import Qt, QTimer
+from . import tracing
+from .utils import format_bytes
+from .i18n import L
+
+REFRESH_MS = 1000
+RECENT_SPANS = 200
+
+class PerformanceDialog(QDialog):
+    """Live view of the tracing spans, with Chrome-trace export for support cases."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(L("perf.title", "Performance"))
+        self.resize(820, 560)
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.enable_cb = QCheckBox(L("perf.chk.enable", "Record performance trace"))
+        self.enable_cb.setChecked(tracing.is_enabled())
+        self.enable_cb.toggled.connect(tracing.enable)
+        controls.addWidget(self.enable_cb)
+        controls.addStretch()
+        self.clear_btn = QPushButton(L("perf.btn.clear", "Clear"))
+        self.clear_btn.clicked.connect(self.on_clear)
+        controls.addWidget(self.clear_btn)
+        self.export_btn = QPushButton(L("perf.btn.export", "Export Chrome Trace..."))
+        self.export_btn.clicked.connect(self.on_export)
+        controls.addWidget(self.export_btn)
+        layout.addLayout(controls)
+
+        layout.addWidget(QLabel(L("perf.label.summary", "Totals per operation:")))
+        self.summary_table = self._make_table([
+            L("perf.col.operation", "Operation"), L("perf.col.calls", "Calls"),
+            L("perf.col.total", "Total [ms]"), L("perf.col.mean", "Mean [ms]"), L("perf.col.max", "Max [ms]"),
+            L("perf.col.rows", "Rows"), L("perf.col.memory", "Memory delta"),
+        ])
+        layout.addWidget(self.summary_table)
+
+        layout.addWidget(QLabel(L("perf.label.recent", "Most recent spans:")))
+        self.recent_table = self._make_table([
+            L("perf.col.operation", "Operation"), L("perf.col.duration", "Duration [ms]"),
+            L("perf.col.details", "Details"),
+        ])
+        layout.addWidget(self.recent_table)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start()
+        self.refresh()
+
+    @staticmethod
+    def _make_table(headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        return table
+
+    @staticmethod
+    def _fill(table, rows):
+        table.setRowCount(len(rows))
+        for r, values in enumerate(rows):
+            for c, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if c > 0:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                table.setItem(r, c, item)
+
+    def refresh(self):
+        self._fill(self.summary_table, [
+            (name, str(calls), f"{total:.1f}", f"{mean:.2f}", f"{peak:.1f}", f"{rows:,}" if rows else "",
+             format_bytes(mem) if mem else "")
+            for name, calls, total, mean, peak, rows, mem in tracing.summary()
+        ])
+        recent = tracing.events()[-RECENT_SPANS:][::-1]
+        self._fill(self.recent_table, [
+            (ev["name"], f"{ev['dur_us'] / 1000:.2f}",
+             ", ".join(f"{k}={format_bytes(v) if k == 'mem_delta' else v}" for k, v in ev["args"].items()))
+            for ev in recent
+        ])
+
+    def on_clear(self):
+        tracing.clear()
+        self.refresh()
+
+    def on_export(self):
+        path, _ = QFileDialog.getSaveFileName(self, L("perf.btn.export", "Export Chrome Trace..."), "ams_trace.json",
+                                              "Chrome Trace (*.json)")
+        if not path:
+            return
+        try:
+            count = tracing.export_chrome_trace(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        QMessageBox.information(self, L("perf.title", "Performance"),
+                                L("perf.msg.exported", "{n} events written to {path}").format(n=count, path=path))
@@ -2,17 +2,40 @@
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QCheckBox, QSlider,
     QPushButton, QComboBox, QSpinBox, QWidget, QSizePolicy, QSpacerItem,
-    QGridLayout, QFrame
+    QGridLayout, QFrame, QDoubleSpinBox
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+import numpy as np
 import pandas as pd
 from datetime import timedelta
+from .stats_panel import StatsPanel
+from .event_search import EventSearchPanel
+from .outliers import MAX_HALF_WINDOW
+from .workers import WorkerThread, keep_alive
+from .tracing import span, traced
 from .i18n import L  # <-- Use global L from core
 
+SPIKE_DELAY_MS = 400  # debounce while the spike window and threshold are being stepped
+
+@traced("plot.load_data")
+def load_plot_data(db, table_name, dtype="float32"):
+    """
+    Returns (datetime_col, y_columns, time, {column: array}) for plotting.
+    Kept free of widgets so the data preparation can be timed headlessly.
+    """
+    datetime_col = db.datetime_column(table_name)
+    if not datetime_col:
+        return None, [], None, {}
+    y_columns = db.numeric_columns(table_name)
+    t, data = db.fetch_numpy(table_name, y_columns, dtype=dtype)
+    if len(t) == 0:
+        return None, y_columns, t, data
+    return datetime_col, y_columns, t, data
+
 class PlotDialog(QDialog):
     def __init__(self, db_manager, table_name, parent=None, loc=None):
         super().__init__(parent)
@@ -28,43 +51,17 @@ class PlotDialog(QDialog):
         self.setWindowTitle(T("plot.title", "Plot Data"))
         self.resize(1100, 730)
 
-        # Load full table
-        total_rows = self.db.table_count(table_name)
-        self.df = self.db.get_page(table_name, 0, total_rows)
-
-        # Detect datetime column
-        datetime_cols = self.df.select_dtypes(include=['datetime64', 'object']).columns
-        self.datetime_col = None
-        for col in datetime_cols:
-            try:
-                self.df[col] = pd.to_datetime(self.df[col], errors='coerce', format='%d/%m/%Y %H:%M:%S.%f')
-                if self.df[col].notna().any():
-                    self.datetime_col = col
-                    break
-            except Exception:
-                try:
-                    self.df[col] = pd.to_datetime(self.df[col], errors='coerce')
-                    if self.df[col].notna().any():
-                        self.datetime_col = col
-                        break
-                except Exception:
-                    continue
-
+        # Load the time axis and numeric channels as contiguous arrays
+        self.datetime_col, self.y_columns, self.t, self.data = load_plot_data(self.db, table_name)
         if not self.datetime_col:
             raise ValueError(T("plot.error.no_datetime_col", "No valid datetime column found in table"))
-
-        # Detect numeric columns
-        numeric_cols = self.df.select_dtypes(include=['number']).columns
-        self.y_columns = [col for col in numeric_cols if col != self.datetime_col]
         if not self.y_columns:
             raise ValueError(T("plot.error.no_numeric_cols", "No numeric columns available for plotting"))
 
-        self.df = self.df.sort_values(self.datetime_col).reset_index(drop=True)
-
         # Timeline
         self.slider_resolution = timedelta(minutes=1)
-        start_time = self.df[self.datetime_col].min().replace(second=0, microsecond=0)
-        end_time = self.df[self.datetime_col].max().replace(second=0, microsecond=0)
+        start_time = pd.Timestamp(self.t[0]).floor(self.slider_resolution)
+        end_time = pd.Timestamp(self.t[-1]).floor(self.slider_resolution)
         self.timeline = pd.date_range(start=start_time, end=end_time, freq=self.slider_resolution)
         self.timeline_len = max(1, len(self.timeline))
 
@@ -192,7 +189,7 @@ class PlotDialog(QDialog):
 
         self.filter_container = QWidget()
         self.filter_container.setVisible(False)
-        self.filter_container.setFixedSize(1080, 170)
+        self.filter_container.setFixedSize(1080, 200)
         filter_layout = QVBoxLayout(self.filter_container)
         filter_layout.setSpacing(2)
         filter_layout.setContentsMargins(20, 2, 20, 2)
@@ -243,16 +240,35 @@ class PlotDialog(QDialog):
         peak_layout.setSpacing(5)
         peak_layout.setContentsMargins(0, 0, 0, 0)
         peak_layout.addWidget(QLabel(T("plot.label.spike_removal", "Spike removal:")), 0, 0, Qt.AlignRight)
+        # The Hampel pass runs in a worker; changed settings are picked up once stepping pauses
+        self.outlier_worker = None
+        self.spike_timer = QTimer(self)
+        self.spike_timer.setSingleShot(True)
+        self.spike_timer.setInterval(SPIKE_DELAY_MS)
+        self.spike_timer.timeout.connect(self.update_plot)
         self.spike_cb = QCheckBox(T("plot.chk.enable", "Enable"))
         self.spike_cb.stateChanged.connect(self.update_plot)
         peak_layout.addWidget(self.spike_cb, 0, 1, Qt.AlignLeft)
         peak_layout.addWidget(QLabel(T("plot.label.spike_window", "Spike window:")), 1, 0, Qt.AlignRight)
+        # Hampel filter: samples further than `threshold` robust sigmas from the
+        # median of a centred window (odd, in samples) are replaced by that median
         self.spike_window = QSpinBox()
-        self.spike_window.setMinimum(1)
-        self.spike_window.setMaximum(50)
-        self.spike_window.setValue(3)
-        self.spike_window.valueChanged.connect(self.update_plot)
+        self.spike_window.setMinimum(3)
+        self.spike_window.setMaximum(2 * MAX_HALF_WINDOW + 1)
+        self.spike_window.setSingleStep(2)
+        self.spike_window.setValue(21)
+        self.spike_window.valueChanged.connect(lambda _: self.spike_timer.start())
         peak_layout.addWidget(self.spike_window, 1, 1, Qt.AlignLeft)
+        peak_layout.addWidget(QLabel(T("plot.label.spike_threshold", "Threshold [σ]:")), 2, 0, Qt.AlignRight)
+        self.spike_threshold = QDoubleSpinBox()
+        self.spike_threshold.setRange(1.0, 20.0)
+        self.spike_threshold.setSingleStep(0.5)
+        self.spike_threshold.setValue(3.5)
+        self.spike_threshold.valueChanged.connect(lambda _: self.spike_timer.start())
+        peak_layout.addWidget(self.spike_threshold, 2, 1, Qt.AlignLeft)
+        self.spike_report = QLabel("")
+        self.spike_report.setStyleSheet("color: gray;")
+        peak_layout.addWidget(self.spike_report, 3, 0, 1, 2, Qt.AlignLeft)
         form_grid.addWidget(peak_container, 0, 0, Qt.AlignTop)
 
         # Smoothing
@@ -290,6 +306,33 @@ class PlotDialog(QDialog):
             lambda checked: self.toggle_panel(self.filter_container, checked)
         )
 
+        # --- Statistics panel ---
+        self.toggle_stats_btn = QPushButton(T("plot.btn.toggle_statistics", "Toggle Statistics"))
+        self.toggle_stats_btn.setCheckable(True)
+        self.toggle_stats_btn.setChecked(False)
+        layout.addWidget(self.toggle_stats_btn)
+
+        self.stats_panel = StatsPanel(self.db, self.table_name, self)
+        self.stats_panel.setVisible(False)
+        self.stats_panel.setFixedSize(1080, 120)
+        layout.addWidget(self.stats_panel)
+        self.toggle_stats_btn.toggled.connect(self.on_toggle_stats)
+
+        # --- Event search panel ---
+        self.toggle_events_btn = QPushButton(T("plot.btn.toggle_event_search", "Toggle Event Search"))
+        self.toggle_events_btn.setCheckable(True)
+        self.toggle_events_btn.setChecked(False)
+        layout.addWidget(self.toggle_events_btn)
+
+        self.event_panel = EventSearchPanel(self.db, self.table_name, self)
+        self.event_panel.setVisible(False)
+        self.event_panel.setFixedSize(1080, 200)
+        self.event_panel.event_selected.connect(self.jump_to_event)
+        layout.addWidget(self.event_panel)
+        self.toggle_events_btn.toggled.connect(
+            lambda checked: self.toggle_panel(self.event_panel, checked)
+        )
+
         # --- Initial plot ---
         self.on_y_checkbox_clicked()
         
@@ -332,6 +375,7 @@ class PlotDialog(QDialog):
                 filter_cb.setChecked(False)
 
         self.update_plot()
+        self.refresh_stats()
 
     # --- Remaining methods unchanged ---
     def toggle_panel(self, panel, is_visible):
@@ -342,9 +386,67 @@ class PlotDialog(QDialog):
         else:
             self.resize(self.width(), self.height() - panel.height())
 
+    def on_toggle_stats(self, checked):
+        self.toggle_panel(self.stats_panel, checked)
+        self.refresh_stats()
+
+    def refresh_stats(self):
+        """Requests stats for the checked channels over the slider window."""
+        if not self.toggle_stats_btn.isChecked():
+            return
+        columns = [col for cb, col in zip(self.y_checkboxes, self.y_columns) if cb.isChecked()]
+        if not columns:
+            return
+        start_time = self.timeline[self.start_slider.value()].to_pydatetime()
+        end_time = self.timeline[self.end_slider.value()].to_pydatetime()
+        self.stats_panel.request(columns, start_time, end_time)
+
+    def extend_rows(self):
+        """Pulls rows appended to the table since the dialog opened (live follow)."""
+        t, data = self.db.fetch_numpy(self.table_name, self.y_columns, start=pd.Timestamp(self.t[-1]).to_pydatetime())
+        new = t > self.t[-1]
+        if not new.any():
+            return
+        self.t = np.concatenate([self.t, t[new]])
+        self.data = {col: np.concatenate([self.data[col], data[col][new]]) for col in self.y_columns}
+
+        # Grow the timeline; an end slider parked at the right edge keeps following
+        at_end = self.end_slider.value() == self.timeline_len - 1
+        end_time = pd.Timestamp(self.t[-1]).floor(self.slider_resolution)
+        self.timeline = pd.date_range(start=self.timeline[0], end=end_time, freq=self.slider_resolution)
+        self.timeline_len = max(1, len(self.timeline))
+        for slider in (self.start_slider, self.end_slider):
+            slider.blockSignals(True)
+            slider.setMaximum(self.timeline_len - 1)
+            slider.blockSignals(False)
+        if at_end:
+            self.end_slider.blockSignals(True)
+            self.end_slider.setValue(self.timeline_len - 1)
+            self.end_slider.blockSignals(False)
+        self.on_slider_change()
+
+    def jump_to_event(self, event):
+        """Moves the sliders to frame an event found by the search panel."""
+        start = pd.Timestamp(event["start"]).floor(self.slider_resolution) - self.slider_resolution
+        end = pd.Timestamp(event["end"]).ceil(self.slider_resolution) + self.slider_resolution
+        start_idx = min(max(0, self.timeline.searchsorted(start)), self.timeline_len - 1)
+        end_idx = min(max(start_idx, self.timeline.searchsorted(end)), self.timeline_len - 1)
+        self.start_slider.blockSignals(True)
+        self.end_slider.blockSignals(True)
+        self.start_slider.setValue(start_idx)
+        self.end_slider.setValue(end_idx)
+        self.start_slider.blockSignals(False)
+        self.end_slider.blockSignals(False)
+        self.on_slider_change()
+
+        # Keep the main window's table view in step with the plot
+        if hasattr(self.parent(), "show_row"):
+            self.parent().show_row(event["first_row"])
+
     def reset_filters(self):
         self.spike_cb.setChecked(False)
-        self.spike_window.setValue(3)
+        self.spike_window.setValue(21)
+        self.spike_threshold.setValue(3.5)
         self.filter_type.setCurrentIndex(0)
         self.filter_window.setValue(5)
         self.update_plot()
@@ -361,24 +463,77 @@ class PlotDialog(QDialog):
         self.start_label.setText(str(self.timeline[start_idx]))
         self.end_label.setText(str(self.timeline[end_idx]))
         self.update_plot()
-
-    def apply_filter(self, series, col):
-        data = series.copy()
-        if self.spike_cb.isChecked() and col in [cb.text() for cb in self.filter_y_checkboxes if cb.isChecked()]:
-            k = self.spike_window.value()
-            data = data.rolling(window=k, center=True, min_periods=1).median()
+        self.refresh_stats()
+
+    def spike_outliers(self, col):
+        """
+        Whole-channel Hampel result for the current setting, cached by the database manager,
+        or None while a worker computes it; the plot is redrawn when it arrives.
+        """
+        args = (self.table_name, col, self.spike_window.value() // 2, self.spike_threshold.value())
+        result = self.db.lookup_outliers(*args)
+        if result is None and self.outlier_worker is None:
+            worker = WorkerThread(self.db.outliers, *args)
+            self.outlier_worker = keep_alive(worker)
+            worker.finished.connect(self._on_outliers_done)
+            worker.error.connect(self._on_outliers_error)
+            worker.start()
+        return result
+
+    def _on_outliers_done(self, _result):
+        self.outlier_worker = None
+        if self.isVisible():
+            self.update_plot()  # applies the result, or starts on a channel or setting still missing
+
+    def _on_outliers_error(self, msg):
+        self.outlier_worker = None
+        self.spike_report.setText(msg)
+
+    @traced("plot.apply_filter")
+    def apply_filter(self, values, col, offset=0):
+        """Filters `values`, the slice of channel `col` starting at sample `offset`."""
+        outliers = self.spike_outliers(col) if self.spike_cb.isChecked() and col in [
+            cb.text() for cb in self.filter_y_checkboxes if cb.isChecked()] else None
+        if outliers is not None:
+            mask, medians = outliers
+            if len(mask) == len(self.t):  # rows appended by live follow are picked up on the next table generation
+                window = slice(offset, offset + len(values))
+                values = np.where(mask[window], medians[window], values)
+        # Wrap the array slice without copying; pandas supplies the rolling kernels
+        data = pd.Series(values, copy=False)
         filter_type = self.filter_type.currentText()
         window = self.filter_window.value()
         if filter_type == self.filter_type.itemText(1) and col in [cb.text() for cb in self.filter_y_checkboxes if cb.isChecked()]:
             data = data.rolling(window=window, min_periods=1).mean()
         elif filter_type == self.filter_type.itemText(2) and col in [cb.text() for cb in self.filter_y_checkboxes if cb.isChecked()]:
             data = data.ewm(span=window, adjust=False).mean()
-        return data
+        return data.to_numpy()
+
+    def update_spike_report(self, plotted):
+        filtered = {cb.text() for cb in self.filter_y_checkboxes if cb.isChecked()}
+        columns = [col for col in plotted if col in filtered] if self.spike_cb.isChecked() else []
+        parts, pending = [], False
+        for col in columns:
+            outliers = self.spike_outliers(col)
+            if outliers is None:
+                pending = True
+                continue
+            mask, _medians = outliers
+            count = int(mask.sum())
+            share = 100.0 * count / len(mask) if len(mask) else 0.0
+            parts.append(f"{col}: {count:,} ({share:.2f}%)")
+        if pending:
+            self.spike_report.setText(L("plot.msg.outliers_pending", "Finding outliers..."))
+            return
+        self.spike_report.setText(L("plot.msg.outliers", "Outliers: {report}").format(report="; ".join(parts)) if parts else "")
 
     def update_plot(self):
         start_time = self.timeline[self.start_slider.value()]
         end_time = self.timeline[self.end_slider.value()]
-        filtered = self.df[(self.df[self.datetime_col] >= start_time) & (self.df[self.datetime_col] <= end_time)]
+        # Binary search on the sorted time axis; slices are views, not copies
+        i0 = np.searchsorted(self.t, np.datetime64(start_time), side="left")
+        i1 = np.searchsorted(self.t, np.datetime64(end_time), side="right")
+        t = self.t[i0:i1]
         
         self.ax_main.clear()
         
@@ -400,6 +555,7 @@ class PlotDialog(QDialog):
         self.ax_twin.tick_params(axis='y', labelcolor='none', color='none')
 
         checked_pairs = [(cb, col) for cb, col in zip(self.y_checkboxes, self.y_columns) if cb.isChecked()]
+        self.update_spike_report([col for _cb, col in checked_pairs])
         
         if not checked_pairs:
             self.canvas.draw()
@@ -410,11 +566,11 @@ class PlotDialog(QDialog):
         # --- PLOT 1 (Left Y-Axis) ---
         cb1, col1 = checked_pairs[0]
         if col1 in [cb.text() for cb in self.filter_y_checkboxes if cb.isChecked()]:
-            data1 = self.apply_filter(filtered[col1], col1)
+            data1 = self.apply_filter(self.data[col1][i0:i1], col1, i0)
         else:
-            data1 = filtered[col1]
+            data1 = self.data[col1][i0:i1]
         
-        line1 = self.ax_main.plot(filtered[self.datetime_col], data1, label=col1, color=colors[0])
+        line1 = self.ax_main.plot(t, data1, label=col1, color=colors[0])
         self.ax_main.set_ylabel(col1, color=colors[0], fontweight='bold')
         self.ax_main.tick_params(axis='y', labelcolor=colors[0])
 
@@ -425,11 +581,11 @@ class PlotDialog(QDialog):
         if len(checked_pairs) > 1:
             cb2, col2 = checked_pairs[1]
             if col2 in [cb.text() for cb in self.filter_y_checkboxes if cb.isChecked()]:
-                data2 = self.apply_filter(filtered[col2], col2)
+                data2 = self.apply_filter(self.data[col2][i0:i1], col2, i0)
             else:
-                data2 = filtered[col2]
+                data2 = self.data[col2][i0:i1]
             
-            line2 = self.ax_twin.plot(filtered[self.datetime_col], data2, label=col2, color=colors[1])
+            line2 = self.ax_twin.plot(t, data2, label=col2, color=colors[1])
             self.ax_twin.set_ylabel(col2, color=colors[1], fontweight='bold')
             # Restore the tick colors so they are visible again
             self.ax_twin.tick_params(axis='y', labelcolor=colors[1], color=colors[1]) 
@@ -463,4 +619,5 @@ class PlotDialog(QDialog):
         # This overrides dynamic resizing, preventing any horizontal shifts.
         self.fig.subplots_adjust(left=0.08, right=0.92, top=0.88, bottom=0.25)
         
-        self.canvas.draw()
\ No newline at end of file
+        with span("plot.canvas_draw", points=len(t) * len(labels)):
+            self.canvas.draw()
\ No newline at end of file
@@ -0,0 +1,129 @@
+# modules/quality.py
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView
+)
+from PySide6.QtCore import Qt
+from .utils import quote_ident
+from .i18n import L
+
+QUALITY_SAMPLE_ROWS = 10_000  # leading rows used to estimate the nominal sample interval
+GAP_FACTOR = 2.0              # a step longer than this many nominal intervals is a gap
+GAP_BINS = (1, 10, 60, 600)   # gap histogram edges [s]
+
+def build_quality_sql(table_name, ts_expr, columns):
+    """
+    Returns the file-order half of the data-quality summary of an imported table:
+    row and parse counts, out-of-order rows and the empty cells per channel. The
+    table is still in file order, so the previous row comes from a streaming lag()
+    and the whole summary costs no more than the scan checking the timestamps parse.
+    """
+    nulls = "".join(f", count(*) - count({quote_ident(c)})" for c in columns)
+    cols = "".join(f", {quote_ident(c)}" for c in columns)
+    return f"""
+        SELECT count(*), count(__ts), count(*) FILTER (__back){nulls}
+        FROM (
+            SELECT __ts < lag(__ts) OVER () AS __back, *
+            FROM (SELECT {ts_expr} AS __ts{cols} FROM {table_name})
+        )
+    """
+
+def build_gap_sql(table_name, ts_col):
+    """
+    Returns the time-order half of the summary (duplicates and gaps), taking the gap
+    threshold as its only parameter. It runs on the table as stored after the reformat,
+    already sorted by `ts_col`, so it reads one column and sorts nothing.
+    """
+    bins = " ".join(f"WHEN __dt < {edge} THEN {i}" for i, edge in enumerate(GAP_BINS))
+    return f"""
+        SELECT count(*) FILTER (__dt = 0), count(*) FILTER (__dt > $1), coalesce(max(__dt), 0),
+               histogram(CASE {bins} ELSE {len(GAP_BINS)} END) FILTER (__dt > $1)
+        FROM (SELECT epoch({ts_col}) - epoch(lag({ts_col}) OVER ()) AS __dt FROM {table_name})
+    """
+
+def build_interval_sql(table_name, ts_expr):
+    """Median step between the leading rows in file order: the nominal sample interval."""
+    return f"""
+        SELECT median(__dt) FROM (
+            SELECT epoch(__ts) - epoch(lag(__ts) OVER (ORDER BY __rid)) AS __dt
+            FROM (SELECT rowid AS __rid, {ts_expr} AS __ts FROM {table_name} LIMIT {QUALITY_SAMPLE_ROWS})
+        ) WHERE __dt > 0
+    """
+
+def parse_quality_row(row, gap_row, columns, nominal):
+    """Turns the result rows of build_quality_sql and build_gap_sql into the stored report fields."""
+    rows, stamped, out_of_order = row[:3]
+    duplicates, gaps, longest, histogram = gap_row or (0, 0, 0.0, None)
+    histogram = histogram or {}
+    return {
+        "rows": rows,
+        "unparsed_timestamps": rows - stamped,
+        "duplicate_timestamps": duplicates,
+        "out_of_order": out_of_order,
+        "nominal_interval_s": nominal,
+        "gaps": gaps,
+        "longest_gap_s": longest if gaps else 0.0,
+        "gap_histogram": [histogram.get(i, 0) for i in range(len(GAP_BINS) + 1)],
+        "null_counts": dict(zip(columns, row[3:])),
+    }
+
+def _count(value):
+    return "–" if value is None else value  # None: not known for this kind of import
+
+def gap_bin_labels():
+    edges = [f"{e} s" if e < 60 else f"{e // 60} min" for e in GAP_BINS]
+    return [f"< {edges[0]}"] + [f"{a} – {b}" for a, b in zip(edges, edges[1:])] + [f"> {edges[-1]}"]
+
+def has_issues(report):
+    keys = ("rejected_lines", "unparsed_timestamps", "duplicate_timestamps", "out_of_order", "gaps")
+    return any(report.get(k) for k in keys) or any(report.get("null_counts", {}).values())
+
+def summarise_quality(report):
+    """One status-bar line for a report."""
+    return L("quality.msg.summary", "{rows} rows, {rejected} rejected lines, {gaps} gaps, "
+             "{duplicates} duplicate and {out_of_order} out-of-order timestamps").format(
+        rows=f"{report.get('rows', 0):,}", rejected=_count(report.get("rejected_lines")), gaps=report.get("gaps", 0),
+        duplicates=report.get("duplicate_timestamps", 0), out_of_order=report.get("out_of_order", 0))
+
+# =======================================================
+# Quality Dialog
+# =======================================================
+class QualityDialog(QDialog):
+    """Shows the stored data-quality report of a table."""
+
+    def __init__(self, report, table_name, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(L("quality.title", "Data Quality: {table}").format(table=table_name))
+        self.resize(520, 560)
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(summarise_quality(report)))
+
+        nominal = report.get("nominal_interval_s")
+        rows = [
+            (L("quality.row.rows", "Rows"), f"{report.get('rows', 0):,}"),
+            (L("quality.row.rejected", "Rejected lines"), _count(report.get("rejected_lines"))),
+            (L("quality.row.merged", "Duplicate rows dropped when merging files"), report.get("merged_duplicates", 0)),
+            (L("quality.row.unparsed", "Unparsable timestamps"), report.get("unparsed_timestamps", 0)),
+            (L("quality.row.duplicates", "Duplicate timestamps"), report.get("duplicate_timestamps", 0)),
+            (L("quality.row.out_of_order", "Out-of-order rows"), report.get("out_of_order", 0)),
+            (L("quality.row.interval", "Nominal interval [s]"), "–" if nominal is None else f"{nominal:.6g}"),
+            (L("quality.row.gaps", "Gaps"), report.get("gaps", 0)),
+            (L("quality.row.longest_gap", "Longest gap [s]"), f"{report.get('longest_gap_s', 0):.6g}"),
+        ]
+        rows += [(L("quality.row.gap_bin", "Gaps {range}").format(range=label), n)
+                 for label, n in zip(gap_bin_labels(), report.get("gap_histogram", []))]
+        total = report.get("rows") or 0
+        rows += [(L("quality.row.nulls", "Empty in {column}").format(column=col),
+                  f"{n:,} ({100.0 * n / total:.2f} %)" if total else n)
+                 for col, n in report.get("null_counts", {}).items()]
+
+        table = QTableWidget(len(rows), 2)
+        table.setHorizontalHeaderLabels([L("quality.col.check", "Check"), L("quality.col.value", "Value")])
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        for i, (label, value) in enumerate(rows):
+            table.setItem(i, 0, QTableWidgetItem(label))
+            item = QTableWidgetItem(str(value))
+            item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            table.setItem(i, 1, item)
+        layout.addWidget(table)
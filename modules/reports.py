@@ -0,0 +1,212 @@
+# modules/reports.py
+import os
+import re
+import time
+from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from .outliers import hampel, clean
+
+REPORT_POINTS = 4000       # min/max pairs per line; beyond this Agg only draws overlapping pixels
+REPORT_TABLE = "report"    # table a CSV source is imported into, in the worker's in-memory database
+PAGE_SIZE = (11.69, 8.27)  # A4 landscape [in]
+DPI = 150
+
+DEFAULT_TEMPLATE = {
+    "title": "AMS measurement report",
+    "format": "pdf",
+    "charts": [
+        {"title": "Pressure and flow, full run", "channels": ["Pressure Base [kPa]"], "secondary": ["Flow Base [Nl/min]"]},
+        {"title": "First 10 minutes", "channels": ["Pressure Base [kPa]"], "window": {"start_s": 0, "end_s": 600},
+         "filter": {"spike": {"half_window": 10, "threshold": 3.5}, "smooth": {"kind": "mean", "window": 10}}},
+        {"title": "Flow above 150 Nl/min", "channels": ["Flow Base [Nl/min]"],
+         "events": {"channel": "Flow Base [Nl/min]", "op": ">", "threshold": 150, "min_duration": 1.0,
+                    "limit": 3, "margin_s": 30}},
+    ],
+    "stats": {"channels": ["Pressure Base [kPa]", "Flow Base [Nl/min]"]},
+}
+
+def decimate_minmax(t, values, points=REPORT_POINTS):
+    """
+    Keeps the minimum and maximum of each of `points` equal slices, in time order,
+    so spikes survive decimation. Short series are returned unchanged.
+    """
+    n = len(values)
+    if n <= 2 * points:
+        return t, values
+    step = n // points
+    usable = step * points
+    blocks = values[:usable].reshape(points, step)
+    filled = np.where(np.isnan(blocks), np.nanmean(values) if np.isfinite(values).any() else 0.0, blocks)
+    lo, hi = filled.argmin(axis=1), filled.argmax(axis=1)
+    base = np.arange(points) * step
+    idx = np.sort(np.concatenate([base + lo, base + hi]))
+    return t[idx], values[idx]
+
+def apply_report_filter(values, spec):
+    """Spike removal and smoothing as offered by PlotDialog, driven by a template `filter` entry."""
+    if not spec:
+        return values
+    if spec.get("spike"):
+        mask, medians = hampel(values, spec["spike"].get("half_window", 10), spec["spike"].get("threshold", 3.5))
+        values = clean(values, mask, medians)
+    smooth = spec.get("smooth")
+    if smooth:
+        series = pd.Series(values, copy=False)
+        window = int(smooth.get("window", 10))
+        if smooth.get("kind", "mean") == "ewm":
+            values = series.ewm(span=window, adjust=False).mean().to_numpy()
+        else:
+            values = series.rolling(window=window, min_periods=1).mean().to_numpy()
+    return values
+
+def _windows(db, table, chart, first):
+    """(title, start, end) of every page a chart produces."""
+    title = chart.get("title", ", ".join(chart["channels"]))
+    events = chart.get("events")
+    if events:
+        margin = timedelta(seconds=events.get("margin_s", 30))
+        found = db.find_events(table, events["channel"], events.get("op", ">"), events["threshold"],
+                               events.get("min_duration", 0.0), limit=events.get("limit", 3))
+        return [(f"{title} #{i + 1} ({ev['start']:%d/%m/%Y %H:%M:%S})", ev["start"] - margin, ev["end"] + margin)
+                for i, ev in enumerate(found)]
+    window = chart.get("window") or {}
+    start = pd.Timestamp(window["start"]).to_pydatetime() if "start" in window else \
+        first + timedelta(seconds=window["start_s"]) if "start_s" in window else None
+    end = pd.Timestamp(window["end"]).to_pydatetime() if "end" in window else \
+        first + timedelta(seconds=window["end_s"]) if "end_s" in window else None
+    return [(title, start, end)]
+
+def _chart_page(db, table, chart, title, start, end, heading):
+    # Figure + Agg canvas, never pyplot: no GUI backend is touched in the worker
+    fig = Figure(figsize=PAGE_SIZE)
+    FigureCanvasAgg(fig)
+    fig.suptitle(f"{heading}\n{title}", fontsize=11)
+    ax = fig.add_subplot(111)
+    available = set(db.numeric_columns(table))
+    primary = [c for c in chart["channels"] if c in available]
+    secondary = [c for c in chart.get("secondary", []) if c in available]
+    t, data = db.fetch_numpy(table, primary + secondary, start, end, dtype="float64")
+    if len(t) == 0:
+        ax.text(0.5, 0.5, "No samples in this window", ha="center", va="center", transform=ax.transAxes)
+        return fig
+    twin = ax.twinx() if secondary else None
+    lines = []
+    for i, col in enumerate(primary + secondary):
+        target = ax if col in primary else twin
+        tt, values = decimate_minmax(t, apply_report_filter(data[col], chart.get("filter")))
+        lines += target.plot(tt, values, label=col, color=f"C{i}", linewidth=0.8)
+    ax.set_ylabel(", ".join(primary))
+    if twin is not None:
+        twin.set_ylabel(", ".join(secondary))
+    ax.legend(lines, [line.get_label() for line in lines], loc="upper right", fontsize="small")
+    ax.grid(True)
+    fig.autofmt_xdate()
+    return fig
+
+def _stats_page(db, table, spec, heading):
+    fig = Figure(figsize=PAGE_SIZE)
+    FigureCanvasAgg(fig)
+    fig.suptitle(f"{heading}\nStatistics", fontsize=11)
+    ax = fig.add_subplot(111)
+    ax.axis("off")
+    available = db.numeric_columns(table)
+    columns = [c for c in spec.get("channels", available) if c in available]
+    stats = db.column_stats(table, columns)
+    header = ["Channel", "Count", "Min", "Max", "Mean", "Std"]
+    pct_keys = list(next(iter(stats.values()))["percentiles"]) if stats else []
+    header += [f"P{int(p * 100)}" for p in pct_keys] + ["Air consumption [Nl]"]
+    def fmt(v):
+        return "–" if v is None else f"{v:.6g}" if isinstance(v, float) else str(v)
+    rows = [[col] + [fmt(s[k]) for k in ("count", "min", "max", "mean", "std")]
+            + [fmt(s["percentiles"][p]) for p in pct_keys] + [fmt(s.get("consumption"))] for col, s in stats.items()]
+    if rows:
+        table_artist = ax.table(cellText=rows, colLabels=header, loc="upper center")
+        table_artist.auto_set_font_size(False)
+        table_artist.set_fontsize(8)
+        table_artist.auto_set_column_width(list(range(len(header))))
+        table_artist.scale(1, 1.5)
+    return fig
+
+def report_name(source):
+    base = os.path.basename(source)
+    for ext in (".gz", ".zst", ".csv", ".zip", ".parquet", ".arrow", ".feather"):
+        if base.lower().endswith(ext):
+            base = base[: -len(ext)]
+    return re.sub(r"[^\w.-]+", "_", base)
+
+def render_report(source, template, out_dir, database=None, share=1):
+    """
+    Renders one report and returns (source, [written paths], seconds). `source` is a
+    table of `database` (opened read-only) or a log file, imported into an
+    in-memory database first. Runs in a pool worker, so everything it needs is
+    passed in and the result is plain data.
+    """
+    from .core import DuckDBManager  # pulls in Qt, which only the workers need
+    started = time.perf_counter()
+    if os.path.isfile(source):
+        db = DuckDBManager(share=share)
+        db.import_file(source, REPORT_TABLE)
+        db.reformat_datetime_full_table(REPORT_TABLE)
+        table = REPORT_TABLE
+    else:
+        db = DuckDBManager(database, read_only=True, share=share)
+        table = source
+    try:
+        if not db.datetime_column(table):
+            raise ValueError(f"{source}: no timestamp column")
+        first, last = db.time_span(table)
+        heading = f"{template.get('title', 'Report')}: {os.path.basename(source)}  ({first:%d/%m/%Y %H:%M} – {last:%d/%m/%Y %H:%M})"
+        figures = []
+        for chart in template.get("charts", []):
+            for title, start, end in _windows(db, table, chart, first):
+                figures.append(_chart_page(db, table, chart, title, start, end, heading))
+        if template.get("stats"):
+            figures.append(_stats_page(db, table, template["stats"], heading))
+
+        os.makedirs(out_dir, exist_ok=True)
+        name = report_name(source)
+        written = []
+        if template.get("format", "pdf") == "pdf":
+            path = os.path.join(out_dir, f"{name}.pdf")
+            with PdfPages(path) as pdf:
+                for fig in figures:
+                    pdf.savefig(fig)
+            written.append(path)
+        else:
+            for i, fig in enumerate(figures, 1):
+                path = os.path.join(out_dir, f"{name}_{i:02d}.png")
+                fig.savefig(path, dpi=DPI)
+                written.append(path)
+        return source, written, time.perf_counter() - started
+    finally:
+        db.close()
+
+def run_batch(sources, template, out_dir, database=None, workers=None, on_done=None):
+    """
+    Renders a report per source across a process pool. Calls on_done(source, paths, seconds, error)
+    as each finishes and returns {source: paths or the error message}.
+    """
+    workers = max(1, min(workers or (os.cpu_count() or 2), len(sources)))
+    results = {}
+    # spawn, as on Windows: workers start clean instead of inheriting Qt/DuckDB state
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {pool.submit(render_report, src, template, out_dir, database, workers): src for src in sources}
+        for future in as_completed(futures):
+            src = futures[future]
+            try:
+                _src, paths, seconds = future.result()
+                results[src] = paths
+                if on_done:
+                    on_done(src, paths, seconds, None)
+            except Exception as e:
+                results[src] = str(e)
+                if on_done:
+                    on_done(src, [], 0.0, str(e))
+    return results
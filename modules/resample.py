@@ -0,0 +1,169 @@
+# modules/resample.py
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QGridLayout, QLabel, QComboBox, QLineEdit, QTableWidget,
+    QHeaderView, QDialogButtonBox, QMessageBox
+)
+from .utils import quote_ident
+from .i18n import L
+
+# label -> bucket width in milliseconds
+RESAMPLE_INTERVALS = {
+    "10 ms": 10, "100 ms": 100, "1 s": 1_000, "10 s": 10_000,
+    "1 min": 60_000, "15 min": 900_000, "1 h": 3_600_000,
+}
+# aggregate -> SQL over one bucket; "first"/"last" take the earliest/latest sample
+RESAMPLE_AGGREGATES = {
+    "mean": "avg({c})", "min": "min({c})", "max": "max({c})", "median": "median({c})",
+    "first": "arg_min({c}, __ts)", "last": "arg_max({c}, __ts)", "sum": "sum({c})", "count": "count({c})",
+}
+FILL_METHODS = ("null", "ffill", "interpolate")
+
+def build_resample_sql(table_name, ts_expr, interval_ms, aggregates, fill, time_col, where=""):
+    """
+    Returns one SELECT that buckets `table_name` onto a fixed `interval_ms` grid.
+    `aggregates` maps column -> RESAMPLE_AGGREGATES key. Buckets without samples
+    stay NULL, carry the previous value forward (ffill) or are linearly
+    interpolated between their neighbours; gaps at the edges stay NULL.
+    The grouping is a single parallel hash aggregate; gap filling only runs
+    window functions over the (much smaller) bucket grid.
+    """
+    if fill not in FILL_METHODS:
+        raise ValueError(f"Unsupported fill method: {fill}")
+    if not aggregates:
+        raise ValueError("Select at least one column to resample")
+    cols = list(aggregates)
+    width = f"to_milliseconds({int(interval_ms)})"
+    src = ", ".join(quote_ident(c) for c in cols)
+    agg = ", ".join(
+        RESAMPLE_AGGREGATES[aggregates[c]].format(c=quote_ident(c)) + f" AS __v{i}" for i, c in enumerate(cols))
+    cond = f"WHERE {ts_expr} IS NOT NULL" + (f" AND {where}" if where else "")
+
+    if fill == "null":
+        values = [f"__v{i}" for i in range(len(cols))]
+    elif fill == "ffill":
+        values = [f"last_value(__v{i} IGNORE NULLS) OVER __before" for i in range(len(cols))]
+    else:
+        values = [
+            f"coalesce(__v{i}, last_value(__v{i} IGNORE NULLS) OVER __before"
+            f" + (first_value(__v{i} IGNORE NULLS) OVER __after - last_value(__v{i} IGNORE NULLS) OVER __before)"
+            f" * (epoch(__b) - epoch(last_value(CASE WHEN __v{i} IS NOT NULL THEN __b END IGNORE NULLS) OVER __before))"
+            f" / nullif(epoch(first_value(CASE WHEN __v{i} IS NOT NULL THEN __b END IGNORE NULLS) OVER __after)"
+            f" - epoch(last_value(CASE WHEN __v{i} IS NOT NULL THEN __b END IGNORE NULLS) OVER __before), 0))"
+            for i in range(len(cols))
+        ]
+    select = ", ".join(f"{v} AS {quote_ident(c)}" for v, c in zip(values, cols))
+    window = "" if fill == "null" else """
+        WINDOW __before AS (ORDER BY __b ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW),
+               __after AS (ORDER BY __b ROWS BETWEEN CURRENT ROW AND UNBOUNDED FOLLOWING)"""
+    return f"""
+        WITH __src AS (SELECT {ts_expr} AS __ts, {src} FROM {table_name} {cond}),
+        __agg AS (SELECT time_bucket({width}, __ts) AS __b, {agg} FROM __src GROUP BY 1),
+        __grid AS (SELECT unnest(generate_series(min(__b), max(__b), {width})) AS __b FROM __agg)
+        SELECT __b AS {quote_ident(time_col)}, {select}
+        FROM __grid LEFT JOIN __agg USING (__b)
+        {window}
+        ORDER BY __b
+    """
+
+# =======================================================
+# Resample Dialog
+# =======================================================
+class ResampleDialog(QDialog):
+    """Chooses grid, per-channel aggregates, gap filling and where the result goes."""
+
+    def __init__(self, db_manager, table_name, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(L("resample.title", "Resample"))
+        self.resize(520, 520)
+        layout = QVBoxLayout(self)
+
+        form = QGridLayout()
+        form.addWidget(QLabel(L("resample.label.interval", "Interval:")), 0, 0)
+        self.interval_combo = QComboBox()
+        for label, ms in RESAMPLE_INTERVALS.items():
+            self.interval_combo.addItem(label, ms)
+        self.interval_combo.setCurrentText("1 s")
+        form.addWidget(self.interval_combo, 0, 1)
+
+        form.addWidget(QLabel(L("resample.label.fill", "Gaps:")), 1, 0)
+        self.fill_combo = QComboBox()
+        self.fill_combo.addItem(L("resample.fill.null", "Leave empty"), "null")
+        self.fill_combo.addItem(L("resample.fill.ffill", "Forward fill"), "ffill")
+        self.fill_combo.addItem(L("resample.fill.interpolate", "Interpolate"), "interpolate")
+        form.addWidget(self.fill_combo, 1, 1)
+
+        form.addWidget(QLabel(L("resample.label.target", "Output:")), 2, 0)
+        self.target_combo = QComboBox()
+        self.target_combo.addItem(L("resample.target.table", "New table"), "table")
+        self.target_combo.addItem(L("resample.target.plot", "Plot"), "plot")
+        self.target_combo.addItem(L("resample.target.export", "Export file"), "export")
+        self.target_combo.currentIndexChanged.connect(self.on_target_changed)
+        form.addWidget(self.target_combo, 2, 1)
+
+        self.name_label = QLabel(L("resample.label.table_name", "Table name:"))
+        form.addWidget(self.name_label, 3, 0)
+        self.name_input = QLineEdit(f"{table_name}_resampled")
+        form.addWidget(self.name_input, 3, 1)
+
+        self.format_label = QLabel(L("export.label.format", "Format:"))
+        form.addWidget(self.format_label, 4, 0)
+        self.format_combo = QComboBox()
+        self.format_combo.addItem(L("export.fmt.csv", "CSV"), "csv")
+        self.format_combo.addItem(L("export.fmt.csv_gz", "CSV, gzip compressed"), "csv.gz")
+        self.format_combo.addItem(L("export.fmt.parquet", "Parquet (zstd)"), "parquet")
+        self.format_combo.addItem(L("export.fmt.arrow", "Arrow IPC"), "arrow")
+        form.addWidget(self.format_combo, 4, 1)
+        layout.addLayout(form)
+
+        layout.addWidget(QLabel(L("resample.label.aggregates", "Aggregate per channel:")))
+        self.columns = db_manager.numeric_columns(table_name)
+        self.agg_table = QTableWidget(len(self.columns), 2)
+        self.agg_table.setHorizontalHeaderLabels([
+            L("resample.col.channel", "Channel"), L("resample.col.aggregate", "Aggregate")])
+        self.agg_table.verticalHeader().setVisible(False)
+        self.agg_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.agg_combos = []
+        for row, col in enumerate(self.columns):
+            self.agg_table.setCellWidget(row, 0, QLabel(col))
+            combo = QComboBox()
+            combo.addItem(L("resample.agg.skip", "(skip)"), None)
+            for agg in RESAMPLE_AGGREGATES:
+                combo.addItem(L(f"resample.agg.{agg}", agg), agg)
+            combo.setCurrentIndex(combo.findData("mean"))
+            self.agg_table.setCellWidget(row, 1, combo)
+            self.agg_combos.append(combo)
+        layout.addWidget(self.agg_table)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.on_target_changed()
+
+    def on_target_changed(self):
+        target = self.target_combo.currentData()
+        self.name_label.setVisible(target == "table")
+        self.name_input.setVisible(target == "table")
+        self.format_label.setVisible(target == "export")
+        self.format_combo.setVisible(target == "export")
+
+    def accept(self):
+        options = self.options()
+        if not options["aggregates"]:
+            QMessageBox.warning(self, "Warning", L("resample.error.no_columns", "Select an aggregate for at least one channel"))
+            return
+        if options["target"] == "table" and not options["table_name"]:
+            QMessageBox.warning(self, "Warning", L("resample.error.no_name", "Enter a name for the new table"))
+            return
+        super().accept()
+
+    def options(self):
+        return {
+            "interval_ms": self.interval_combo.currentData(),
+            "aggregates": {col: combo.currentData() for col, combo in zip(self.columns, self.agg_combos)
+                           if combo.currentData()},
+            "fill": self.fill_combo.currentData(),
+            "target": self.target_combo.currentData(),
+            "table_name": self.name_input.text().strip(),
+            "fmt": self.format_combo.currentData(),
+        }
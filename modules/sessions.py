@@ -0,0 +1,146 @@
+# modules/sessions.py
+import os
+import glob
+import time
+import uuid
+import shutil
+import duckdb
+from .utils import get_app_data_path
+
+CACHE_FILE = "local.duckdb"  # shared cache of imported tables, listed as recent sessions
+SESSION_DIR = "sessions"     # one database file per running instance
+SPILL_DIR = "spill"          # DuckDB temp files and unpacked zip members, one folder per database instance
+LOCK_RETRIES = 40
+LOCK_RETRY_S = 0.25          # another instance holds the cache while publishing to it or borrowing from it
+
+def cache_path():
+    return os.path.join(get_app_data_path(), CACHE_FILE)
+
+def session_dir():
+    path = os.path.join(get_app_data_path(), SESSION_DIR)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def is_session_file(path):
+    return bool(path) and os.path.dirname(os.path.abspath(path)) == os.path.abspath(session_dir())
+
+def spill_dir(path=None):
+    """
+    Spill folder of one database instance. A session spills into a folder named after
+    its file, so running instances never share one and an orphan's folder is found again;
+    any other database gets a folder of its own for this process.
+    """
+    if is_session_file(path):
+        name = os.path.splitext(os.path.basename(path))[0]
+    else:
+        name = f"process-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    return os.path.join(get_app_data_path(), SPILL_DIR, name)
+
+def remove_spill(path):
+    shutil.rmtree(path, ignore_errors=True)
+
+def retry_locked(fn, *args, **kwargs):
+    """Calls fn, waiting while another instance holds the shared cache (or a session file) locked."""
+    for attempt in range(LOCK_RETRIES):
+        try:
+            return fn(*args, **kwargs)
+        except duckdb.IOException as e:
+            if "lock" not in str(e).lower() or attempt == LOCK_RETRIES - 1:
+                raise
+            time.sleep(LOCK_RETRY_S)
+
+def cached_sessions():
+    """Catalog of the shared cache, read without locking out other instances; [] when unavailable."""
+    from .core import DuckDBManager
+    if not os.path.isfile(cache_path()):
+        return []
+    try:
+        cache = retry_locked(DuckDBManager, cache_path(), read_only=True)
+    except duckdb.Error as e:
+        print(f"[Sessions] cache unavailable: {e}")
+        return []
+    try:
+        return cache.catalog()
+    except duckdb.CatalogException:
+        return []  # a cache predating the catalog
+    finally:
+        cache.close()
+
+def other_sessions(path):
+    """Whether session files besides `path` exist: running or orphaned, their stores are not in the cache yet."""
+    own = os.path.abspath(path)
+    return any(os.path.abspath(p) != own for p in glob.glob(os.path.join(session_dir(), "*.duckdb")))
+
+def publish(path, tables=None, dropped=(), progress_callback=None):
+    """
+    Copies a closed session file into the shared cache, evicts what no longer fits
+    there (the last session out also sweeps channel stores nothing refers to) and
+    deletes the session file with its spill folder. On failure the file is kept, to
+    be published by the next instance that starts.
+    """
+    from .core import DuckDBManager
+    cache = retry_locked(DuckDBManager, cache_path())
+    try:
+        if os.path.isfile(path):  # another starting instance may have published it already
+            cache.adopt_session(path, tables, dropped, progress_callback=progress_callback)
+        cache.maintain(sweep=not other_sessions(path))
+    finally:
+        cache.close()
+    for leftover in (path, path + ".wal"):
+        if os.path.exists(leftover):
+            os.remove(leftover)
+    remove_spill(spill_dir(path))
+
+def rescue_orphans():
+    """
+    Publishes session files left behind by instances that did not close cleanly;
+    a file still locked belongs to a running instance. Returns how many are running.
+    """
+    running = 0
+    own = f"session-{os.getpid()}-"
+    for path in glob.glob(os.path.join(session_dir(), "*.duckdb")):
+        if os.path.basename(path).startswith(own):
+            continue  # this process holds no lock against itself
+        try:
+            duckdb.connect(path).close()
+        except duckdb.IOException:
+            running += 1
+            continue
+        try:
+            publish(path)
+        except duckdb.Error as e:
+            print(f"[Sessions] could not publish {path}: {e}")
+    return running
+
+def open_session(**kwargs):
+    """
+    Opens a private database for this instance, so several instances import and
+    plot side by side without contending for one file lock. Resources are split
+    with the instances already running.
+    """
+    from .core import DuckDBManager
+    running = rescue_orphans()
+    # The id names the spill folder too, so it must differ even between two opened in the same second
+    path = os.path.join(session_dir(), f"session-{os.getpid()}-{int(time.time())}-{uuid.uuid4().hex[:8]}.duckdb")
+    return DuckDBManager(path, share=running + 1, **kwargs)
+
+def needs_publish(db):
+    """True when closing the session copies tables into the shared cache (worth a progress bar)."""
+    return is_session_file(db.path) and bool(db.modified or db.dropped)
+
+def close_session(db, progress_callback=None):
+    """
+    Closes a session database (which removes its spill folder) and publishes the tables
+    written in it to the shared cache. Tables only read from the cache are not copied back.
+    """
+    if not is_session_file(db.path):
+        db.close()
+        return
+    db.maintain(evict=False)  # persists access times and refreshes the catalog rows copied along
+    tables, dropped = sorted(db.modified), sorted(db.dropped)
+    path = db.path
+    db.close()
+    try:
+        publish(path, tables, dropped, progress_callback)
+    except duckdb.Error as e:
+        print(f"[Sessions] could not publish {path}, retried at next start: {e}")
@@ -0,0 +1,114 @@
+# modules/stats_panel.py
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView, QLabel, QDialog
+)
+from PySide6.QtCore import Qt, QTimer
+from .workers import WorkerThread, keep_alive
+from .i18n import L
+
+REFRESH_DELAY_MS = 250  # debounce while the sliders are being dragged
+
+class StatsPanel(QWidget):
+    """Table of per-channel statistics, refreshed asynchronously from DuckDB."""
+
+    def __init__(self, db_manager, table_name, parent=None):
+        super().__init__(parent)
+        self.db = db_manager
+        self.table_name = table_name
+        self._pending = None   # (columns, start, end) of the latest request
+        self._worker = None
+        self._seq = 0
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.table = QTableWidget(0, 0)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        layout.addWidget(self.table)
+        self.status = QLabel("")
+        self.status.setStyleSheet("color: gray; font-style: italic;")
+        layout.addWidget(self.status)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(REFRESH_DELAY_MS)
+        self._timer.timeout.connect(self._start_query)
+
+    def request(self, columns, start=None, end=None):
+        """Schedules a refresh; a cached result is shown immediately."""
+        self._pending = (list(columns), start, end)
+        self._seq += 1
+        cached = self.db.lookup_stats(self.table_name, columns, start, end)
+        if cached is not None:
+            self._timer.stop()
+            self._show(cached)
+            return
+        self.status.setText(L("stats.msg.computing", "Computing statistics..."))
+        self._timer.start()
+
+    def _start_query(self):
+        if self._worker is not None:
+            return  # picked up again when the running query finishes
+        columns, start, end = self._pending
+        seq = self._seq
+        worker = WorkerThread(self.db.column_stats, self.table_name, columns, start, end)
+        self._worker = worker
+        keep_alive(worker)
+        worker.finished.connect(lambda stats: self._on_done(stats, seq))
+        worker.error.connect(self._on_error)
+        worker.start()
+
+    def _on_done(self, stats, seq):
+        self._worker = None
+        if seq != self._seq:
+            self._start_query()  # the range moved while we were computing
+            return
+        self._show(stats)
+
+    def _on_error(self, msg):
+        self._worker = None
+        self.status.setText(msg)
+
+    def _show(self, stats):
+        headers = [
+            L("stats.col.count", "Count"), L("stats.col.min", "Min"), L("stats.col.max", "Max"),
+            L("stats.col.mean", "Mean"), L("stats.col.std", "Std"),
+        ]
+        pct_keys = list(next(iter(stats.values()))["percentiles"]) if stats else []
+        headers += [f"P{int(p * 100)}" for p in pct_keys]
+        headers.append(L("stats.col.consumption", "Air consumption [Nl]"))
+
+        self.table.setRowCount(len(stats))
+        self.table.setColumnCount(len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.setVerticalHeaderLabels(list(stats.keys()))
+        for row, s in enumerate(stats.values()):
+            values = [s["count"], s["min"], s["max"], s["mean"], s["std"]]
+            values += [s["percentiles"][p] for p in pct_keys]
+            values.append(s.get("consumption"))
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(self._fmt(value))
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, col, item)
+        self.table.resizeColumnsToContents()
+        self.status.setText("")
+
+    @staticmethod
+    def _fmt(value):
+        if value is None:
+            return "–"
+        if isinstance(value, float):
+            return f"{value:.6g}"
+        return str(value)
+
+class StatsDialog(QDialog):
+    """Whole-table statistics for every numeric channel."""
+
+    def __init__(self, db_manager, table_name, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(L("stats.title", "Statistics"))
+        self.resize(900, 300)
+        layout = QVBoxLayout(self)
+        self.panel = StatsPanel(db_manager, table_name, self)
+        layout.addWidget(self.panel)
+        self.panel.request(db_manager.numeric_columns(table_name))
@@ -0,0 +1,135 @@
+# modules/tracing.py
+import os
+import json
+import time
+import threading
+import functools
+from collections import deque
+from .utils import process_memory_bytes
+
+MAX_EVENTS = 100_000  # oldest spans are dropped beyond this
+
+_enabled = os.environ.get("AMS_TRACE", "") not in ("", "0")
+_events = deque(maxlen=MAX_EVENTS)
+_thread_names = {}
+_origin_ns = time.perf_counter_ns()
+
+def enable(on=True):
+    global _enabled
+    _enabled = bool(on)
+
+def is_enabled():
+    return _enabled
+
+def clear():
+    _events.clear()
+
+def events():
+    """Snapshot of the recorded spans, oldest first."""
+    return list(_events)
+
+# =======================================================
+# Spans
+# =======================================================
+class _NullSpan:
+    """Returned while tracing is off, so an instrumented block costs one flag check."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ("name", "args", "t0", "mem0")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def set(self, **args):
+        """Attaches values such as row counts, known only once the work is done."""
+        self.args.update(args)
+
+    def __enter__(self):
+        self.mem0 = process_memory_bytes()
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        t1 = time.perf_counter_ns()
+        mem1 = process_memory_bytes()
+        if self.mem0 is not None and mem1 is not None:
+            self.args["mem_delta"] = mem1 - self.mem0
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        thread = threading.current_thread()
+        if thread.ident not in _thread_names:
+            # QThreads show up as "Dummy-N" in threading; label them as workers instead
+            _thread_names[thread.ident] = "Worker" if thread.name.startswith("Dummy") else thread.name
+        # deque.append is atomic, so worker threads need no lock here
+        _events.append({
+            "name": self.name,
+            "tid": thread.ident,
+            "start_us": (self.t0 - _origin_ns) / 1000,
+            "dur_us": (t1 - self.t0) / 1000,
+            "args": self.args,
+        })
+        return False
+
+def span(name, **args):
+    """
+    Times a block: `with span("get_page", rows=n) as s: ...; s.set(rows=len(df))`.
+    Records duration, the process memory delta and any attached args.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+def traced(name=None):
+    """Decorator form of span() for whole functions and methods."""
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(label, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+# =======================================================
+# Reporting
+# =======================================================
+def summary():
+    """Per-span-name totals: [(name, calls, total_ms, mean_ms, max_ms, rows, mem_delta), ...] slowest first."""
+    totals = {}
+    for ev in events():
+        row = totals.setdefault(ev["name"], [0, 0.0, 0.0, 0, 0])
+        row[0] += 1
+        row[1] += ev["dur_us"] / 1000
+        row[2] = max(row[2], ev["dur_us"] / 1000)
+        row[3] += ev["args"].get("rows", 0) or 0
+        row[4] += ev["args"].get("mem_delta", 0) or 0
+    result = [(name, n, total, total / n, peak, rows, mem) for name, (n, total, peak, rows, mem) in totals.items()]
+    return sorted(result, key=lambda r: r[2], reverse=True)
+
+def export_chrome_trace(path):
+    """Writes the spans as Chrome trace JSON (chrome://tracing, Perfetto)."""
+    pid = os.getpid()
+    trace = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": tname}}
+             for tid, tname in _thread_names.items()]
+    for ev in events():
+        trace.append({"name": ev["name"], "cat": "ams", "ph": "X", "pid": pid, "tid": ev["tid"],
+                      "ts": ev["start_us"], "dur": ev["dur_us"], "args": ev["args"]})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f, default=str)
+    return len(trace)
@@ -1,5 +1,8 @@
 import os
 import sys
+import zipfile
+
+CSV_BLOCK_BYTES = 32 * 1024 * 1024  # CSV text handed to DuckDB at once when streaming a zip member
 
 def get_app_data_path():
     """Returns the path to the SMC/AMSDataTool folder in User AppData."""
@@ -11,4 +14,90 @@ def get_app_data_path():
     path = os.path.join(base, 'SMC', 'AMSDataTool')
     if not os.path.exists(path):
         os.makedirs(path, exist_ok=True)
-    return path
\ No newline at end of file
+    return path
+
+def physical_memory_bytes():
+    """Returns the installed RAM in bytes, or None when the platform does not report it."""
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                            ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                            ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                            ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                            ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+            status = MEMORYSTATUSEX()
+            status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+            ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+            return status.ullTotalPhys
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, OSError, ValueError):
+        return None
+
+def process_memory_bytes():
+    """Current resident memory of this process in bytes, or None when unavailable."""
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(PROCESS_MEMORY_COUNTERS)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb)
+            return counters.WorkingSetSize
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, OSError, ValueError):
+        return None
+
+def format_bytes(n):
+    """Human readable byte count, e.g. 1.5 GB."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} TB"
+
+def quote_ident(name):
+    """Quotes a column/table name for SQL (AMS headers contain spaces and brackets)."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+def quote_literal(text):
+    """Quotes a string (typically a file path) as an SQL literal."""
+    return "'" + str(text).replace("'", "''") + "'"
+
+def iter_zip_csv(zip_path):
+    """
+    Yields (member_name, binary file object) for every CSV inside a zip archive;
+    each member is decompressed as it is read, without extracting it to disk.
+    """
+    with zipfile.ZipFile(zip_path) as zf:
+        for member in zf.namelist():
+            if not member.lower().endswith(".csv") or member.startswith("__MACOSX/"):
+                continue
+            with zf.open(member) as fh:
+                yield member, fh
+
+def iter_csv_blocks(fh, has_header=True, block_bytes=None):
+    """
+    Yields a binary CSV stream as blocks of whole lines, each starting with the
+    header line, so every block parses as a CSV file of its own. Fields must not
+    span lines, which holds for AMS logs.
+    """
+    header = fh.readline() if has_header else b""
+    while True:
+        block = fh.read(block_bytes or CSV_BLOCK_BYTES)
+        if not block:
+            return
+        yield header + block + fh.readline()
@@ -0,0 +1,34 @@
+# modules/workers.py
+from PySide6 import QtCore
+from PySide6.QtCore import Signal
+
+_running = set()  # workers whose owning widget may be closed mid-task
+
+def keep_alive(worker):
+    """Holds a reference to `worker` until it finishes, so closing its owner can't destroy a running QThread."""
+    _running.add(worker)
+    worker.finished.connect(lambda _: _running.discard(worker))
+    worker.error.connect(lambda _: _running.discard(worker))
+    return worker
+
+# =======================================================
+# Worker Thread
+# =======================================================
+class WorkerThread(QtCore.QThread):
+    progress = Signal(int)
+    finished = Signal(object)
+    error = Signal(str)
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn, self.args, self.kwargs = fn, args, kwargs
+
+    def run(self):
+        try:
+            def cb(p): self.progress.emit(int(p))
+            if "progress_callback" in self.kwargs:
+                self.kwargs["progress_callback"] = cb
+            result = self.fn(*self.args, **self.kwargs)
+            self.finished.emit(result)
+        except Exception as e:
+            self.error.emit(str(e))
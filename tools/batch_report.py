@@ -0,0 +1,83 @@
+"""
+Renders the same report for many imported tables or log files, without the GUI.
+
+    python tools/batch_report.py --template visit.json --all-tables --out reports/
+    python tools/batch_report.py --template visit.json --csv "logs/*.csv" --workers 8
+    python tools/batch_report.py --write-template visit.json
+
+A template names the charts (channels, optional secondary axis, time window,
+spike/smoothing filter, or an event search whose hits get one zoomed page each)
+and the statistics table. Each report is rendered by its own process of a pool,
+with DuckDB threads and memory split between the processes.
+"""
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import duckdb
+from modules.reports import DEFAULT_TEMPLATE, run_batch
+from modules.sessions import cache_path
+
+def list_tables(database):
+    """Catalogued tables of a database, opened read-only so other report processes can too."""
+    conn = duckdb.connect(database, read_only=True)
+    try:
+        return [r[0] for r in conn.execute("SELECT table_name FROM _ams_catalog ORDER BY table_name").fetchall()]
+    finally:
+        conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Render AMS reports headlessly.")
+    parser.add_argument("--template", help="JSON report template (see --write-template)")
+    parser.add_argument("--write-template", metavar="PATH", help="write the default template and exit")
+    parser.add_argument("--database", default=cache_path(), help="default: the tool's shared cache of imported tables")
+    parser.add_argument("--tables", nargs="*", default=[], help="imported tables to report on")
+    parser.add_argument("--all-tables", action="store_true", help="report on every catalogued table")
+    parser.add_argument("--csv", nargs="*", default=[], help="log files or glob patterns, imported per report")
+    parser.add_argument("--out", default="reports")
+    parser.add_argument("--format", choices=("pdf", "png"), help="overrides the template's format")
+    parser.add_argument("--workers", type=int, default=None, help="processes, default: one per CPU")
+    args = parser.parse_args()
+
+    if args.write_template:
+        with open(args.write_template, "w", encoding="utf-8") as f:
+            json.dump(DEFAULT_TEMPLATE, f, indent=2, ensure_ascii=False)
+        print(f"Template written to {args.write_template}")
+        return
+
+    template = DEFAULT_TEMPLATE
+    if args.template:
+        with open(args.template, encoding="utf-8") as f:
+            template = json.load(f)
+    if args.format:
+        template = {**template, "format": args.format}
+
+    sources = list(args.tables)
+    if args.all_tables:
+        sources += [t for t in list_tables(args.database) if t not in sources]
+    for pattern in args.csv:
+        sources += sorted(glob.glob(pattern)) or [pattern]
+    if not sources:
+        parser.error("nothing to report on: pass --tables, --all-tables or --csv")
+
+    def on_done(source, paths, seconds, error):
+        if error:
+            print(f"[ERROR] {source}: {error}")
+        else:
+            print(f"[OK] {source}: {len(paths)} file(s) in {seconds:.1f} s")
+
+    started = time.perf_counter()
+    results = run_batch(sources, template, args.out, args.database, args.workers, on_done)
+    failed = [s for s, r in results.items() if isinstance(r, str)]
+    print(f"{len(results) - len(failed)} of {len(results)} reports written to {args.out} "
+          f"in {time.perf_counter() - started:.1f} s")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
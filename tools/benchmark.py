@@ -0,0 +1,159 @@
+"""
+Headless benchmark of the data paths, with regression check against a baseline.
+
+    python tools/benchmark.py --sizes 100k,1M --out bench.json
+    python tools/benchmark.py --sizes 100k,1M --baseline bench.json
+
+For every size a synthetic D055 log is generated (and cached in --workdir), then
+import_csv, reformat_datetime_full_table, get_page at several depths, the plot
+data preparation and convert_cmtk_to_d055 are timed in a fresh database. Each step
+records wall time and peak resident memory above its starting point. With
+--baseline the run exits non-zero when a step got slower than the tolerance allows.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import argparse
+import threading
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import duckdb
+import numpy as np
+import pandas as pd
+from modules.core import DuckDBManager
+from modules.plot_tool import load_plot_data
+from modules.cmtk_converter import convert_cmtk_to_d055
+from modules.utils import process_memory_bytes
+from generate_data import write_d055, write_cmtk
+
+PAGE_DEPTHS = (0.0, 0.5, 0.99)  # fraction of the table where get_page starts
+MIN_REGRESSION_S = 0.05         # ignore slow-downs below timer noise
+SAMPLE_INTERVAL_S = 0.01
+
+def parse_size(text):
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+class _PeakMemory:
+    """Samples resident memory on a background thread while a step runs."""
+
+    def __enter__(self):
+        self.start = self.peak = process_memory_bytes() or 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def _sample(self):
+        while not self._stop.wait(SAMPLE_INTERVAL_S):
+            self.peak = max(self.peak, process_memory_bytes() or 0)
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, process_memory_bytes() or 0)
+        return False
+
+def measure(results, name, fn, *args, **kwargs):
+    with _PeakMemory() as mem:
+        t0 = time.perf_counter()
+        value = fn(*args, **kwargs)
+        seconds = time.perf_counter() - t0
+    results[name] = {"seconds": round(seconds, 4), "peak_rss_mb": round((mem.peak - mem.start) / 2 ** 20, 1)}
+    print(f"  {name:<28} {seconds:9.3f} s  {results[name]['peak_rss_mb']:8.1f} MB")
+    return value
+
+def bench_size(rows, workdir, skip):
+    results = {}
+    csv_path = os.path.join(workdir, f"d055_{rows}.csv")
+    if not os.path.exists(csv_path):
+        write_d055(csv_path, rows)
+
+    db_dir = tempfile.mkdtemp(prefix="ams_bench_", dir=workdir)
+    db = DuckDBManager(path=os.path.join(db_dir, "bench.duckdb"))
+    try:
+        measure(results, "import_csv", db.import_csv, csv_path, "bench")
+        measure(results, "reformat_datetime", db.reformat_datetime_full_table, "bench")
+        total = db.table_count("bench")
+        for depth in PAGE_DEPTHS:
+            measure(results, f"get_page@{int(depth * 100)}%", db.get_page, "bench", int(total * depth))
+        measure(results, "plot_data", load_plot_data, db, "bench")
+    finally:
+        db.close()
+        shutil.rmtree(db_dir, ignore_errors=True)
+
+    if "cmtk" not in skip:
+        # CMTK logs are 1 Hz, so the same row count spans ten times the D055 duration
+        cmtk_dir = os.path.join(workdir, f"cmtk_{rows}")
+        paths = [os.path.join(cmtk_dir, f"cmtk_{k}.csv") for k in ("pressure", "flow", "temperature")]
+        if not all(os.path.exists(p) for p in paths):
+            paths = write_cmtk(cmtk_dir, rows)
+        output = measure(results, "convert_cmtk", convert_cmtk_to_d055, *paths)
+        os.remove(output)
+    return results
+
+def compare(current, baseline, tolerance):
+    """Returns [(size, step, baseline s, current s), ...] for steps slower than allowed."""
+    regressions = []
+    for size, steps in current["results"].items():
+        for step, value in steps.items():
+            old = baseline.get("results", {}).get(size, {}).get(step)
+            if not old:
+                continue
+            if value["seconds"] > old["seconds"] * (1 + tolerance) and value["seconds"] - old["seconds"] > MIN_REGRESSION_S:
+                regressions.append((size, step, old["seconds"], value["seconds"]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AMS Data Tool data paths.")
+    parser.add_argument("--sizes", default="100k,1M", help="comma separated row counts, e.g. 100k,1M,10M,100M")
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "ams_bench"),
+                        help="where generated logs are cached between runs")
+    parser.add_argument("--out", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slow-down, 0.2 = 20%%")
+    parser.add_argument("--skip", default="", help="comma separated steps to leave out (cmtk)")
+    args = parser.parse_args()
+
+    os.makedirs(args.workdir, exist_ok=True)
+    skip = {s.strip() for s in args.skip.split(",") if s.strip()}
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "duckdb": duckdb.__version__,
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+        },
+        "results": {},
+    }
+    for label in args.sizes.split(","):
+        rows = parse_size(label)
+        print(f"[{label.strip()}] {rows:,} rows")
+        report["results"][label.strip()] = bench_size(rows, args.workdir, skip)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        for size, step, old, new in regressions:
+            print(f"[REGRESSION] {size} {step}: {old:.3f} s -> {new:.3f} s")
+        if regressions:
+            sys.exit(1)
+        print("[SUCCESS] No regressions against the baseline")
+
+if __name__ == "__main__":
+    main()
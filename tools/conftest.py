@@ -0,0 +1,43 @@
+# tools/conftest.py
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_data import write_d055
+
+@pytest.fixture(autouse=True)
+def app_data(tmp_path, monkeypatch):
+    """Points get_app_data_path() at a temporary folder, so tests never touch the real cache, sessions or stores."""
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("APPDATA", str(tmp_path / "home"))
+    from modules.utils import get_app_data_path
+    return get_app_data_path()
+
+@pytest.fixture
+def log_file(tmp_path):
+    """Writes a synthetic D055 log of `rows` samples; `extra` raw lines are appended after them."""
+    def make(rows=2000, name="log.csv", extra=(), **kwargs):
+        path = write_d055(str(tmp_path / name), rows, **kwargs)
+        with open(path, "a", encoding="utf-8", newline="") as f:
+            f.writelines(line + "\n" for line in extra)
+        return path
+    return make
+
+@pytest.fixture
+def db(tmp_path):
+    from modules.core import DuckDBManager
+    manager = DuckDBManager(str(tmp_path / "test.duckdb"))
+    yield manager
+    manager.close()
+
+@pytest.fixture
+def imported(db, log_file):
+    """Imports a log and formats it as MainWindow does; returns the table name."""
+    def load(table="log", path=None, **kwargs):
+        db.import_file(path or log_file(**kwargs), table)
+        db.reformat_datetime_full_table(table, snapshot=False)
+        db.refresh_catalog(table)
+        return table
+    return load
@@ -0,0 +1,94 @@
+"""
+Synthetic AMS logs for benchmarks and manual testing.
+
+    python tools/generate_data.py d055 out.csv --rows 1000000 --rate 10
+    python tools/generate_data.py cmtk out_dir --duration 86400 --rate 1
+
+D055 files carry D#/TOD# timestamps and pressure/flow/temperature channels;
+CMTK output is the separate pressure, flow and temperature CSV triple that
+convert_cmtk_to_d055 unifies. Output is written in chunks, so 100M-row files
+need no more memory than 1M-row ones. A fixed seed makes every run identical.
+"""
+import os
+import argparse
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 1_000_000
+DEFAULT_START = "2024-03-01 08:00:00"
+
+def _signals(n, offset, rate_hz, noise, rng):
+    """Pressure/flow/temperature for samples offset..offset+n: duty cycles, drift and sensor noise."""
+    t = (offset + np.arange(n)) / rate_hz
+    # Consumers switch on for 40 s of every 120 s cycle; pressure sags while they draw air
+    active = (t % 120.0) < 40.0
+    flow = np.where(active, 180.0, 15.0) + 5.0 * np.sin(t / 900.0) + rng.normal(0, 2.0 * noise, n)
+    pressure = 620.0 - 0.12 * flow + 4.0 * np.sin(t / 3600.0) + rng.normal(0, 1.5 * noise, n)
+    temperature = 22.0 + 3.0 * np.sin(t / 43200.0) + rng.normal(0, 0.1 * noise, n)
+    return pressure.round(2), np.clip(flow, 0, None).round(2), temperature.round(2)
+
+def _timestamps(n, offset, rate_hz, start):
+    return pd.Timestamp(start) + pd.to_timedelta((offset + np.arange(n)) * (1000.0 / rate_hz), unit="ms")
+
+def write_d055(path, rows, rate_hz=10.0, start=DEFAULT_START, noise=1.0, seed=0):
+    """Writes a D055 log with `rows` samples at `rate_hz`; returns the path."""
+    rng = np.random.default_rng(seed)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for offset in range(0, rows, CHUNK_ROWS):
+            n = min(CHUNK_ROWS, rows - offset)
+            ts = _timestamps(n, offset, rate_hz, start)
+            p, q, temp = _signals(n, offset, rate_hz, noise, rng)
+            pd.DataFrame({
+                "Data": "D#" + ts.strftime("%Y-%m-%d"),
+                "Time": "TOD#" + ts.strftime("%H:%M:%S.%f").str[:-3],
+                "Pressure Base [kPa]": p,
+                "Flow Base [Nl/min]": q,
+                "Fluid Temperature [°C]": temp,
+            }).to_csv(f, sep=";", index=False, header=offset == 0)
+    return path
+
+def write_cmtk(out_dir, rows, rate_hz=1.0, start=DEFAULT_START, noise=1.0, seed=0, with_temperature=True):
+    """Writes CMTK pressure/flow(/temperature) CSVs; returns (p_path, f_path, t_path or None)."""
+    os.makedirs(out_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    paths = {key: os.path.join(out_dir, f"cmtk_{key}.csv") for key in ("pressure", "flow", "temperature")}
+    units = {"pressure": ("Pressure", "kPa"), "flow": ("Flow", "Nl/min"), "temperature": ("Temperature", "°C")}
+    keys = ["pressure", "flow"] + (["temperature"] if with_temperature else [])
+    handles = {key: open(paths[key], "w", encoding="utf-8", newline="") for key in keys}
+    try:
+        for offset in range(0, rows, CHUNK_ROWS):
+            n = min(CHUNK_ROWS, rows - offset)
+            times = _timestamps(n, offset, rate_hz, start).strftime("%Y-%m-%d %H:%M:%S")
+            values = dict(zip(("pressure", "flow", "temperature"), _signals(n, offset, rate_hz, noise, rng)))
+            for key in keys:
+                label, unit = units[key]
+                # CMTK exports the reading with its unit in one text field
+                pd.DataFrame({"Time": times, label: pd.Series(values[key]).astype(str) + " " + unit}).to_csv(
+                    handles[key], index=False, header=offset == 0)
+    finally:
+        for f in handles.values():
+            f.close()
+    return paths["pressure"], paths["flow"], paths["temperature"] if with_temperature else None
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic D055 or CMTK logs.")
+    parser.add_argument("kind", choices=["d055", "cmtk"])
+    parser.add_argument("output", help="CSV path for d055, directory for cmtk")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--rows", type=int, help="number of samples (default 100000)")
+    size.add_argument("--duration", type=float, help="logged time in seconds")
+    parser.add_argument("--rate", type=float, help="samples per second (default 10 for d055, 1 for cmtk)")
+    parser.add_argument("--noise", type=float, default=1.0, help="sensor noise scale (0 = clean signals)")
+    parser.add_argument("--start", default=DEFAULT_START, help="first timestamp")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rate = args.rate or (10.0 if args.kind == "d055" else 1.0)
+    rows = int(args.duration * rate) if args.duration else (args.rows or 100_000)
+    if args.kind == "d055":
+        print(write_d055(args.output, rows, rate, args.start, args.noise, args.seed))
+    else:
+        print("\n".join(p for p in write_cmtk(args.output, rows, rate, args.start, args.noise, args.seed) if p))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# tools/test_channel_store.py
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from modules.core import DuckDBManager
+from modules.channel_store import store_path, write_store
+from modules.sessions import cache_path, open_session, close_session
+
+def _store(db, table):
+    store = db.build_channel_store(table, min_rows=0)
+    assert store is not None
+    return store_path(db.revision(table))
+
+def test_store_matches_sql_fetch(db, imported):
+    table = imported(rows=3000)
+    _store(db, table)
+    columns = db.numeric_columns(table)
+    t, data = db.fetch_numpy(table, columns)
+    sql, params = db._numpy_sql(table, columns)
+    with db.reader() as cur:
+        arrays = cur.execute(sql, params).fetchnumpy()
+    assert np.array_equal(t.view("int64"), arrays["__t"])
+    assert all(np.array_equal(data[c], arrays[f"__c{i}"]) for i, c in enumerate(columns))
+
+def test_new_revision_replaces_only_its_own_store(db, imported, tmp_path, log_file):
+    table = imported(rows=2000)
+    first = _store(db, table)
+    other = DuckDBManager(str(tmp_path / "other.duckdb"))  # another database with an equally named table
+    try:
+        other.import_file(log_file(rows=1500, name="other.csv"), table)
+        other.reformat_datetime_full_table(table, snapshot=False)
+        theirs = _store(other, table)
+        assert theirs != first
+        db.drop_channel(table, "nothing")  # any rewrite mints a new revision
+        assert not os.path.exists(first)
+        assert os.path.exists(theirs)
+        assert len(other.channel_store(table).time) == 1500
+        second = _store(db, table)
+        db.drop_table(table)
+        assert not os.path.exists(second)
+        assert os.path.exists(theirs)
+    finally:
+        other.close()
+
+def test_borrowed_store_stays_with_the_cache(log_file):
+    cache = DuckDBManager(cache_path())
+    try:
+        cache.import_file(log_file(rows=2000), "log")
+        cache.reformat_datetime_full_table("log", snapshot=False)
+    finally:
+        cache.close()
+    db = open_session()
+    try:
+        db.restore_cached(cache_path(), "log")
+        cached = _store(db, "log")
+        db.drop_channel("log", "nothing")  # copied into the session under a new revision
+        own = _store(db, "log")
+        assert os.path.exists(cached) and own != cached
+    finally:
+        close_session(db)
+    assert not os.path.exists(cached)  # the cache removed the revision it replaced at publish
+    assert os.path.exists(own)
+
+def test_stores_count_against_the_budget(db, imported):
+    for table in ("a", "b"):
+        imported(table, rows=20000)
+        _store(db, table)
+    db.flush_access()
+    report = db.maintain()
+    assert report["after"] == db.database_size()[0] + db.channel_store_bytes()
+    stores = {t: store_path(db.revision(t)) for t in ("a", "b")}
+    db.touch("b")
+    report = db.maintain(budget_bytes=report["after"] - 1)
+    assert report["evicted"] == ["a"]
+    assert not os.path.exists(stores["a"]) and os.path.exists(stores["b"])
+
+def test_failed_write_leaves_no_folder():
+    def chunks():
+        yield pd.DataFrame({"__t": np.arange(10, dtype="int64"), "__c0": np.ones(10, dtype="float32")})
+        raise RuntimeError("query cancelled")
+    with pytest.raises(RuntimeError):
+        write_store(chunks(), "log", "rev", ["a"], 20)
+    assert os.listdir(os.path.dirname(store_path("rev"))) == []
+
+def test_publish_sweeps_unreferenced_stores(log_file):
+    cache = DuckDBManager(cache_path())
+    try:
+        cache.import_file(log_file(rows=2000), "log")
+        cache.reformat_datetime_full_table("log", snapshot=False)
+        cached = _store(cache, "log")
+    finally:
+        cache.close()
+    leftovers = [store_path("gone"), store_path("rev.tmp-x1")]  # a dropped revision, an unfinished write
+    for path in leftovers:
+        os.makedirs(path)
+    db, other = open_session(), open_session()
+    try:
+        db.import_file(log_file(rows=100, name="own.csv"), "own")
+        other.import_file(log_file(rows=2000, name="theirs.csv"), "theirs")
+        other.reformat_datetime_full_table("theirs", snapshot=False)
+        theirs = _store(other, "theirs")
+        close_session(db)
+        assert all(os.path.exists(path) for path in leftovers + [theirs])  # the other session may still need its stores
+    finally:
+        close_session(other)
+    assert not any(os.path.exists(path) for path in leftovers)
+    assert os.path.exists(cached) and os.path.exists(theirs)  # both now catalogued by the cache
@@ -0,0 +1,38 @@
+# tools/test_derived_channels.py
+import statistics
+import duckdb
+import pytest
+from modules.derived_channels import build_update_sql
+
+# Unevenly spaced samples, stored out of time order
+ROWS = [(0.0, 2.0), (1.0, 4.0), (3.0, 4.0), (2.0, 6.0), (4.0, 0.0)]
+
+def _derive(kind, p1, p2=0.0):
+    con = duckdb.connect()
+    try:
+        con.execute('CREATE TABLE t (ts TIMESTAMP, "x" DOUBLE, "y" DOUBLE)')
+        con.executemany("INSERT INTO t VALUES (to_timestamp(?)::TIMESTAMP, ?, NULL)", ROWS)
+        spec = {"name": "y", "kind": kind, "source": "x", "source2": None, "p1": p1, "p2": p2}
+        con.execute(build_update_sql("t", spec, "ts"))
+        return [r[0] for r in con.execute("SELECT y FROM t ORDER BY ts").fetchall()]
+    finally:
+        con.close()
+
+def test_integral_is_a_running_trapezoid_in_time_order():
+    # sorted x: 2, 4, 6, 4, 0 at one-second steps -> areas 3, 5, 5, 2
+    assert _derive("integral", 1.0) == pytest.approx([0.0, 3.0, 8.0, 13.0, 15.0])
+    assert _derive("integral", 60.0) == pytest.approx([v / 60.0 for v in (0.0, 3.0, 8.0, 13.0, 15.0)])
+
+@pytest.mark.parametrize("kind, expected", [
+    ("rolling_mean", [2.0, 3.0, 5.0, 5.0, 2.0]),
+    ("rolling_min", [2.0, 2.0, 4.0, 4.0, 0.0]),
+    ("rolling_max", [2.0, 4.0, 6.0, 6.0, 4.0]),
+])
+def test_rolling_window_trails_in_time_order(kind, expected):
+    assert _derive(kind, 2.0) == pytest.approx(expected)
+
+def test_rolling_std_needs_two_samples():
+    values = _derive("rolling_std", 3.0)
+    assert values[0] is None
+    windows = [(2, 4), (2, 4, 6), (4, 6, 4), (6, 4, 0)]
+    assert values[1:] == pytest.approx([statistics.stdev(w) for w in windows])
@@ -0,0 +1,36 @@
+# tools/test_events.py
+from datetime import datetime, timedelta
+import pandas as pd
+
+T0 = datetime(2024, 3, 1, 8, 0, 0)
+
+def _table(db, values, stamps=None):
+    stamps = stamps or [T0 + timedelta(seconds=i) for i in range(len(values))]
+    df = pd.DataFrame({"Date and time": stamps, "Flow": values})
+    cur = db.conn.cursor()
+    cur.register("__df", df)
+    cur.execute("CREATE TABLE ev AS SELECT * FROM __df")
+    cur.close()
+    return "ev"
+
+def test_islands_and_min_duration(db):
+    table = _table(db, [0, 5, 6, 0, 0, 7, 8, 9, 0])
+    events = db.find_events(table, "Flow", ">", 4)
+    assert [(e["start"], e["end"], e["peak"], e["first_row"]) for e in events] == [
+        (T0 + timedelta(seconds=1), T0 + timedelta(seconds=2), 6, 1),
+        (T0 + timedelta(seconds=5), T0 + timedelta(seconds=7), 9, 5),
+    ]
+    assert [e["duration"] for e in db.find_events(table, "Flow", ">", 4, min_duration=1.5)] == [2.0]
+
+def test_duplicate_timestamps_follow_file_order(db):
+    # Two samples share each stamp; the tie is broken by row order, so the hits stay one island
+    stamps = [T0 + timedelta(seconds=i // 2) for i in range(8)]
+    table = _table(db, [0, 0, 5, 5, 5, 0, 0, 0], stamps)
+    events = db.find_events(table, "Flow", ">", 4)
+    assert len(events) == 1
+    assert (events[0]["start"], events[0]["end"], events[0]["first_row"]) == (
+        T0 + timedelta(seconds=1), T0 + timedelta(seconds=2), 2)
+
+def test_null_values_end_an_event(db):
+    table = _table(db, [5, None, 5, 5])
+    assert [e["first_row"] for e in db.find_events(table, "Flow", ">", 4)] == [0, 2]
@@ -0,0 +1,33 @@
+# tools/test_history.py
+from modules.core import HISTORY_PREFIX
+
+def test_reimport_keeps_one_snapshot_and_rolls_back(db, imported, log_file):
+    imported(rows=300)
+    assert db.history("log") == []  # a first import has nothing to keep
+    imported(path=log_file(rows=500, name="second.csv"))
+    history = db.history("log")
+    assert [h["operation"] for h in history] == ["import"]  # the raw table before formatting is not kept
+    db.rollback(history[0]["id"])
+    assert db.table_count("log") == 300
+    assert db.columns("log")[0] == ("Date and time", "TIMESTAMP")
+    assert [h["operation"] for h in db.history("log")] == ["rollback"]
+    assert db.catalog_entry("log")["row_count"] == 300
+
+def test_standalone_reformat_is_snapshotted(db, log_file):
+    db.import_file(log_file(rows=100), "raw")
+    db.reformat_datetime_full_table("raw")
+    history = db.history("raw")
+    assert [h["operation"] for h in history] == ["reformat"]
+    db.rollback(history[0]["id"])
+    assert [c for c, _ in db.columns("raw")][:2] == ["Data", "Time"]
+
+def test_drop_table_removes_snapshots(db, imported, log_file):
+    imported(rows=100)
+    imported(path=log_file(rows=200, name="second.csv"))
+    snapshot = db.history("log")[0]["id"]
+    db.drop_table("log")
+    assert db.history("log") == []
+    cur = db.conn.cursor()
+    assert cur.execute("SELECT count(*) FROM duckdb_tables() WHERE table_name = ?",
+                       [f"{HISTORY_PREFIX}{snapshot}"]).fetchone()[0] == 0
+    cur.close()
@@ -0,0 +1,84 @@
+# tools/test_import.py
+import os
+import gzip
+import shutil
+import zipfile
+import numpy as np
+from modules.core import SOURCE_FILE_COL
+
+HEADER = "Data;Time;Pressure Base [kPa];Flow Base [Nl/min]\n"
+
+def _member(rows, start, flows):
+    lines = [f"D#2024-03-01;TOD#08:00:{start + i:02d}.000;600.0;{flow}\n" for i, flow in enumerate(flows)]
+    return HEADER + "".join(lines[:rows])
+
+def test_zip_members_reconcile_types(db, tmp_path):
+    # The first member reads as BIGINT, the second needs DOUBLE: no value may be rounded
+    archive = str(tmp_path / "logs.zip")
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("a.csv", _member(3, 0, [1, 2, 3]))
+        zf.writestr("b.csv", _member(3, 10, [4.25, 5.5, 6.75]))
+        zf.writestr("__MACOSX/._a.csv", "junk")
+    db.import_file(archive, "z")
+    types = dict(db.columns("z"))
+    assert types["Flow Base [Nl/min]"] == "DOUBLE"
+    rows = db.conn.cursor().execute(
+        f'SELECT "Flow Base [Nl/min]", "{SOURCE_FILE_COL}" FROM z ORDER BY 1').fetchall()
+    assert rows == [(1.0, "logs.zip/a.csv"), (2.0, "logs.zip/a.csv"), (3.0, "logs.zip/a.csv"),
+                    (4.25, "logs.zip/b.csv"), (5.5, "logs.zip/b.csv"), (6.75, "logs.zip/b.csv")]
+    assert not os.path.exists(db.spill_dir) or os.listdir(db.spill_dir) == []  # members are never unpacked
+
+def test_zip_member_types_match_plain_import(db, tmp_path, log_file):
+    path = log_file(rows=500)
+    archive = str(tmp_path / "one.zip")
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.write(path, "log.csv")
+    db.import_file(path, "plain")
+    db.import_file(archive, "zipped")
+    assert dict(db.columns("zipped")) == {**dict(db.columns("plain")), SOURCE_FILE_COL: "VARCHAR"}
+
+def test_gzip_import_matches_plain(db, tmp_path, log_file):
+    path = log_file(rows=500)
+    with open(path, "rb") as src, gzip.open(str(tmp_path / "log.csv.gz"), "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    db.import_file(path, "plain")
+    db.import_file(str(tmp_path / "log.csv.gz"), "gz")
+    for table in ("plain", "gz"):
+        db.reformat_datetime_full_table(table)
+    t1, d1 = db.fetch_numpy("plain", db.numeric_columns("plain"))
+    t2, d2 = db.fetch_numpy("gz", db.numeric_columns("gz"))
+    assert np.array_equal(t1, t2)
+    assert all(np.array_equal(d1[c], d2[c]) for c in d1)
+
+def test_paths_with_quotes(db, tmp_path, log_file):
+    folder = tmp_path / "o'brien"
+    folder.mkdir()
+    path = shutil.copy(log_file(rows=50), str(folder / "it's.csv"))
+    db.import_file(path, "quoted")
+    db.export_table("quoted", str(folder / "out's.parquet"), fmt="parquet")
+    db.import_file(str(folder / "out's.parquet"), "again")
+    assert db.table_count("again") == 50
+    db.import_csv_many([path], "many")
+    assert db.table_count("many") == 50
+
+def test_raw_table_has_no_time_axis(db, tmp_path, log_file):
+    db.import_file(log_file(rows=100), "raw")
+    assert db.time_span("raw") is None
+    assert db._time_window("raw", "2024-03-01 08:00:00", None) == ("", [])
+    path = str(tmp_path / "raw.csv")
+    db.export_table("raw", path, start="2024-03-01 08:00:00")
+    with open(path, encoding="utf-8") as f:
+        assert sum(1 for _ in f) == 101
+
+def test_zip_member_streams_in_blocks(db, tmp_path, monkeypatch):
+    # Flow stays empty for the whole first block: it must not turn into text
+    monkeypatch.setattr("modules.utils.CSV_BLOCK_BYTES", 200)
+    lines = [f"D#2024-03-01;TOD#08:00:{i:02d}.000;600.0;{'' if i < 10 else i}\n" for i in range(40)]
+    archive = str(tmp_path / "blocks.zip")
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("log.csv", HEADER + "".join(lines))
+    db.import_file(archive, "z")
+    types = dict(db.columns("z"))
+    assert types["Flow Base [Nl/min]"] == "BIGINT"
+    flows = [r[0] for r in db.conn.cursor().execute('SELECT "Flow Base [Nl/min]" FROM z ORDER BY "Time"').fetchall()]
+    assert flows == [None] * 10 + list(range(10, 40))
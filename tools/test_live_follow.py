@@ -0,0 +1,64 @@
+# tools/test_live_follow.py
+import numpy as np
+from modules.live_follow import LogFollower
+
+HEADER = "Data;Time;Pressure Base [kPa];Flow Base [Nl/min];Fluid Temperature [°C]"
+
+def _rows(seconds):
+    return "".join(f"D#2024-03-02;TOD#09:00:{s:02d}.000;600.0;{s}.0;22.0\r\n" for s in seconds)
+
+def _to_crlf(path):
+    with open(path, "rb") as f:
+        data = f.read().replace(b"\r\n", b"\n").replace(b"\n", b"\r\n")
+    with open(path, "wb") as f:
+        f.write(data)
+
+def test_crlf_header_offset(db, imported, log_file):
+    path = log_file(rows=500)
+    _to_crlf(path)
+    table = imported(path=path)
+    follower = LogFollower(db, path, table)
+    assert follower.header == HEADER.split(";")
+    assert follower.header_bytes == len(HEADER.encode("utf-8")) + 2
+
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        f.write(_rows(range(0, 3)))
+    assert follower.poll() == 3
+
+    # Rotation: the log starts over with a fresh header and fewer bytes than already read
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(HEADER + "\r\n" + _rows(range(10, 12)))
+    assert follower.poll() == 2
+    assert db.table_count(table) == 505
+    flows = db.fetch_numpy(table, ["Flow Base [Nl/min]"])[1]["Flow Base [Nl/min]"]
+    assert list(flows[-5:]) == [0.0, 1.0, 2.0, 10.0, 11.0]
+
+def test_partial_line_waits_for_its_end(db, imported, log_file):
+    path = log_file(rows=100)
+    table = imported(path=path)
+    follower = LogFollower(db, path, table)
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        f.write(_rows([5])[:20])
+    assert follower.poll() == 0
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        f.write(_rows([5])[20:])
+    assert follower.poll() == 1
+
+def test_appends_grow_the_store_in_place(db, imported, log_file):
+    path = log_file(rows=500)
+    table = imported(path=path)
+    store = db.build_channel_store(table, min_rows=0)
+    revision = db.revision(table)
+    follower = LogFollower(db, path, table)
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        f.write(_rows(range(0, 3)))
+    assert follower.poll() == 3
+    assert db.revision(table) == revision  # the store was not dropped
+    assert len(store.time) == 500 and len(db.channel_store(table).time) == 503
+    columns = db.numeric_columns(table)
+    t, data = db.fetch_numpy(table, columns)
+    sql, params = db._numpy_sql(table, columns)
+    with db.reader() as cur:
+        arrays = cur.execute(sql, params).fetchnumpy()
+    assert np.array_equal(t.view("int64"), arrays["__t"])
+    assert all(np.array_equal(data[c], arrays[f"__c{i}"], equal_nan=True) for i, c in enumerate(columns))
@@ -0,0 +1,50 @@
+# tools/test_maintenance.py
+import os
+from datetime import datetime, timedelta
+import modules.core as core
+from modules.core import DuckDBManager
+
+def _age(db, table, days):
+    cur = db.conn.cursor()
+    cur.execute("UPDATE _ams_catalog SET last_access = ? WHERE table_name = ?",
+                [datetime.now() - timedelta(days=days), table])
+    cur.close()
+
+def test_stale_tables_are_evicted(db, imported):
+    for table in ("old", "fresh"):
+        imported(table, rows=200)
+    db.flush_access()
+    _age(db, "old", 40)
+    report = db.maintain()
+    assert report["evicted"] == ["old"]
+    assert [e["table_name"] for e in db.catalog()] == ["fresh"]
+
+def test_budget_evicts_least_recently_used_but_keeps_the_open_table(db, imported):
+    for table in ("a", "b", "c"):
+        imported(table, rows=20000)
+    db.flush_access()
+    for days, table in ((3, "a"), (2, "b"), (1, "c")):
+        _age(db, table, days)
+    report = db.maintain(budget_bytes=1, keep=("a",))
+    assert report["evicted"] == ["b", "c"]
+    assert [e["table_name"] for e in db.catalog()] == ["a"]
+
+def test_free_blocks_are_compacted_at_open(db, monkeypatch):
+    cur = db.conn.cursor()
+    cur.execute("CREATE TABLE big AS SELECT random() AS v FROM range(2000000)")
+    cur.execute("CREATE TABLE small AS SELECT random() AS v FROM range(1000)")  # written after, so the file cannot just be truncated
+    cur.execute("CHECKPOINT")
+    cur.close()
+    db.drop_table("big")
+    db.maintain()
+    path = db.path
+    db.close()
+    monkeypatch.setattr(core, "COMPACT_MIN_BYTES", 0)
+    before = os.path.getsize(path)
+    reopened = DuckDBManager(path)
+    try:
+        assert os.path.getsize(path) < before / 2
+        assert reopened.maintenance_log()[0][1] == "compact"
+        assert reopened.table_count("small") == 1000
+    finally:
+        reopened.close()
@@ -0,0 +1,52 @@
+# tools/test_outliers.py
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+import pytest
+from modules.outliers import MAX_HALF_WINDOW, hampel, clean
+
+def test_spike_is_flagged_and_cleaned():
+    values = np.sin(np.arange(200) / 10.0)
+    values[50] = 40.0
+    mask, medians = hampel(values, 5, 3.0)
+    assert np.flatnonzero(mask).tolist() == [50]
+    assert abs(clean(values, mask, medians)[50]) < 1.0
+
+def test_windows_with_nan_flag_nothing():
+    values = np.zeros(20) + np.arange(20) * 0.1
+    values[4] = np.nan
+    values[7] = 50.0   # its window [4, 10] holds the NaN
+    values[15] = 50.0  # its window [12, 18] is complete
+    mask, _medians = hampel(values, 3, 3.0)
+    assert np.flatnonzero(mask).tolist() == [15]
+
+def test_flat_signal_ignores_one_step_changes():
+    values = np.full(100, 600.0)
+    values[::7] += 0.1  # quantised sensor: single-step wiggles on a flat line
+    values[60] = 610.0  # a real spike
+    mask, _medians = hampel(values, 5, 3.5)
+    assert np.flatnonzero(mask).tolist() == [60]
+
+def test_constant_channel_flags_nothing():
+    mask, _medians = hampel(np.full(50, 1.0), 5, 3.0)
+    assert not mask.any()
+
+def test_duplicate_timestamps_keep_row_order(db):
+    t0 = datetime(2024, 3, 1, 8)
+    stamps = [t0 + timedelta(seconds=i // 4) for i in range(400)]
+    values = np.arange(400, dtype=float)
+    cur = db.conn.cursor()
+    cur.register("__df", pd.DataFrame({"Date and time": stamps, "v": values}))
+    cur.execute("CREATE TABLE dup AS SELECT * FROM __df")
+    cur.close()
+    _t, data = db.fetch_numpy("dup", ["v"], dtype="float64")
+    assert np.array_equal(data["v"], values)  # ties follow row order, so masks line up with every fetch
+    mask, _medians = db.outliers("dup", "v", 3, 3.0)
+    assert db.lookup_outliers("dup", "v", 3, 3.0)[0] is mask
+
+def test_derived_hampel_window_is_capped(db, imported):
+    table = imported(rows=200)
+    spec = {"name": "clean", "kind": "hampel", "source": "Pressure Base [kPa]", "source2": None,
+            "p1": MAX_HALF_WINDOW + 1, "p2": 3.5}
+    with pytest.raises(ValueError):
+        db.materialise_channel(table, spec)
@@ -0,0 +1,35 @@
+# tools/test_quality.py
+import pytest
+
+HEADER = "Data;Time;Pressure Base [kPa];Flow Base [Nl/min]\n"
+STAMPS = ["00.000", "00.100", "00.200", "00.200", "00.300", "00.150", "00.400", "05.400", "05.500", "bad", "05.600"]
+
+def _log(tmp_path):
+    lines = [f"D#2024-03-01;TOD#08:00:{s};{'' if s == '05.500' else 600.0};180.0\n" for s in STAMPS]
+    path = tmp_path / "quality.csv"
+    path.write_text(HEADER + "".join(lines), encoding="utf-8")
+    return str(path)
+
+def test_report_counts(db, tmp_path):
+    db.import_file(_log(tmp_path), "q")
+    db.reformat_datetime_full_table("q")
+    report = db.quality_report("q")
+    assert report["rows"] == 11
+    assert report["unparsed_timestamps"] == 1
+    assert report["duplicate_timestamps"] == 1  # 08:00:00.200 twice
+    assert report["out_of_order"] == 1         # 08:00:00.150 after .300, in file order
+    assert report["nominal_interval_s"] == pytest.approx(0.1, abs=1e-6)
+    assert report["gaps"] == 1
+    assert report["longest_gap_s"] == pytest.approx(5.0, abs=1e-6)
+    assert report["gap_histogram"] == [0, 1, 0, 0, 0]
+    assert report["null_counts"] == {"Pressure Base [kPa]": 1, "Flow Base [Nl/min]": 0}
+    assert report["rejected_lines"] == 0
+
+def test_unparsable_table_is_kept_as_imported(db, tmp_path):
+    path = tmp_path / "bad.csv"
+    path.write_text(HEADER + "x;y;1.0;2.0\nx;z;3.0;4.0\n", encoding="utf-8")
+    db.import_file(str(path), "bad")
+    db.reformat_datetime_full_table("bad")
+    assert [c for c, _ in db.columns("bad")][:2] == ["Data", "Time"]
+    report = db.quality_report("bad")
+    assert (report["rows"], report["unparsed_timestamps"], report["gaps"]) == (2, 2, 0)
@@ -0,0 +1,42 @@
+# tools/test_resample.py
+import duckdb
+import pytest
+from modules.resample import build_resample_sql
+
+# One sample per second with nothing stamped at 2, 3 and 4 s, plus an empty bucket of the second channel at 1 s
+ROWS = [(0, 10.0, 1.0), (1, 20.0, None), (5, 60.0, 5.0), (6, 70.0, 6.0)]
+
+def _resample(fill, aggregates=None, rows=ROWS):
+    con = duckdb.connect()
+    try:
+        con.execute('CREATE TABLE t (ts TIMESTAMP, "a" DOUBLE, "b" DOUBLE)')
+        con.executemany("INSERT INTO t VALUES (TIMESTAMP '2024-03-01 08:00:00' + to_seconds(?), ?, ?)", rows)
+        sql = build_resample_sql("t", "ts", 1000, aggregates or {"a": "mean", "b": "mean"}, fill, "Date and time")
+        return con.execute(sql).fetchall()
+    finally:
+        con.close()
+
+def test_grid_covers_the_gaps():
+    rows = _resample("null")
+    assert [r[0].second for r in rows] == list(range(7))
+    assert [r[1] for r in rows] == [10.0, 20.0, None, None, None, 60.0, 70.0]
+    assert [r[2] for r in rows] == [1.0, None, None, None, None, 5.0, 6.0]
+
+def test_ffill_carries_the_last_value():
+    rows = _resample("ffill")
+    assert [r[1] for r in rows] == [10.0, 20.0, 20.0, 20.0, 20.0, 60.0, 70.0]
+    assert [r[2] for r in rows] == [1.0, 1.0, 1.0, 1.0, 1.0, 5.0, 6.0]
+
+def test_interpolate_is_linear_in_time():
+    rows = _resample("interpolate")
+    assert [r[1] for r in rows] == pytest.approx([10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0])
+    assert [r[2] for r in rows] == pytest.approx([1.0, 1.8, 2.6, 3.4, 4.2, 5.0, 6.0])
+
+def test_edges_stay_empty():
+    rows = [(0, 1.0, None), (2, 3.0, 3.0), (4, 5.0, None)]
+    assert [r[2] for r in _resample("interpolate", rows=rows)] == [None, None, 3.0, None, None]
+    assert [r[2] for r in _resample("ffill", rows=rows)] == [None, None, 3.0, 3.0, 3.0]
+
+def test_unknown_fill_is_rejected():
+    with pytest.raises(ValueError):
+        _resample("spline")
@@ -0,0 +1,174 @@
+# tools/test_sessions.py
+import os
+import sys
+import subprocess
+import time
+import duckdb
+import pytest
+from modules.core import DuckDBManager, DEFAULT_PROFILE
+from modules.sessions import cache_path, open_session, close_session, spill_dir
+
+@pytest.fixture
+def cached(log_file):
+    """Puts a formatted table into the shared cache, as an earlier instance would have published it."""
+    def put(table="log", rows=500, **kwargs):
+        cache = DuckDBManager(cache_path())
+        try:
+            cache.import_file(log_file(rows=rows, name=f"{table}.csv", **kwargs), table)
+            cache.reformat_datetime_full_table(table, snapshot=False)
+            cache.refresh_catalog(table)
+            return cache.catalog_entry(table)["revision"]
+        finally:
+            cache.close()
+    return put
+
+def _local_tables(db):
+    cur = db.conn.cursor()
+    try:
+        return [r[0] for r in cur.execute(
+            "SELECT table_name FROM duckdb_tables() WHERE database_name = current_database()").fetchall()]
+    finally:
+        cur.close()
+
+def _can_open_for_writing(path):
+    """Whether another process can open the database read-write right now."""
+    return subprocess.run([sys.executable, "-c", f"import duckdb; duckdb.connect({path!r}).close()"],
+                          capture_output=True).returncode == 0
+
+def test_restore_reads_the_cache_in_place(cached):
+    revision = cached(rows=500)
+    db = open_session()
+    try:
+        db.restore_cached(cache_path(), "log")
+        assert "log" not in _local_tables(db)  # nothing copied
+        assert db.table_count("log") == 500
+        assert db.revision("log") == revision
+        t, data = db.fetch_numpy("log", db.numeric_columns("log"))
+        assert len(t) == 500
+        assert not _can_open_for_writing(cache_path())  # attached for as long as the table is borrowed
+        assert not db.modified
+    finally:
+        close_session(db)
+    cache = DuckDBManager(cache_path(), read_only=True)
+    try:
+        assert cache.catalog_entry("log")["revision"] == revision  # not republished
+    finally:
+        cache.close()
+
+def test_first_write_copies_and_publishes(cached):
+    cached(rows=300)
+    db = open_session()
+    try:
+        db.restore_cached(cache_path(), "log")
+        db.materialise_channel("log", {"name": "double", "kind": "scale", "source": "Pressure Base [kPa]",
+                                       "source2": None, "p1": 2.0, "p2": 0.0})
+        assert "log" in _local_tables(db)
+        assert db.modified == {"log"}
+        assert db.table_count("log") == 300
+    finally:
+        close_session(db)
+    cache = DuckDBManager(cache_path(), read_only=True)
+    try:
+        assert "double" in dict(cache.columns("log"))
+        assert cache.derived_channels("log")[0]["name"] == "double"
+    finally:
+        cache.close()
+
+def test_publish_copies_only_changed_revisions(cached, log_file):
+    cached("kept", rows=200)
+    db = open_session()
+    db.restore_cached(cache_path(), "kept")
+    db.import_file(log_file(rows=100, name="new.csv"), "new")
+    path = db.path
+    db.maintain(evict=False)
+    db.close()
+    cache = DuckDBManager(cache_path())
+    try:
+        progress = []
+        assert cache.adopt_session(path, progress_callback=progress.append) == ["new"]
+        assert progress == [100]
+    finally:
+        cache.close()
+
+def test_two_sessions_are_isolated(log_file):
+    first, second = open_session(), open_session()
+    try:
+        assert first.path != second.path
+        assert first.spill_dir != second.spill_dir
+        assert first.spill_dir == spill_dir(first.path)
+        first.import_file(log_file(rows=100, name="a.csv"), "log")
+        second.import_file(log_file(rows=250, name="b.csv"), "log")
+        assert (first.table_count("log"), second.table_count("log")) == (100, 250)
+        spill = first.spill_dir
+        close_session(first)
+        assert not os.path.exists(spill)
+        assert os.path.isdir(second.spill_dir)
+        assert second.table_count("log") == 250
+        second.apply_profile(DEFAULT_PROFILE)  # the profile keeps the session's own spill folder
+        assert second.spill_dir != spill
+    finally:
+        close_session(second)
+    cache = DuckDBManager(cache_path(), read_only=True)
+    try:
+        assert cache.table_count("log") == 250  # published last
+    finally:
+        cache.close()
+
+def test_cache_is_attached_for_the_borrow_only(cached, log_file):
+    cached(rows=200)
+    db = open_session()
+    try:
+        db.import_file(log_file(rows=100, name="own.csv"), "own")
+        db.table_count("own")
+        assert _can_open_for_writing(cache_path())  # nothing borrowed, nothing attached
+        db.restore_cached(cache_path(), "log")
+        assert db.table_count("log") == 200
+        assert not _can_open_for_writing(cache_path())
+        db.drop_channel("log", "nothing")  # the first write copies the table into the session
+        assert "log" in _local_tables(db)
+        assert _can_open_for_writing(cache_path())
+    finally:
+        close_session(db)
+
+def test_gui_thread_does_not_wait_for_a_busy_cache(cached):
+    cached(rows=100)
+    holder = subprocess.Popen([sys.executable, "-c", f"import duckdb, sys, time; c = duckdb.connect({cache_path()!r}); "
+                               "print('open', flush=True); time.sleep(5)"], stdout=subprocess.PIPE, text=True)
+    db = open_session()
+    try:
+        assert holder.stdout.readline().strip() == "open"
+        started = time.monotonic()
+        with pytest.raises(duckdb.IOException):
+            db.restore_cached(cache_path(), "log")  # tests run on the main thread, as the GUI does
+        assert time.monotonic() - started < 1.0
+        assert "log" not in db._borrowed
+    finally:
+        holder.kill()
+        holder.wait()
+        close_session(db)
+
+def test_republished_table_keeps_the_replaced_copy(cached, log_file):
+    cached(rows=300)
+    db = open_session()
+    try:
+        db.import_file(log_file(rows=100, name="again.csv"), "log")  # a new session reusing the name
+    finally:
+        close_session(db)
+    db = open_session()
+    try:
+        db.restore_cached(cache_path(), "log")
+        assert db.table_count("log") == 100
+        history = db.history("log")
+        assert [(h["operation"], h["row_count"], h["cached"]) for h in history] == [("publish", 300, True)]
+        db.rollback(history[0]["id"], cached=True)
+        assert db.table_count("log") == 300
+        assert "log" in _local_tables(db)
+        assert [(h["operation"], h["row_count"], h["cached"]) for h in db.history("log")] == [("rollback", 100, False)]
+    finally:
+        close_session(db)
+    cache = DuckDBManager(cache_path(), read_only=True)
+    try:
+        assert cache.table_count("log") == 300
+        assert [h["row_count"] for h in cache.history("log")] == [100, 300]  # both replaced copies kept
+    finally:
+        cache.close()
@@ -0,0 +1,57 @@
+# tools/test_stats.py
+import pytest
+from modules.core import FLOW_UNIT, DATETIME_COL
+from modules.utils import quote_ident
+
+FLOW = "Flow Base [Nl/min]"
+
+def _sorted_consumption(db, table, start=None, end=None):
+    """Reference integral with an explicit sort by time."""
+    where, params = db._time_window(table, start, end)
+    return db.conn.cursor().execute(f"""
+        SELECT sum({quote_ident(FLOW)} * __dt) / 60.0 FROM (
+            SELECT *, epoch(lead({quote_ident(DATETIME_COL)}) OVER (ORDER BY {quote_ident(DATETIME_COL)}))
+                      - epoch({quote_ident(DATETIME_COL)}) AS __dt
+            FROM {table} {'WHERE ' + where if where else ''})
+    """, params).fetchone()[0]
+
+def test_streamed_flow_integral_matches_sorted(db, imported):
+    table = imported(rows=5000)
+    assert db.time_ordered(table)
+    first, last = db.time_span(table)
+    for start, end in ((None, None), (first + (last - first) / 4, last - (last - first) / 4)):
+        stats = db.column_stats(table, [FLOW], start, end)
+        assert stats[FLOW]["consumption"] == pytest.approx(_sorted_consumption(db, table, start, end))
+
+def test_whole_table_stats_from_store_match_sql(db, imported):
+    table = imported(rows=5000)
+    columns = db.numeric_columns(table)
+    from_sql = db.column_stats(table, columns)
+    assert db.build_channel_store(table, min_rows=0) is not None
+    db._stats_cache.clear()
+    from_store = db.column_stats(table, columns)
+    for col in columns:
+        assert from_store[col]["count"] == from_sql[col]["count"]
+        for key in ("min", "max", "mean", "std"):
+            assert from_store[col][key] == pytest.approx(from_sql[col][key], rel=1e-5)
+        if FLOW_UNIT in col:
+            assert from_store[col]["consumption"] == pytest.approx(from_sql[col]["consumption"], rel=1e-5)
+
+def test_unstamped_rows_keep_whole_table_stats_in_sql(db, imported):
+    table = imported(rows=3000, extra=["D#garbage;TOD#garbage;1.0;2.0;3.0"])
+    assert db.build_channel_store(table, min_rows=0) is not None
+    stats = db.column_stats(table, [FLOW])
+    assert len(db.channel_store(table).time) == 3000
+    assert stats[FLOW]["count"] == 3001
+
+def test_stats_cache_keeps_the_most_recent_ranges(db, imported, monkeypatch):
+    monkeypatch.setattr("modules.core.STATS_CACHE_SIZE", 2)
+    table = imported(rows=1000)
+    first, last = db.time_span(table)
+    step = (last - first) / 4
+    ranges = [(first, first + step), (first + step, first + 2 * step), (first + 2 * step, last)]
+    for start, end in ranges:
+        db.column_stats(table, [FLOW], start, end)
+    assert len(db._stats_cache) == 2
+    assert db.lookup_stats(table, [FLOW], *ranges[0]) is None  # the oldest range was evicted
+    assert db.lookup_stats(table, [FLOW], *ranges[2]) is not None